@@ -0,0 +1,304 @@
+"""
+Lazy, incremental index of code snippets from a local source tree.
+
+The index lives in SQLite and records only where snippets are (file, byte
+offset, length) plus their language and indentation profile. Files are
+re-read only when their mtime or size changes, and snippet text is read
+through mmap when a snippet is actually selected. Opening and scanning the
+database happen on the indexing thread, so the GUI never waits on disk.
+"""
+import math
+import mmap
+import os
+import random
+import sqlite3
+import textwrap
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+LANGUAGES = {
+    '.py': 'python', '.js': 'javascript', '.ts': 'typescript', '.java': 'java',
+    '.c': 'c', '.h': 'c', '.cpp': 'cpp', '.hpp': 'cpp', '.cs': 'csharp',
+    '.go': 'go', '.rs': 'rust', '.rb': 'ruby', '.php': 'php', '.sh': 'shell',
+    '.kt': 'kotlin', '.swift': 'swift', '.sql': 'sql',
+}
+SKIPPED_DIRS = {'node_modules', '__pycache__', 'venv', 'build', 'dist', 'target'}
+MAX_FILE_BYTES = 1 << 20
+MIN_SNIPPET_LINES = 3
+MAX_SNIPPET_LINES = 12
+MAX_LINE_LENGTH = 80
+TAB_WIDTH = 4
+# Files indexed per transaction while scanning
+COMMIT_EVERY = 500
+# Bump when the tables change so old indexes are rebuilt
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snippets (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    language TEXT NOT NULL,
+    indentation TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snippets_file ON snippets(file_id);
+"""
+META_SCHEMA = "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+
+@dataclass
+class Snippet:
+    """Location of a code snippet inside a source file."""
+    path: Path
+    offset: int
+    length: int
+    language: str
+    indentation: str
+
+def indentation_profile(lines: List[bytes]) -> str:
+    """Describe how a block is indented: ``tabs``, ``spaces:N`` or ``flat``."""
+    widths = []
+    for line in lines:
+        stripped = line.lstrip(b' \t')
+        indent = line[:len(line) - len(stripped)]
+        if b'\t' in indent:
+            return 'tabs'
+        if indent and stripped.strip():
+            widths.append(len(indent))
+    if not widths:
+        return 'flat'
+    base = min(widths)
+    relative = [width - base for width in widths if width > base]
+    return f"spaces:{math.gcd(*relative) if relative else base}"
+
+def find_snippets(data: bytes) -> Iterator[Tuple[int, int, str]]:
+    """Yield (offset, length, indentation) for typeable blocks of code."""
+    block: List[bytes] = []
+    block_start = 0
+    offset = 0
+
+    def candidate() -> Optional[Tuple[int, int, str]]:
+        """Get the current block if it is a typeable size."""
+        if not MIN_SNIPPET_LINES <= len(block) <= MAX_SNIPPET_LINES:
+            return None
+        if any(len(line.rstrip()) > MAX_LINE_LENGTH for line in block):
+            return None
+        return block_start, sum(len(line) for line in block), indentation_profile(block)
+
+    for line in data.splitlines(keepends=True):
+        if line.strip():
+            if not block:
+                block_start = offset
+            block.append(line)
+        elif block:
+            found = candidate()
+            if found:
+                yield found
+            block = []
+        offset += len(line)
+    if block:
+        found = candidate()
+        if found:
+            yield found
+
+def clean_snippet(text: str) -> str:
+    """Make a snippet typeable: unify newlines, expand tabs and dedent."""
+    text = text.replace('\r\n', '\n').replace('\r', '\n').expandtabs(TAB_WIDTH)
+    lines = [line.rstrip() for line in textwrap.dedent(text).strip('\n').split('\n')]
+    return '\n'.join(lines)
+
+class SnippetIndex:
+    """Persistent snippet index for one source directory."""
+
+    def __init__(self, index_file: Path, source_dir: Path):
+        """Set up the index for a source directory; the database opens on first refresh."""
+        self.index_file = Path(index_file)
+        self.source_dir = Path(source_dir).resolve()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._ready = threading.Event()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection; each thread needs its own."""
+        conn = sqlite3.connect(self.index_file, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def _prepare(self, conn: sqlite3.Connection) -> None:
+        """Create the tables, starting over if they were built for another tree or schema."""
+        conn.execute(META_SCHEMA)
+        expected = {'source_dir': str(self.source_dir), 'schema': str(SCHEMA_VERSION)}
+        found = dict(conn.execute("SELECT key, value FROM meta"))
+        with conn:
+            if any(found.get(key) != value for key, value in expected.items()):
+                conn.execute("DROP TABLE IF EXISTS snippets")
+                conn.execute("DROP TABLE IF EXISTS files")
+                conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", expected.items())
+            conn.executescript(SCHEMA)
+        self._ready.set()
+
+    @property
+    def conn(self) -> Optional[sqlite3.Connection]:
+        """Get the query connection, or None until the index has been prepared."""
+        if self._conn is None and self._ready.is_set():
+            self._conn = self._connect()
+        return self._conn
+
+    def iter_source_files(self) -> Iterator[os.DirEntry]:
+        """Lazily walk the tree, yielding files with known languages."""
+        pending = [str(self.source_dir)]
+        while pending:
+            try:
+                entries = os.scandir(pending.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIPPED_DIRS:
+                            pending.append(entry.path)
+                    elif entry.is_file() and os.path.splitext(entry.name)[1] in LANGUAGES:
+                        yield entry
+
+    def refresh(self) -> int:
+        """Re-index new and changed files and drop deleted ones."""
+        conn = self._connect()
+        try:
+            self._prepare(conn)
+            return self._refresh(conn)
+        finally:
+            conn.close()
+
+    def _refresh(self, conn: sqlite3.Connection) -> int:
+        """Scan the tree with the given connection, returning files re-indexed."""
+        known = {
+            path: (file_id, mtime_ns, size)
+            for file_id, path, mtime_ns, size in conn.execute(
+                "SELECT id, path, mtime_ns, size FROM files"
+            )
+        }
+        seen = set()
+        changed = 0
+
+        for count, entry in enumerate(self.iter_source_files(), 1):
+            if self._stopping.is_set():
+                return changed
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            seen.add(entry.path)
+            previous = known.get(entry.path)
+            if not previous or previous[1:] != (stat.st_mtime_ns, stat.st_size):
+                self._index_file(conn, entry.path, stat)
+                changed += 1
+            if count % COMMIT_EVERY == 0:
+                conn.commit()
+
+        # Only rows for files that are gone are written; unchanged ones are left alone
+        conn.executemany(
+            "DELETE FROM files WHERE id = ?",
+            [(known[path][0],) for path in known.keys() - seen]
+        )
+        conn.commit()
+        return changed
+
+    def _index_file(self, conn: sqlite3.Connection, path: str, stat: os.stat_result) -> None:
+        """Replace the snippets of one file."""
+        conn.execute(
+            "INSERT INTO files (path, mtime_ns, size) VALUES (?, ?, ?) "
+            "ON CONFLICT(path) DO UPDATE SET mtime_ns = excluded.mtime_ns, "
+            "size = excluded.size",
+            (path, stat.st_mtime_ns, stat.st_size)
+        )
+        file_id = conn.execute("SELECT id FROM files WHERE path = ?", (path,)).fetchone()[0]
+        conn.execute("DELETE FROM snippets WHERE file_id = ?", (file_id,))
+        if stat.st_size > MAX_FILE_BYTES:
+            return
+        try:
+            data = Path(path).read_bytes()
+            data.decode('utf-8')
+        except (OSError, UnicodeDecodeError):
+            return
+
+        language = LANGUAGES[os.path.splitext(path)[1]]
+        conn.executemany(
+            "INSERT INTO snippets (file_id, offset, length, language, indentation) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(file_id, offset, length, language, indentation)
+             for offset, length, indentation in find_snippets(data)]
+        )
+
+    def refresh_async(self) -> threading.Thread:
+        """Refresh the index in a background thread so startup never waits."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self.refresh, name='code-index', daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def close(self) -> None:
+        """Stop any background refresh and close the index."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __len__(self) -> int:
+        """Get the number of indexed snippets."""
+        if self.conn is None:
+            return 0
+        return self.conn.execute("SELECT COUNT(*) FROM snippets").fetchone()[0]
+
+    def random_snippet(self, language: Optional[str] = None) -> Optional[Snippet]:
+        """Pick a random snippet with an indexed rowid lookup."""
+        if self.conn is None:
+            return None
+        where = "AND language = ?" if language else ""
+        params = (language,) if language else ()
+        query = (
+            "SELECT files.path, offset, length, language, indentation FROM snippets "
+            "JOIN files ON files.id = snippets.file_id "
+            f"WHERE snippets.id >= ? {where} ORDER BY snippets.id LIMIT 1"
+        )
+        bounds = self.conn.execute("SELECT MIN(id), MAX(id) FROM snippets").fetchone()
+        if bounds[0] is None:
+            return None
+        pivot = random.randint(bounds[0], bounds[1])
+        row = self.conn.execute(query, (pivot,) + params).fetchone()
+        if row is None:
+            row = self.conn.execute(query, (bounds[0],) + params).fetchone()
+        if row is None:
+            return None
+        return Snippet(Path(row[0]), row[1], row[2], row[3], row[4])
+
+    @staticmethod
+    def read_snippet(snippet: Snippet) -> Optional[str]:
+        """Read a snippet's text through mmap, or None if the file changed."""
+        try:
+            with open(snippet.path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if snippet.offset + snippet.length > len(mapped):
+                    return None
+                data = mapped[snippet.offset:snippet.offset + snippet.length]
+        except (OSError, ValueError):
+            return None
+        try:
+            return clean_snippet(data.decode('utf-8'))
+        except UnicodeDecodeError:
+            return None
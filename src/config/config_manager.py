@@ -2,6 +2,7 @@
 Configuration management for the Typing Speed Test application.
 """
 import os
+import socket
 from pathlib import Path
 from typing import Dict, Any, Optional
 import json
@@ -17,6 +18,14 @@ class Config:
     scores_file: Path
     word_lists_file: Path
     max_high_scores: int
+    keyboard_layout: str
+    sentence_model: Optional[Path]
+    code_dir: Optional[Path]
+    stall_watchdog: bool
+    shared_scores_dir: Optional[Path]
+    machine_id: str
+    default_profile: Optional[str]
+    blocklist_file: Optional[Path]
     window_size: str
     window_title: str
     window_bg: str
@@ -62,14 +71,19 @@ class ConfigManager:
         difficulties_file = assets_dir / 'difficulties.json'
         if not difficulties_file.exists():
             difficulties = {
-                'easy': {'words': 15, 'time_limit': 120},
-                'medium': {'words': 25, 'time_limit': 60},
-                'hard': {'words': 40, 'time_limit': 45}
+                'easy': {'words': 15, 'time_limit': 120, 'band': [0.0, 0.5]},
+                'medium': {'words': 25, 'time_limit': 60, 'band': [0.25, 0.75]},
+                'hard': {'words': 40, 'time_limit': 45, 'band': [0.5, 1.0]}
             }
             difficulties_file.write_text(json.dumps(difficulties, indent=4))
         else:
             difficulties = json.loads(difficulties_file.read_text())
         
+        # A blocklist that cannot be read must not quietly turn filtering off
+        blocklist_file = Path(os.environ['BLOCKLIST_FILE']) if os.getenv('BLOCKLIST_FILE') else None
+        if blocklist_file and not (blocklist_file.is_file() and os.access(blocklist_file, os.R_OK)):
+            raise FileNotFoundError(f"Blocklist file not found: {blocklist_file}")
+        
         # Create configuration
         self._config = Config(
             env=env,
@@ -78,7 +92,17 @@ class ConfigManager:
             scores_file=data_dir / 'typing_scores.json',
             word_lists_file=assets_dir / 'word_lists.json',
             max_high_scores=int(os.getenv('MAX_HIGH_SCORES', '10')),
-            window_size=os.getenv('WINDOW_SIZE', '800x400'),
+            keyboard_layout=os.getenv('KEYBOARD_LAYOUT', 'qwerty'),
+            sentence_model=Path(os.environ['SENTENCE_MODEL']) if os.getenv('SENTENCE_MODEL') else None,
+            code_dir=Path(os.environ['CODE_DIR']) if os.getenv('CODE_DIR') else None,
+            stall_watchdog=os.getenv('STALL_WATCHDOG', '0') == '1',
+            shared_scores_dir=(
+                Path(os.environ['SHARED_SCORES_DIR']) if os.getenv('SHARED_SCORES_DIR') else None
+            ),
+            machine_id=os.getenv('MACHINE_ID') or socket.gethostname(),
+            default_profile=os.getenv('DEFAULT_PROFILE') or None,
+            blocklist_file=blocklist_file,
+            window_size=os.getenv('WINDOW_SIZE', '800x680'),
             window_title=os.getenv('WINDOW_TITLE', 'Typing Speed Test'),
             window_bg=os.getenv('WINDOW_BG', '#f0f0f0'),
             primary_color=os.getenv('PRIMARY_COLOR', '#333333'),
@@ -0,0 +1,65 @@
+"""
+Keystroke timing from Tk event timestamps.
+
+Tk stamps every key event with the X server's millisecond clock
+(``event.time``), taken when the key was pressed. Handlers run later,
+after whatever is ahead of them in the event queue. ``EventClock`` maps
+event stamps onto ``time.monotonic()`` so timing reflects the keyboard
+rather than the handler, and the difference is the handler lag.
+
+The mapping offset is the smallest ``now - event_time`` seen since the last
+reset, that is, the offset of the least delayed event. Resetting at the start
+of each session keeps drift between the two clocks out of the picture.
+"""
+import time
+from typing import Any, Optional
+
+# event.time is an unsigned 32-bit millisecond counter
+EVENT_TIME_WRAP = 1 << 32
+
+class EventClock:
+    """Maps Tk event times onto the monotonic clock and tracks handler lag."""
+
+    def __init__(self):
+        """Initialize without a mapping."""
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the mapping and the lag statistics."""
+        self._offset: Optional[float] = None
+        self._last_raw: Optional[int] = None
+        self._wraps = 0
+        self.lag_count = 0
+        self.lag_total = 0.0
+        self.max_lag = 0.0
+
+    def to_monotonic(self, event_ms: int, now: Optional[float] = None) -> float:
+        """Convert an event time, recording how late its handler is running."""
+        now = time.monotonic() if now is None else now
+        if self._last_raw is not None and event_ms < self._last_raw - EVENT_TIME_WRAP // 2:
+            self._wraps += 1
+        self._last_raw = event_ms
+        event_time = (event_ms + self._wraps * EVENT_TIME_WRAP) / 1000.0
+
+        offset = now - event_time
+        if self._offset is None or offset < self._offset:
+            self._offset = offset
+        stamp = event_time + self._offset
+
+        lag = now - stamp
+        self.lag_count += 1
+        self.lag_total += lag
+        self.max_lag = max(self.max_lag, lag)
+        return stamp
+
+    def stamp(self, event: Any = None) -> float:
+        """Get the monotonic time of an event, or now for synthetic events."""
+        event_ms = getattr(event, 'time', 0)
+        if not isinstance(event_ms, int) or not event_ms:
+            return time.monotonic()
+        return self.to_monotonic(event_ms)
+
+    @property
+    def mean_lag(self) -> float:
+        """Get the mean seconds between a key press and its handler."""
+        return self.lag_total / self.lag_count if self.lag_count else 0.0
@@ -1,31 +1,111 @@
 """Game logic for the typing speed test."""
 import time
 import random
+from bisect import bisect_left, bisect_right
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
-from .utils import calculate_wpm, calculate_accuracy
-from .settings import DIFFICULTIES
+from .code_index import SnippetIndex
+from .keyboard_layout import WordDifficultyIndex, get_layout
+from .markov import MarkovModel
+from .metrics import BACKSPACE, compute_metrics
+from .passage import Passage, TypedProgress
+from .utils import (
+    calculate_wpm, common_suffix_length, normalize_text, split_graphemes
+)
+from .settings import BLOCKLIST_FILE, DIFFICULTIES, KEYBOARD_LAYOUT, SENTENCE_MODEL
+from .word_filter import compile_blocklist, load_blocklist, load_filtered_words, unique_words
+
+MODES = ('words', 'code')
+# Snippets tried before falling back to words when files changed under the index
+SNIPPET_ATTEMPTS = 5
+# Adaptive mode: difficulty buckets, and when to step between them
+ADAPTIVE_LEVELS = 5
+ADAPT_MIN_CHARS = 10
+ADAPT_ERROR_RATE = 0.06
+ADAPT_SLOWDOWN = 0.85
+
+def _sample_words(pool: Sequence[str], count: int, rng: random.Random) -> List[str]:
+    """Pick words from a pool, reusing words when it is too small."""
+    if len(pool) < count:
+        # If not enough words, duplicate the list
+        pool = list(pool) * (count // len(pool) + 1)
+    return rng.sample(pool, count)
 
 class GameManager:
     """Manages game state and logic."""
 
-    def __init__(self, word_list_file: Path):
-        """Initialize game manager."""
+    def __init__(self, word_list_file: Path, layout: str = KEYBOARD_LAYOUT,
+                 sentence_model: Optional[Path] = SENTENCE_MODEL,
+                 blocklist: Optional[Path] = BLOCKLIST_FILE):
+        """Initialize game manager, dropping words that contain blocklisted text."""
         self.word_list_file = Path(word_list_file)
+        self.blocklist = Path(blocklist) if blocklist else None
         self.word_list: List[str] = []
+        self.layout = get_layout(layout)
+        self.word_index: Optional[WordDifficultyIndex] = None
+        self.band_words: List[str] = []
+        self.buckets: List[List[str]] = []
+        self._bands: Dict[str, List[str]] = {}
+        self.adaptive = False
+        self.level = 0
+        self._adapt_rng = random.Random()
+        self._adapt_mark = (0, 0, 0.0)
+        self.sentence_model: Optional[MarkovModel] = None
+        self.code_index: Optional[SnippetIndex] = None
+        self.mode = 'words'
+        if sentence_model:
+            self.sentence_model = MarkovModel.load(sentence_model)
+            if self.blocklist:
+                self.sentence_model.block(compile_blocklist(load_blocklist(self.blocklist)).search)
         self.current_text = ""
+        self.passage: Optional[Passage] = None
+        self.progress: Optional[TypedProgress] = None
         self.start_time: Optional[float] = None
+        # Keystroke log: one entry per typed cluster (its first code point) or
+        # BACKSPACE per erased cluster, with seconds since the first key
+        self.keys: List[int] = []
+        self.key_times: List[float] = []
+        # Monotonic times of the first and latest keystrokes
+        self.first_key_time: Optional[float] = None
+        self.last_key_time: Optional[float] = None
+        self.seed: Optional[int] = None
         self.difficulty = 'medium'
         self.word_count = DIFFICULTIES[self.difficulty]['words']
         self.time_limit = DIFFICULTIES[self.difficulty]['time_limit']
         
         self._load_words()
+        self._select_band()
 
     def _load_words(self) -> None:
         """Load word list from file."""
-        with open(self.word_list_file, 'r') as f:
-            self.word_list = [word.strip() for word in f.readlines() if word.strip()]
+        if self.blocklist:
+            self.word_list = load_filtered_words(self.word_list_file, self.blocklist)
+            if not self.word_list:
+                raise ValueError(f"Invalid blocklist: {self.blocklist} removes every word")
+        else:
+            # Deduplicated like the filtered list, so a blocklist only removes banned words
+            with open(self.word_list_file, 'r', encoding='utf-8') as f:
+                self.word_list = list(unique_words(f))
+        if self.word_list:
+            self.word_index = WordDifficultyIndex.load_or_build(
+                self.word_list_file, self.word_list, self.layout
+            )
+            self.buckets = [
+                self.word_index.band(level / ADAPTIVE_LEVELS, (level + 1) / ADAPTIVE_LEVELS)
+                for level in range(ADAPTIVE_LEVELS)
+            ]
+
+    def _select_band(self) -> None:
+        """Select the words in the current difficulty's ergonomic band."""
+        band = DIFFICULTIES[self.difficulty].get('band')
+        if band and self.word_index:
+            # Cached so repeated games do not copy the band each time
+            if self.difficulty not in self._bands:
+                self._bands[self.difficulty] = self.word_index.band(*band)
+            self.band_words = self._bands[self.difficulty]
+        else:
+            self.band_words = []
 
     def set_difficulty(self, difficulty: str) -> None:
         """Set game difficulty."""
@@ -35,28 +115,211 @@ class GameManager:
         self.difficulty = difficulty
         self.word_count = DIFFICULTIES[difficulty]['words']
         self.time_limit = DIFFICULTIES[difficulty]['time_limit']
+        self._select_band()
+
+    def set_mode(self, mode: str) -> None:
+        """Switch between word passages and code snippets."""
+        if mode not in MODES:
+            raise ValueError(f"Invalid mode: {mode}")
+        self.mode = mode
+
+    def set_adaptive(self, enabled: bool) -> None:
+        """Turn live difficulty adjustment on or off."""
+        self.adaptive = enabled
+
+    def _reset_adaptation(self) -> None:
+        """Start adapting from the current difficulty's band."""
+        low, high = DIFFICULTIES[self.difficulty].get('band', (0.25, 0.75))
+        self.level = min(int((low + high) / 2 * ADAPTIVE_LEVELS), ADAPTIVE_LEVELS - 1)
+        self._adapt_rng = random.Random(self.seed)
+        self._adapt_mark = (0, 0, 0.0)
+
+    def adapt(self, wpm: float) -> Optional[int]:
+        """
+        Step the difficulty from recent typing and re-generate the untyped tail.
+
+        Compares accuracy and live WPM since the previous call. The passage is
+        spliced after the word being typed, so typed clusters keep their
+        scores. Returns the first replaced cluster, or None if nothing changed.
+        """
+        if not self.adaptive or self.mode != 'words' or not self.buckets or not self.progress:
+            return None
+        typed, correct = len(self.progress), self.progress.correct
+        last_typed, last_correct, last_wpm = self._adapt_mark
+        if typed - last_typed < ADAPT_MIN_CHARS:
+            return None
+        self._adapt_mark = (typed, correct, wpm)
+
+        error_rate = 1 - max(correct - last_correct, 0) / (typed - last_typed)
+        if error_rate > ADAPT_ERROR_RATE or wpm < last_wpm * ADAPT_SLOWDOWN:
+            level = max(self.level - 1, 0)
+        elif error_rate <= ADAPT_ERROR_RATE / 2:
+            level = min(self.level + 1, ADAPTIVE_LEVELS - 1)
+        else:
+            level = self.level
+        if level == self.level:
+            return None
+
+        passage = self.passage
+        if typed >= len(passage):
+            return None
+        space = passage.text.find(' ', passage.offsets[typed])
+        if space < 0:
+            return None
+        index = bisect_left(passage.offsets, space + 1)
+        count = len(passage.text[space + 1:].split())
+        if not count:
+            return None
+
+        self.level = level
+        words = _sample_words(self.buckets[level], count, self._adapt_rng)
+        passage.replace_tail(index, " ".join(words))
+        self.current_text = passage.text
+        self.seed = None  # The passage can no longer be replayed from its seed
+        return index
+
+    def set_code_source(self, source_dir: Path, index_file: Path) -> None:
+        """Index a source tree for code mode in the background."""
+        if self.code_index:
+            self.code_index.close()
+        self.code_index = SnippetIndex(index_file, source_dir)
+        self.code_index.refresh_async()
+
+    def _code_text(self) -> Optional[str]:
+        """Read a random indexed snippet, if any are available yet."""
+        if not self.code_index:
+            return None
+        for _ in range(SNIPPET_ATTEMPTS):
+            snippet = self.code_index.random_snippet()
+            if snippet is None:
+                return None
+            text = SnippetIndex.read_snippet(snippet)
+            if text:
+                return text
+        return None
 
     def generate_text(self) -> str:
-        """Generate text for typing test."""
-        if len(self.word_list) < self.word_count:
-            # If not enough words, duplicate the list
-            self.word_list = self.word_list * (self.word_count // len(self.word_list) + 1)
+        """Generate text for typing test, reproducibly when a seed is set."""
+        rng = random.Random(self.seed)
+        text = self._code_text() if self.mode == 'code' else None
+        if text is None:
+            if self.sentence_model:
+                words = self.sentence_model.generate(self.word_count, rng)
+            else:
+                pool = self.band_words or self.word_list
+                words = _sample_words(pool, self.word_count, rng)
+            text = " ".join(words)
         
-        words = random.sample(self.word_list, self.word_count)
-        self.current_text = " ".join(words)
+        self.current_text = text
+        self.passage = Passage(self.current_text)
+        self.progress = TypedProgress(self.passage)
         return self.current_text
 
-    def start_game(self, difficulty: Optional[str] = None) -> None:
-        """Start a new game."""
+    def start_game(self, difficulty: Optional[str] = None, seed: Optional[int] = None) -> None:
+        """Start a new game, replaying a passage when given its seed."""
         if difficulty:
             self.set_difficulty(difficulty)
+        self.seed = seed if seed is not None else random.getrandbits(32)
         self.generate_text()
+        self._reset_adaptation()
+        self._clear_keys()
         self.start_time = time.time()
 
+    def resume_game(self, text: str, difficulty: str, elapsed: float) -> None:
+        """Resume an interrupted game with its passage and elapsed time."""
+        self.set_difficulty(difficulty)
+        self.seed = None
+        self.current_text = text
+        self.passage = Passage(text)
+        self.progress = TypedProgress(self.passage)
+        self._reset_adaptation()
+        self._clear_keys()
+        # Typing time carries on from where the interrupted session stopped
+        self.last_key_time = time.monotonic()
+        self.first_key_time = self.last_key_time - elapsed
+        self.start_time = time.time() - elapsed
+
+    def stop(self) -> None:
+        """Stop the clock, keeping the passage for review."""
+        self.start_time = None
+
+    def close(self) -> None:
+        """Release background resources."""
+        if self.code_index:
+            self.code_index.close()
+            self.code_index = None
+
     def reset(self) -> None:
         """Reset game state."""
         self.current_text = ""
+        self.passage = None
+        self.progress = None
         self.start_time = None
+        self.seed = None
+        self._clear_keys()
+
+    def _clear_keys(self) -> None:
+        """Forget the keystroke log and its timing."""
+        self.keys, self.key_times = [], []
+        self.first_key_time = None
+        self.last_key_time = None
+
+    def update_progress(self, typed_text: str, timestamp: Optional[float] = None) -> int:
+        """
+        Log the keys that turned the previous input into this one and update progress.
+
+        ``timestamp`` is the monotonic time the keys were pressed, taken from
+        the input event; it defaults to now.
+        """
+        deleted, inserted = self._changed_clusters(typed_text)
+        if deleted or inserted:
+            timestamp = time.monotonic() if timestamp is None else timestamp
+            if self.first_key_time is None:
+                self.first_key_time = timestamp
+            self.last_key_time = max(timestamp, self.last_key_time or timestamp)
+            elapsed = self.last_key_time - self.first_key_time
+            self.keys.extend([BACKSPACE] * deleted)
+            self.keys.extend(ord(normalize_text(cluster)[0]) for cluster in inserted)
+            self.key_times.extend([elapsed] * (deleted + len(inserted)))
+        return self.progress.update(typed_text)
+
+    def _changed_clusters(self, typed_text: str) -> Tuple[int, List[str]]:
+        """
+        Get the clusters erased from the previous input and those typed in their place.
+
+        Only the span between the common prefix and the common suffix is
+        compared, widened by a cluster each way because combining marks
+        attach to their neighbours. A cluster that only gained marks, such
+        as an emoji getting a skin tone, counts as neither erased nor typed.
+        """
+        previous, offsets = self.progress.text, self.progress.offsets
+        prefix = self.progress.change_point(typed_text)
+        if prefix == len(previous) == len(typed_text):
+            return 0, []
+        suffix = common_suffix_length(previous[prefix:], typed_text[prefix:])
+
+        first = max(bisect_right(offsets, prefix) - 2, 0)
+        last = min(bisect_left(offsets, len(previous) - suffix) + 1, len(offsets) - 1)
+        start, end = offsets[first], offsets[last]
+        old = split_graphemes(previous[start:end])
+        new = split_graphemes(typed_text[start:len(typed_text) - (len(previous) - end)])
+
+        same = 0
+        while same < min(len(old), len(new)) and old[same] == new[same]:
+            same += 1
+        tail = 0
+        while tail < min(len(old), len(new)) - same and old[-1 - tail] == new[-1 - tail]:
+            tail += 1
+        old, new = old[same:len(old) - tail], new[same:len(new) - tail]
+        if old and new and new[0].startswith(old[0]):
+            old, new = old[1:], new[1:]
+        return len(old), new
+
+    def typing_time(self) -> Optional[float]:
+        """Get the seconds from the first keystroke to the latest, if any were typed."""
+        if self.first_key_time is None:
+            return None
+        return self.last_key_time - self.first_key_time
 
     def get_elapsed_time(self) -> float:
         """Get elapsed time since game start."""
@@ -64,20 +327,64 @@ class GameManager:
             return 0.0
         return time.time() - self.start_time
 
-    def is_time_up(self) -> bool:
-        """Check if time limit is reached."""
+    def typing_clock(self, now: Optional[float] = None) -> float:
+        """
+        Get the seconds since the first keystroke, or 0 before typing starts.
+
+        This is the session's one clock: the timer, ghost, journal and time
+        limit all read it. ``now`` is a monotonic time (default: the current
+        time), on the same scale as the event-mapped keystroke stamps.
+        """
+        if not self.start_time or self.first_key_time is None:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        return max(now - self.first_key_time, 0.0)
+
+    def is_time_up(self, now: Optional[float] = None) -> bool:
+        """Check if time limit is reached; it runs from the first keystroke."""
         if not self.time_limit or not self.start_time:
             return False
-        return self.get_elapsed_time() >= self.time_limit
+        return self.typing_clock(now) >= self.time_limit
+
+    def calculate_results(self, typed_text: str, elapsed_time: Optional[float] = None,
+                          keys: Optional[Sequence[int]] = None,
+                          key_times: Optional[Sequence[float]] = None
+                          ) -> Dict[str, Union[int, float]]:
+        """
+        Calculate typing test results, optionally for a known duration.
+
+        Uses the game's keystroke log unless ``keys`` are given, and times
+        the test from the first keystroke to the last. ``wpm`` keeps the
+        whitespace-word scale every stored score uses; ``net_wpm`` and the
+        other registered metrics use five-character words.
+        """
+        typed_text = normalize_text(typed_text)
+        if elapsed_time is None:
+            elapsed_time = self.typing_time()
+        if elapsed_time is None:
+            elapsed_time = self.get_elapsed_time()
+        if keys is None:
+            keys, key_times = self.keys, self.key_times
+        metrics = compute_metrics(typed_text, self.current_text, elapsed_time, keys, key_times)
 
-    def calculate_results(self, typed_text: str) -> Dict[str, float]:
-        """Calculate typing test results."""
-        elapsed_time = self.get_elapsed_time()
-        wpm = calculate_wpm(typed_text, elapsed_time)
-        accuracy = calculate_accuracy(typed_text, self.current_text)
-        
         return {
-            'wpm': wpm,
-            'accuracy': accuracy,
+            **metrics,
+            'wpm': calculate_wpm(typed_text, elapsed_time),
             'time': elapsed_time
         }
+
+    def live_results(self) -> Dict[str, Union[int, float]]:
+        """
+        Get WPM and accuracy for the live display from the progress counters.
+
+        Costs the same whatever the passage length; ``calculate_results``
+        does the full tally when the test ends.
+        """
+        elapsed_time = self.typing_time()
+        if elapsed_time is None:
+            elapsed_time = self.get_elapsed_time()
+        minutes = elapsed_time / 60
+        return {
+            'wpm': round(self.progress.words / minutes) if minutes > 0 else 0,
+            'accuracy': self.progress.accuracy()
+        }
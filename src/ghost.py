@@ -0,0 +1,74 @@
+"""
+Ghost race timelines: typed position over time, delta-encoded.
+
+A timeline holds one sample per ``interval`` seconds. Each sample is the
+change in typed position since the previous one, stored as a signed byte,
+so a one-minute run at the default interval takes 600 bytes.
+"""
+import base64
+import hashlib
+from array import array
+from typing import Any, Dict
+
+GHOST_INTERVAL = 0.1
+_DELTA_MIN, _DELTA_MAX = -128, 127
+
+def passage_digest(text: str) -> str:
+    """Get a short hash identifying a passage."""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+class GhostRecorder:
+    """Records typed position samples for a run."""
+
+    def __init__(self, interval: float = GHOST_INTERVAL):
+        """Initialize an empty timeline."""
+        self.interval = interval
+        self.deltas = array('b')
+        self._position = 0
+
+    def sample(self, position: int, elapsed: float) -> None:
+        """Fill the timeline up to ``elapsed`` with the current position."""
+        target = int(elapsed / self.interval)
+        while len(self.deltas) < target:
+            delta = max(_DELTA_MIN, min(_DELTA_MAX, position - self._position))
+            # Bigger jumps carry over into the following samples
+            self.deltas.append(delta)
+            self._position += delta
+
+    def to_dict(self, seed: int, text: str) -> Dict[str, Any]:
+        """Serialize the timeline with what is needed to replay its passage."""
+        return {
+            'seed': seed,
+            'passage': passage_digest(text),
+            'interval': self.interval,
+            'deltas': base64.b64encode(self.deltas.tobytes()).decode('ascii')
+        }
+
+class GhostPlayer:
+    """Replays a recorded timeline with an O(1) cursor per frame."""
+
+    def __init__(self, ghost: Dict[str, Any]):
+        """Decode a serialized timeline."""
+        self.seed: int = ghost['seed']
+        self.passage: str = ghost['passage']
+        self.interval: float = ghost['interval']
+        self.deltas = array('b', base64.b64decode(ghost['deltas']))
+        self.position = 0
+        self._cursor = 0
+
+    def matches(self, text: str) -> bool:
+        """Check whether the ghost was recorded on this passage."""
+        return passage_digest(text) == self.passage
+
+    def advance(self, elapsed: float) -> int:
+        """Move the cursor up to ``elapsed`` and get the ghost's position."""
+        target = min(int(elapsed / self.interval), len(self.deltas))
+        while self._cursor < target:
+            self.position += self.deltas[self._cursor]
+            self._cursor += 1
+        return self.position
+
+    @property
+    def finished(self) -> bool:
+        """Check whether the whole timeline has been played."""
+        return self._cursor >= len(self.deltas)
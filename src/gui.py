@@ -1,23 +1,41 @@
 """
 GUI components for the Typing Speed Test application.
 """
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox
-from typing import Optional
+from tkinter import ttk, messagebox, filedialog, simpledialog
+from typing import Any, Dict, List, Optional
 from pathlib import Path
+from .event_clock import EventClock
 from .game_logic import GameManager
 from .high_scores import HighScores
+from .ghost import GhostPlayer, GhostRecorder
+from .journal import SessionJournal
+from .live_stats import KeyStats, KeystrokeWindow
+from .profiles import ProfileStore, UserProfile
+from .watchdog import StallWatchdog
+from .widgets import KeyboardHeatmap, WpmGraph
 from .settings import (
     WINDOW_SIZE, WINDOW_TITLE, WINDOW_BG,
-    TITLE_FONT, TEXT_FONT, PRIMARY_COLOR
+    TITLE_FONT, TEXT_FONT, PRIMARY_COLOR, CODE_DIR, STALL_WATCHDOG, DEFAULT_PROFILE
 )
 import time
 
+# Tk 8.6 counts characters outside the BMP as two (surrogate pairs)
+ASTRAL_WIDTH = 2 if tk.TkVersion < 8.7 else 1
+CODE_FONT = ('Courier', 12)
+CODE_LINES = 12
+INDENT = ' ' * 4
+SYNC_INTERVAL_MS = 30000
+SYNC_POLL_MS = 250
+ADAPT_INTERVAL = 3.0
+
 class TypingSpeedGUI:
     """Main GUI class for the Typing Speed Test application."""
     
-    def __init__(self, root: tk.Tk, word_list_file: Optional[Path] = None, scores_file: Optional[Path] = None):
-        """Initialize the GUI."""
+    def __init__(self, root: tk.Tk, word_list_file: Optional[Path] = None, scores_file: Optional[Path] = None,
+                 shared: bool = True):
+        """Initialize the GUI; without ``shared`` nothing is synced or filed under a profile."""
         self.root = root
         self.root.title(WINDOW_TITLE)
         self.root.geometry(WINDOW_SIZE)
@@ -27,17 +45,62 @@ class TypingSpeedGUI:
         scores_path = scores_file or Path("data/scores.json")
         
         self.game = GameManager(word_list_path)
-        self.high_scores = HighScores(scores_path)
+        if shared:
+            self.high_scores = HighScores(scores_path)
+            self.profiles = ProfileStore(scores_path.with_name('profiles'))
+        else:
+            self.high_scores = HighScores(scores_path, shared_dir=None)
+            self.profiles = ProfileStore(scores_path.with_name('profiles'), shared_dir=None)
+        self.profile: Optional[UserProfile] = None
         self.current_text = ""
         self.typed_chars = 0
         self.timer_id = None
+        self.text_columns = [0]
+        self.keystrokes = KeystrokeWindow()
+        self.key_stats = KeyStats()
+        self.last_key_time: Optional[float] = None
+        self.event_clock = EventClock()
+        self.key_press_time: Optional[float] = None
+        self.journal = SessionJournal(scores_path.with_name('session.journal'))
+        self.code_index_file = scores_path.with_name('code_index.sqlite3')
+        self.target_indents = [""]
+        self.ghost: Optional[GhostPlayer] = None
+        self.ghost_recorder = GhostRecorder()
+        self.stall_profile_file = scores_path.with_name('stalls.folded')
+        self.watchdog: Optional[StallWatchdog] = None
+        self.sync_id = None
+        self.sync_thread: Optional[threading.Thread] = None
+        self.sync_records: List[Dict[str, Any]] = []
+        self.show_dialogs = True
+        self.last_results: Optional[dict] = None
+        if STALL_WATCHDOG:
+            self.watchdog = StallWatchdog(self.root)
+            self.watchdog.start()
         
         # Initialize difficulty variable
         self.difficulty_var = tk.StringVar(value='medium')
         self.difficulty_var.trace_add('write', self._on_difficulty_change)
+        self.code_mode_var = tk.BooleanVar(value=False)
+        self.code_mode_var.trace_add('write', self._on_mode_change)
+        self.ghost_var = tk.BooleanVar(value=False)
+        self.adaptive_var = tk.BooleanVar(value=False)
+        self.adaptive_var.trace_add('write', self._on_adaptive_change)
+        self.live_heatmap_var = tk.BooleanVar(value=False)
+        self.next_adapt = 0.0
+        
+        # Index the configured source tree without delaying startup
+        if CODE_DIR:
+            self.game.set_code_source(CODE_DIR, self.code_index_file)
         
         self._create_widgets()
         self._setup_bindings()
+        if DEFAULT_PROFILE and shared:
+            self.select_profile(DEFAULT_PROFILE)
+        
+        # Offer to resume a test interrupted by a crash or power loss
+        self.root.after_idle(self._offer_resume)
+        if self.high_scores.sync and self.sync_id is None:
+            self.sync_id = self.root.after_idle(self._sync_scores)
     
     def _create_widgets(self) -> None:
         """Create GUI widgets."""
@@ -63,6 +126,29 @@ class TypingSpeedGUI:
                 variable=self.difficulty_var,
                 value=diff
             ).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(
+            difficulty_frame,
+            text="Code",
+            variable=self.code_mode_var
+        ).pack(side=tk.LEFT, padx=15)
+        ttk.Checkbutton(
+            difficulty_frame,
+            text="Race ghost",
+            variable=self.ghost_var
+        ).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(
+            difficulty_frame,
+            text="Adaptive",
+            variable=self.adaptive_var
+        ).pack(side=tk.LEFT, padx=5)
+        
+        # Active user
+        self.user_button = ttk.Button(
+            difficulty_frame,
+            text="User: Guest",
+            command=self._choose_profile
+        )
+        self.user_button.pack(side=tk.LEFT, padx=15)
         
         # Text display
         self.text_display = tk.Text(
@@ -78,6 +164,7 @@ class TypingSpeedGUI:
         # Configure text tags for coloring
         self.text_display.tag_configure('correct', foreground='green')
         self.text_display.tag_configure('incorrect', foreground='red')
+        self.text_display.tag_configure('ghost', background='#cce0ff')
         
         # Input field
         self.input_field = ttk.Entry(
@@ -88,6 +175,18 @@ class TypingSpeedGUI:
         )
         self.input_field.pack(pady=10)
         
+        # Multi-line input used in code mode instead of the entry
+        self.code_input = tk.Text(
+            self.root,
+            height=CODE_LINES,
+            width=60,
+            font=CODE_FONT,
+            wrap=tk.NONE,
+            undo=False,
+            state='disabled'
+        )
+        self.active_input = self.input_field
+        
         # Timer label
         self.timer_label = ttk.Label(
             self.root,
@@ -143,25 +242,135 @@ class TypingSpeedGUI:
             font=TEXT_FONT
         )
         self.accuracy_label.pack(side=tk.LEFT, padx=10)
+        
+        # Rolling WPM graph
+        self.wpm_graph = WpmGraph(self.root)
+        self.wpm_graph.pack(pady=5)
+        
+        # Per-key heatmap; click it to switch between errors and latency
+        self.heatmap = KeyboardHeatmap(self.root, self.game.layout)
+        self.heatmap.pack(pady=5)
+        self.heatmap.canvas.bind('<Button-1>', self._toggle_heatmap_metric)
+        ttk.Checkbutton(
+            self.root,
+            text="Live heatmap",
+            variable=self.live_heatmap_var
+        ).pack()
     
     def _setup_bindings(self) -> None:
         """Setup keyboard bindings."""
+        self.input_field.bind('<KeyPress>', self._on_key_press)
         self.input_field.bind('<KeyRelease>', self.check_progress)
+        self.code_input.bind('<KeyPress>', self._on_key_press)
+        self.code_input.bind('<KeyRelease>', self.check_progress)
+        self.code_input.bind('<Return>', self._on_code_return)
+        self.code_input.bind('<Tab>', self._on_code_tab)
+
+    def _get_input(self) -> str:
+        """Get the text typed so far."""
+        if self.active_input is self.code_input:
+            return self.code_input.get('1.0', 'end-1c')
+        return self.input_field.get()
+
+    def _set_input(self, text: str, state: str) -> None:
+        """Replace the typed text and set the input state."""
+        self.active_input.configure(state='normal')
+        if self.active_input is self.code_input:
+            self.code_input.delete('1.0', tk.END)
+            self.code_input.insert('1.0', text)
+        else:
+            self.input_field.delete(0, tk.END)
+            self.input_field.insert(0, text)
+        self.active_input.configure(state=state)
+
+    def _on_key_press(self, event: Optional[tk.Event] = None) -> None:
+        """Remember when the key went down, from the event's own timestamp."""
+        self.key_press_time = self.event_clock.stamp(event)
+
+    def _on_code_return(self, event: Optional[tk.Event] = None) -> str:
+        """Start a new line indented like the next line of the snippet."""
+        self._on_key_press(event)
+        line = self._get_input().count('\n') + 1
+        indent = self.target_indents[line] if line < len(self.target_indents) else ""
+        self.code_input.insert(tk.INSERT, '\n' + indent)
+        return 'break'
+
+    def _on_code_tab(self, event: Optional[tk.Event] = None) -> str:
+        """Insert spaces instead of a tab character."""
+        self._on_key_press(event)
+        self.code_input.insert(tk.INSERT, INDENT)
+        return 'break'
     
     def start_game(self) -> None:
         """Start a new typing test."""
-        self.game.start_game(self.difficulty_var.get())
+        if self.code_mode_var.get() and not self.game.code_index:
+            source_dir = filedialog.askdirectory(title="Choose a source directory")
+            if not source_dir:
+                self.code_mode_var.set(False)
+            else:
+                self.game.set_code_source(Path(source_dir), self.code_index_file)
+        
+        # Replay the seeded passage of the personal best to race its ghost
+        self.ghost = None
+        best = self.high_scores.get_best_ghost(self.difficulty_var.get())
+        if self.ghost_var.get() and best and self.game.mode == 'words' and not self.game.adaptive:
+            self.ghost = GhostPlayer(best)
+            self.game.start_game(self.difficulty_var.get(), seed=self.ghost.seed)
+            if not self.ghost.matches(self.game.current_text):
+                self.ghost = None  # The word list changed since the best run
+        else:
+            self.game.start_game(self.difficulty_var.get())
+        self._begin_session()
+
+    def _begin_session(self, typed_text: str = "") -> None:
+        """Show the game's passage and enable typing."""
+        self._cancel_timer()
         self.current_text = self.game.current_text
+        self.text_columns = self.game.passage.columns(ASTRAL_WIDTH)
         self.text_display.configure(state='normal')
         self.text_display.delete('1.0', tk.END)
         self.text_display.insert('1.0', self.current_text)
         self.text_display.configure(state='disabled')
-        self.input_field.configure(state='normal')
-        self.input_field.delete(0, tk.END)
+        self.target_indents = [
+            line[:len(line) - len(line.lstrip(' '))] for line in self.current_text.split('\n')
+        ]
+        self._set_input("", 'normal')
+        self.active_input.focus_set()
+        self.typed_chars = 0
+        self.keystrokes.clear()
+        self.wpm_graph.clear()
+        self.key_stats.clear()
+        self.heatmap.refresh(self.key_stats)
+        self.last_key_time = None
+        self.ghost_recorder = GhostRecorder()
+        self.next_adapt = time.monotonic() + ADAPT_INTERVAL
+        self.event_clock.reset()
+        self.key_press_time = None
         self.start_button.configure(state='disabled')
         self.stop_button.configure(state='normal')
         self.reset_button.configure(state='normal')
+        self.journal.begin(self.current_text, self.game.difficulty, self.game.mode)
+        if typed_text:
+            self._set_input(typed_text, 'normal')
+            self.check_progress()
         self._update_timer()
+
+    def _offer_resume(self) -> None:
+        """Resume or discard an unfinished session journal."""
+        session = SessionJournal.recover(self.journal.journal_file)
+        if session is None:
+            return
+        
+        if messagebox.askyesno(
+            "Resume Test",
+            "An unfinished test was found. Do you want to resume it?"
+        ):
+            self.difficulty_var.set(session.difficulty)
+            self.code_mode_var.set(session.mode == 'code')
+            self.game.resume_game(session.text, session.difficulty, session.elapsed)
+            self._begin_session(session.typed_text)
+        else:
+            self.journal.finish()
         
     def stop_game(self) -> None:
         """Stop the current typing test."""
@@ -169,50 +378,88 @@ class TypingSpeedGUI:
             return
             
         if messagebox.askyesno("Confirm Stop", "Are you sure you want to stop the test?"):
-            if self.timer_id:
-                self.root.after_cancel(self.timer_id)
-                self.timer_id = None
             self.end_test()
+
+    def _cancel_timer(self) -> None:
+        """Cancel the pending timer tick, if any."""
+        if self.timer_id:
+            self.root.after_cancel(self.timer_id)
+            self.timer_id = None
             
     def end_test(self) -> None:
         """End the typing test."""
         if not self.game.start_time:
             return
             
-        results = self.game.calculate_results(self.input_field.get())
+        results = self.game.calculate_results(self._get_input())
+        results['input_lag_ms'] = round(self.event_clock.mean_lag * 1000, 1)
+        results['max_input_lag_ms'] = round(self.event_clock.max_lag * 1000, 1)
+        # Without this the timer keeps ticking and ends the test again at the time limit
+        self._cancel_timer()
+        ghost = None
+        if self.game.seed is not None and self.game.mode == 'words':
+            self.ghost_recorder.sample(self.typed_chars, self.game.typing_clock())
+            ghost = self.ghost_recorder.to_dict(self.game.seed, self.current_text)
         self.high_scores.add_score(
             results['wpm'],
             results['accuracy'],
-            self.game.difficulty
+            self.game.difficulty,
+            ghost,
+            net_wpm=results['net_wpm']
         )
+        self.game.stop()
+        self.journal.finish()
+        self.heatmap.refresh(self.key_stats)
+        self._request_sync()
+        rank, total = self.high_scores.get_rank(results['wpm'], self.game.difficulty)
+        summary = f"Rank: #{rank} of {total:,}"
+        if self.profile:
+            self.profile.record_result(results['wpm'], results['time'])
+            place = self.profiles.submit(
+                self.profile, self.game.difficulty, results['wpm'], results['accuracy']
+            )
+            if place:
+                summary += f"\nLeaderboard: #{place} of all users"
         
-        self.input_field.configure(state='disabled')
+        self.active_input.configure(state='disabled')
         self.start_button.configure(state='normal')
         self.stop_button.configure(state='disabled')
         self.reset_button.configure(state='disabled')
         
-        messagebox.showinfo(
-            "Test Complete",
-            f"WPM: {results['wpm']}\n"
-            f"Accuracy: {results['accuracy']}%\n"
-            f"Time: {results['time']} seconds"
-        )
+        self.last_results = results
+        if self.show_dialogs:
+            messagebox.showinfo(
+                "Test Complete",
+                f"WPM: {results['wpm']} (net {results['net_wpm']:.0f}, "
+                f"gross {results['gross_wpm']:.0f} at 5 chars/word)\n"
+                f"Accuracy: {results['accuracy']}%\n"
+                f"CPM: {results['cpm']:.0f}   KSPC: {results['kspc']:.2f}\n"
+                f"Errors: {results['corrected_errors']:.0f} corrected, "
+                f"{results['uncorrected_errors']:.0f} uncorrected\n"
+                f"Consistency: {results['consistency']:.0f}%\n"
+                f"Input lag: {results['input_lag_ms']:.0f} ms "
+                f"(max {results['max_input_lag_ms']:.0f} ms)\n"
+                f"Time: {results['time']} seconds\n"
+                + summary
+            )
 
     def reset_game(self) -> None:
         """Reset the game state."""
         self.game.reset()
+        self.journal.finish()
+        self.ghost = None
         self.current_text = ""
         self.typed_chars = 0
+        self.text_columns = [0]
+        self.keystrokes.clear()
+        self.wpm_graph.clear()
+        self.ghost_recorder = GhostRecorder()
+        self._cancel_timer()
         
-        if self.timer_id:
-            self.root.after_cancel(self.timer_id)
-            self.timer_id = None
-            
         self.text_display.configure(state='normal')
         self.text_display.delete('1.0', tk.END)
         self.text_display.configure(state='disabled')
-        self.input_field.configure(state='disabled')
-        self.input_field.delete(0, tk.END)
+        self._set_input("", 'disabled')
         self.start_button.configure(state='normal')
         self.stop_button.configure(state='disabled')
         self.reset_button.configure(state='disabled')
@@ -225,51 +472,206 @@ class TypingSpeedGUI:
         if not self.game.start_time:
             return
             
-        typed_text = self.input_field.get()
-        self.typed_chars = len(typed_text)
+        typed_text = self._get_input()
+        # Time the input by its key press, not by when this handler got to run
+        now = self.key_press_time or self.event_clock.stamp(event)
+        self.key_press_time = None
+        first_changed = self.game.update_progress(typed_text, now)
+        self.journal.record(typed_text, self.game.typing_clock(now))
+        clusters = self.game.passage.clusters
+        latency = now - self.last_key_time if self.last_key_time else None
+        for i in range(self.typed_chars, min(len(self.game.progress), len(clusters))):
+            self.keystrokes.add(now)
+            # Attribute each typed cluster to the key that should have been hit
+            self.key_stats.record(clusters[i].lower(), self.game.progress.matches[i], latency)
+            self.last_key_time = now
+            latency = None  # Pasted or batched input has no per-key timing
+        self.typed_chars = len(self.game.progress)
+        self._recolor_from(first_changed)
         
-        # Update text display colors
-        self.text_display.configure(state='normal')
-        self.text_display.delete('1.0', tk.END)
-        self.text_display.insert('1.0', self.current_text)
-        
-        # Color the text based on correctness
-        for i, (typed_char, correct_char) in enumerate(
-            zip(typed_text, self.current_text[:len(typed_text)])
-        ):
-            tag = 'correct' if typed_char == correct_char else 'incorrect'
-            self.text_display.tag_add(tag, f'1.{i}', f'1.{i+1}')
-        
-        self.text_display.configure(state='disabled')
-        
-        # Update stats
-        results = self.game.calculate_results(typed_text)
+        # Update stats from running counters; the full tally waits for end_test
+        results = self.game.live_results()
         self.wpm_label.configure(text=f"{results['wpm']} WPM")
         self.accuracy_label.configure(text=f"{results['accuracy']}%")
         
         # Check if test is complete
-        if len(typed_text) >= len(self.current_text) or self.game.is_time_up():
+        if self.game.progress.is_complete() or self.game.is_time_up(now):
             self.end_test()
+
+    def _recolor_from(self, first: int) -> None:
+        """Retag only the clusters from ``first`` onwards."""
+        progress = self.game.progress
+        last_column = len(self.text_columns) - 1
+        start = self._text_index(self.text_columns[min(first, last_column)])
+        self.text_display.tag_remove('correct', start, tk.END)
+        self.text_display.tag_remove('incorrect', start, tk.END)
+        
+        # Tags can be changed while the widget is disabled
+        for i in range(first, min(len(progress.matches), last_column)):
+            tag = 'correct' if progress.matches[i] else 'incorrect'
+            self.text_display.tag_add(
+                tag,
+                self._text_index(self.text_columns[i]),
+                self._text_index(self.text_columns[i + 1])
+            )
+
+    def _move_ghost(self, position: int) -> None:
+        """Highlight the cluster the ghost is about to type."""
+        self.text_display.tag_remove('ghost', '1.0', tk.END)
+        if position < len(self.text_columns) - 1:
+            self.text_display.tag_add(
+                'ghost',
+                self._text_index(self.text_columns[position]),
+                self._text_index(self.text_columns[position + 1])
+            )
+
+    @staticmethod
+    def _text_index(column: int) -> str:
+        """Convert a character offset into a Text widget index."""
+        return f'1.0 + {column} chars'
     
     def _on_difficulty_change(self, *args) -> None:
         """Handle difficulty change."""
         difficulty = self.difficulty_var.get()
         self.game.set_difficulty(difficulty)
+        if self.profile and self.profile.settings.get('difficulty') != difficulty:
+            self.profile.settings['difficulty'] = difficulty
+            self.profile.save()
+
+    def _choose_profile(self) -> None:
+        """Ask for a user name and switch to that profile."""
+        name = simpledialog.askstring("Switch User", "Name or student ID:", parent=self.root)
+        if not name:
+            return
+        try:
+            self.select_profile(name)
+        except ValueError:
+            messagebox.showerror("Switch User", "Names may only use letters, digits, '.', '-' and '_'.")
+
+    def select_profile(self, name: str) -> None:
+        """Make a user's profile active, loading only that user's shard."""
+        profile = self.profiles.open(name)
+        if self.game.start_time:
+            self.reset_game()
+        self.profile = profile
+        self.high_scores = profile.high_scores
+        self.user_button.configure(text=f"User: {profile.name}")
+        self.difficulty_var.set(profile.settings.get('difficulty', 'medium'))
+        if self.high_scores.sync and self.sync_id is None:
+            self.sync_id = self.root.after_idle(self._sync_scores)
+
+    def _toggle_heatmap_metric(self, event: Optional[tk.Event] = None) -> None:
+        """Switch the heatmap between error rate and latency."""
+        metric = 'latency' if self.heatmap.metric == 'errors' else 'errors'
+        self.heatmap.set_metric(metric, self.key_stats)
+
+    def _on_adaptive_change(self, *args) -> None:
+        """Turn live difficulty adjustment on or off."""
+        self.game.set_adaptive(self.adaptive_var.get())
+
+    def _adapt(self, wpm: float) -> None:
+        """Re-generate the untyped tail of the passage for the live pace."""
+        index = self.game.adapt(wpm)
+        if index is None:
+            return
+        passage = self.game.passage
+        tail = passage.text[passage.offsets[index]:]
+        self.current_text = self.game.current_text
+        # The columns list is updated in place; entries before index are unchanged
+        start = self._text_index(self.text_columns[index])
+        self.text_display.configure(state='normal')
+        self.text_display.delete(start, tk.END)
+        self.text_display.insert(start, tail)
+        self.text_display.configure(state='disabled')
+        self.journal.record_splice(passage.offsets[index], tail)
+
+    def _on_mode_change(self, *args) -> None:
+        """Switch the display and input between words and code."""
+        if self.game.start_time:
+            self.reset_game()
+        code = self.code_mode_var.get()
+        self.game.set_mode('code' if code else 'words')
+        self.text_display.configure(
+            height=CODE_LINES if code else 3,
+            wrap=tk.NONE if code else tk.WORD,
+            font=CODE_FONT if code else TEXT_FONT
+        )
+        
+        new_input = self.code_input if code else self.input_field
+        if new_input is not self.active_input:
+            self.active_input.pack_forget()
+            new_input.pack(pady=10, after=self.text_display)
+            self.active_input = new_input
     
     def _update_timer(self) -> None:
         """Update the timer display."""
         if not self.game.start_time:
             return
             
-        elapsed = int(time.time() - self.game.start_time)
-        self.timer_label.configure(text=f"Time: {elapsed}")
+        now = time.monotonic()
+        elapsed = self.game.typing_clock(now)
+        self.timer_label.configure(text=f"Time: {int(elapsed)}")
+        self.wpm_graph.push(self.keystrokes.wpm(now))
+        self.ghost_recorder.sample(self.typed_chars, elapsed)
+        if self.ghost:
+            self._move_ghost(self.ghost.advance(elapsed))
+        if self.live_heatmap_var.get():
+            self.heatmap.refresh(self.key_stats)
+        if self.game.adaptive and now >= self.next_adapt:
+            self.next_adapt = now + ADAPT_INTERVAL
+            self._adapt(self.keystrokes.wpm(now))
         
-        if not self.game.is_time_up():
+        if not self.game.is_time_up(now):
+            self._cancel_timer()  # Keeps a single tick pending even if called directly
             self.timer_id = self.root.after(100, self._update_timer)
         else:
             self.end_test()
             
+    def _sync_scores(self) -> None:
+        """Exchange scores with other machines on a worker thread."""
+        high_scores = self.high_scores
+        self.sync_records = []
+        self.sync_thread = threading.Thread(
+            target=self._exchange_scores, args=(high_scores,), name='score-sync', daemon=True
+        )
+        self.sync_thread.start()
+        self.sync_id = self.root.after(SYNC_POLL_MS, self._finish_sync, high_scores)
+
+    def _exchange_scores(self, high_scores: HighScores) -> None:
+        """Publish and pull scores; runs on the sync thread and never touches Tk."""
+        self.sync_records = high_scores.exchange()
+
+    def _finish_sync(self, high_scores: HighScores) -> None:
+        """Merge pulled scores once the worker is done, then schedule the next sync."""
+        # A hung share only delays the merge; the main loop keeps running
+        if self.sync_thread is not None and self.sync_thread.is_alive():
+            self.sync_id = self.root.after(SYNC_POLL_MS, self._finish_sync, high_scores)
+            return
+        self.sync_thread = None
+        high_scores.merge(self.sync_records)
+        self.sync_records = []
+        self.sync_id = self.root.after(SYNC_INTERVAL_MS, self._sync_scores)
+
+    def _request_sync(self) -> None:
+        """Start a sync now unless one is already running."""
+        if not self.high_scores.sync or self.sync_thread is not None:
+            return
+        if self.sync_id:
+            self.root.after_cancel(self.sync_id)
+        self.sync_id = self.root.after_idle(self._sync_scores)
+
     def destroy(self) -> None:
         """Clean up resources."""
+        self._cancel_timer()
+        if self.sync_id:
+            self.root.after_cancel(self.sync_id)
+            self.sync_id = None
+        # An open journal stays on disk so the session can be resumed
+        self.journal.close()
+        self.game.close()
+        if self.watchdog:
+            self.watchdog.stop()
+            if self.watchdog.samples:
+                self.watchdog.export(self.stall_profile_file)
         if hasattr(self, 'root'):
             self.root.destroy()
@@ -1,22 +1,61 @@
 """High scores management."""
 import json
+from array import array
+from bisect import bisect_right, insort
 from pathlib import Path
-from typing import Dict, List
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
-from .settings import MAX_HIGH_SCORES
+from .score_sync import ScoreSync
+from .settings import MACHINE_ID, MAX_HIGH_SCORES, SHARED_SCORES_DIR
+
+Leaderboard = Tuple[Mapping[str, float], ...]
+
+def _score_order(score: Mapping[str, Any]) -> Tuple[float, str, int]:
+    """Sort key giving every machine the same order, even for tied WPM."""
+    return (-score['wpm'], score.get('source', ''), score.get('seq', 0))
 
 class HighScores:
     """Manages high scores."""
 
-    def __init__(self, scores_file: Path):
-        """Initialize high scores manager."""
+    def __init__(self, scores_file: Path, shared_dir: Optional[Path] = SHARED_SCORES_DIR,
+                 machine_id: str = MACHINE_ID, share_root: Optional[Path] = None):
+        """Initialize high scores manager, syncing through shared_dir if set."""
         self.scores_file = Path(scores_file)
         self.scores: Dict[str, List[Dict[str, float]]] = {
             'easy': [],
             'medium': [],
             'hard': []
         }
+        # Every recorded WPM per difficulty, kept sorted for rank queries
+        self.history_file = self.scores_file.with_suffix('.history')
+        # Packed doubles: the history grows by 8 bytes per finished test
+        self.history: Dict[str, array] = {difficulty: array('d') for difficulty in self.scores}
+        self._views: Dict[str, Leaderboard] = {}
         self._load_scores()
+        self._load_history()
+        
+        self.sync: Optional[ScoreSync] = None
+        if shared_dir:
+            self.sync = ScoreSync(
+                shared_dir, machine_id, self.scores_file.with_suffix('.sync.json'), share_root,
+                difficulties=tuple(self.scores)
+            )
+            self._publish_legacy()
+
+    def _publish_legacy(self) -> None:
+        """Stamp and queue scores recorded before syncing was set up."""
+        legacy = [
+            (difficulty, score)
+            for difficulty, scores in self.scores.items() for score in scores
+            if 'seq' not in score
+        ]
+        for difficulty, score in legacy:
+            score.update(self.sync.stamp())
+            self.sync.publish(difficulty, score)
+        if legacy:
+            self._views.clear()
+            self._save_scores()
 
     def _load_scores(self) -> None:
         """Load scores from file."""
@@ -33,13 +72,43 @@ class HighScores:
                 # Reset scores if file is corrupted
                 self._save_scores()
 
+    def _load_history(self) -> None:
+        """Load the append-only WPM history, seeding it from the scores."""
+        if not self.history_file.exists():
+            lines = [
+                f"{difficulty} {score['wpm']}\n"
+                for difficulty, scores in self.scores.items() for score in scores
+            ]
+            with open(self.history_file, 'w') as f:
+                f.writelines(lines)
+
+        loaded: Dict[str, List[float]] = {difficulty: [] for difficulty in self.history}
+        with open(self.history_file, 'r') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) != 2 or parts[0] not in loaded:
+                    continue
+                try:
+                    loaded[parts[0]].append(float(parts[1]))
+                except ValueError:
+                    continue
+        for difficulty, wpms in loaded.items():
+            self.history[difficulty] = array('d', sorted(wpms))
+
     def _save_scores(self) -> None:
         """Save scores to file."""
         with open(self.scores_file, 'w') as f:
             json.dump(self.scores, f)
 
-    def add_score(self, wpm: float, accuracy: float, difficulty: str) -> None:
-        """Add a new score."""
+    def add_score(self, wpm: float, accuracy: float, difficulty: str,
+                  ghost: Optional[Dict[str, Any]] = None,
+                  net_wpm: Optional[float] = None) -> None:
+        """
+        Add a new score, optionally with its ghost race timeline.
+
+        ``wpm`` counts whitespace-separated words, the scale of every stored
+        score; five-character net WPM is kept alongside under ``net_wpm``.
+        """
         if difficulty not in self.scores:
             raise ValueError(f"Invalid difficulty: {difficulty}")
 
@@ -48,19 +117,96 @@ class HighScores:
             'accuracy': accuracy,
             'timestamp': None  # Could add timestamp if needed
         }
+        if net_wpm is not None:
+            score['net_wpm'] = net_wpm
+        if ghost:
+            score['ghost'] = ghost
+        if self.sync:
+            score.update(self.sync.stamp())
+
+        self._insert_score(difficulty, score)
+        self._save_scores()
+        if self.sync:
+            self.sync.publish(difficulty, score)
 
+    def _insert_score(self, difficulty: str, score: Dict[str, Any]) -> None:
+        """Insert a score into the leaderboard and rank history."""
         # Add score and sort by WPM
         self.scores[difficulty].append(score)
-        self.scores[difficulty].sort(key=lambda x: x['wpm'], reverse=True)
+        self.scores[difficulty].sort(key=_score_order)
 
         # Keep only top scores
         if len(self.scores[difficulty]) > MAX_HIGH_SCORES:
             self.scores[difficulty] = self.scores[difficulty][:MAX_HIGH_SCORES]
+        self._views.pop(difficulty, None)
 
-        self._save_scores()
+        insort(self.history[difficulty], score['wpm'])
+        with open(self.history_file, 'a') as f:
+            f.write(f"{difficulty} {score['wpm']}\n")
 
-    def get_scores(self, difficulty: str) -> List[Dict[str, float]]:
-        """Get scores for a difficulty level."""
+    def exchange(self) -> List[Dict[str, Any]]:
+        """
+        Publish queued local scores and pull new peer scores.
+
+        Only touches the share and the sync state, so it may run on a
+        background thread; pass the records to ``merge`` on the main thread.
+        """
+        if not self.sync:
+            return []
+        self.sync.flush()
+        return self.sync.pull()
+
+    def sync_scores(self) -> int:
+        """Publish queued local scores and merge new peer scores."""
+        return self.merge(self.exchange())
+
+    def merge(self, records: List[Dict[str, Any]]) -> int:
+        """Add pulled peer scores, returning how many were merged."""
+        merged = 0
+        for record in records:
+            difficulty = record.pop('difficulty', None)
+            if difficulty not in self.scores or 'wpm' not in record:
+                continue
+            self._insert_score(difficulty, record)
+            merged += 1
+        if merged:
+            self._save_scores()
+        return merged
+
+    def get_scores(self, difficulty: str) -> Leaderboard:
+        """Get a read-only leaderboard for a difficulty level."""
         if difficulty not in self.scores:
             raise ValueError(f"Invalid difficulty: {difficulty}")
-        return self.scores[difficulty]
+        # Views are rebuilt only after this difficulty changes
+        if difficulty not in self._views:
+            self._views[difficulty] = tuple(
+                MappingProxyType({
+                    key: MappingProxyType(dict(value)) if isinstance(value, dict) else value
+                    for key, value in score.items()
+                })
+                for score in self.scores[difficulty]
+            )
+        return self._views[difficulty]
+
+    def get_best_ghost(self, difficulty: str) -> Optional[Mapping[str, Any]]:
+        """Get the timeline of the fastest run that recorded one."""
+        for score in self.get_scores(difficulty):
+            if 'ghost' in score:
+                return score['ghost']
+        return None
+
+    def get_rank(self, wpm: float, difficulty: str, added: bool = True) -> Tuple[int, int]:
+        """
+        Get the placement of a WPM among all recorded scores.
+
+        Returns ``(rank, total)`` where rank 1 is the fastest. Ties share the
+        better rank. With ``added`` the score is taken to be in the history
+        already; otherwise it is placed as one more score.
+        """
+        if difficulty not in self.history:
+            raise ValueError(f"Invalid difficulty: {difficulty}")
+        history = self.history[difficulty]
+        rank = len(history) - bisect_right(history, wpm) + 1
+        if not added:
+            return rank, len(history) + 1
+        return rank, max(len(history), rank)
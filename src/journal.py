@@ -0,0 +1,147 @@
+"""
+Crash-safe journal of the session in progress.
+
+Each input change is appended as a small delta. Deltas are buffered in
+memory and written by a background thread with one fsync per flush
+interval, so a crash loses at most ``flush_interval`` seconds of typing and
+keystroke handling never waits on the disk.
+"""
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, TextIO
+
+from .utils import common_prefix_length
+
+FLUSH_INTERVAL = 0.5
+
+@dataclass
+class RecoveredSession:
+    """State of an unfinished session rebuilt from its journal."""
+    text: str
+    difficulty: str
+    typed_text: str
+    elapsed: float
+    mode: str = 'words'
+
+class SessionJournal:
+    """Append-only journal with grouped fsyncs."""
+
+    def __init__(self, journal_file: Path, flush_interval: float = FLUSH_INTERVAL):
+        """Initialize the journal without opening it."""
+        self.journal_file = Path(journal_file)
+        self.flush_interval = flush_interval
+        self._file: Optional[TextIO] = None
+        self._pending: List[str] = []
+        self._last_text = ""
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def active(self) -> bool:
+        """Check whether a session is being journaled."""
+        return self._file is not None
+
+    def begin(self, text: str, difficulty: str, mode: str = 'words') -> None:
+        """Start journaling a new session, replacing any old journal."""
+        self.close()
+        self._file = open(self.journal_file, 'w', encoding='utf-8')
+        header = {'text': text, 'difficulty': difficulty, 'mode': mode}
+        self._file.write(json.dumps(header) + '\n')
+        self._sync()
+
+        self._last_text = ""
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name='session-journal', daemon=True)
+        self._thread.start()
+
+    def record(self, typed_text: str, elapsed: float) -> None:
+        """Queue the change from the previous input; never touches the disk."""
+        if self._file is None or typed_text == self._last_text:
+            return
+        prefix = common_prefix_length(self._last_text, typed_text)
+        entry = json.dumps([round(elapsed, 3), prefix, typed_text[prefix:]])
+        self._last_text = typed_text
+        with self._lock:
+            self._pending.append(entry)
+
+    def record_splice(self, offset: int, tail: str) -> None:
+        """Queue a replacement of the passage from ``offset`` onwards."""
+        if self._file is None:
+            return
+        with self._lock:
+            self._pending.append(json.dumps({'at': offset, 'tail': tail}))
+
+    def _run(self) -> None:
+        """Flush pending entries until stopped."""
+        while not self._stopping.wait(self.flush_interval):
+            self.flush()
+
+    def _sync(self) -> None:
+        """Push written data through to the disk."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def flush(self) -> None:
+        """Write all pending entries with a single fsync."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+        with self._write_lock:
+            if self._file is None:
+                return
+            self._file.write('\n'.join(pending) + '\n')
+            self._sync()
+
+    def close(self) -> None:
+        """Flush and close the journal, keeping it on disk for recovery."""
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join()
+            self._thread = None
+        if self._file is not None:
+            self.flush()
+            with self._write_lock:
+                self._file.close()
+                self._file = None
+
+    def finish(self) -> None:
+        """Close the journal and remove it once the session no longer needs it."""
+        self.close()
+        self._pending = []
+        self.journal_file.unlink(missing_ok=True)
+
+    @staticmethod
+    def recover(journal_file: Path) -> Optional[RecoveredSession]:
+        """Rebuild an unfinished session, ignoring a torn final entry."""
+        journal_file = Path(journal_file)
+        if not journal_file.exists():
+            return None
+
+        with open(journal_file, 'r', encoding='utf-8') as f:
+            lines = f.read().split('\n')
+        try:
+            header = json.loads(lines[0])
+            text, difficulty = header['text'], header['difficulty']
+            mode = header.get('mode', 'words')
+        except (json.JSONDecodeError, KeyError, TypeError):
+            return None
+
+        typed_text = ""
+        elapsed = 0.0
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+                if isinstance(entry, dict):
+                    text = text[:entry['at']] + entry['tail']
+                    continue
+                elapsed, prefix, inserted = entry
+            except (json.JSONDecodeError, ValueError, TypeError, KeyError):
+                break
+            typed_text = typed_text[:prefix] + inserted
+        return RecoveredSession(text, difficulty, typed_text, float(elapsed), mode)
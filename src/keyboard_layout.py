@@ -0,0 +1,162 @@
+"""
+Keyboard layout cost model for ergonomic word difficulty.
+"""
+import hashlib
+import json
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Finger per column: 0-3 left pinky to index, 6-9 right index to pinky
+COLUMN_FINGERS = (0, 1, 2, 3, 3, 6, 6, 7, 8, 9, 9, 9)
+FINGER_HOME_COLUMNS = {0: 0, 1: 1, 2: 2, 3: 3, 6: 6, 7: 7, 8: 8, 9: 9}
+HOME_ROW = 1
+ROW_STAGGER = (0.0, 0.25, 0.75)
+
+# Relative weights of the ergonomic cost components
+TRAVEL_WEIGHT = 1.0
+SAME_FINGER_WEIGHT = 2.0
+ROW_JUMP_WEIGHT = 1.5
+SAME_HAND_WEIGHT = 0.5
+UNKNOWN_KEY_COST = 3.0
+
+@dataclass
+class KeyboardLayout:
+    """Character rows of a keyboard layout, top row first."""
+    name: str
+    rows: Tuple[str, str, str]
+    _keys: Dict[str, Tuple[int, int]] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self):
+        """Index each character by its row and column."""
+        if len(self.rows) != 3:
+            raise ValueError(f"Layout {self.name} must have exactly 3 rows")
+        for row, keys in enumerate(self.rows):
+            if len(keys) > len(COLUMN_FINGERS):
+                raise ValueError(f"Layout {self.name} row {row} has too many keys")
+            for column, char in enumerate(keys):
+                self._keys[char] = (row, column)
+
+    @classmethod
+    def from_file(cls, layout_file: Path) -> 'KeyboardLayout':
+        """Load a layout from a JSON file with ``name`` and ``rows``."""
+        data = json.loads(Path(layout_file).read_text(encoding='utf-8'))
+        return cls(data['name'], tuple(data['rows']))
+
+    @property
+    def fingerprint(self) -> str:
+        """Get a hash identifying the key arrangement."""
+        return hashlib.sha1("\n".join(self.rows).encode('utf-8')).hexdigest()
+
+    def position(self, char: str) -> Optional[Tuple[int, int]]:
+        """Get the (row, column) of a character, if it is on the layout."""
+        return self._keys.get(char.lower())
+
+    def score_word(self, word: str) -> float:
+        """
+        Score how hard a word is to type on this layout.
+
+        Combines finger travel from the home row, same-finger bigrams, jumps
+        between the top and bottom rows, and runs on the same hand.
+        """
+        score = 0.0
+        previous: Optional[Tuple[int, int]] = None
+        for char in word:
+            position = self.position(char)
+            if position is None:
+                score += UNKNOWN_KEY_COST
+                previous = None
+                continue
+
+            row, column = position
+            finger = COLUMN_FINGERS[column]
+            home_column = FINGER_HOME_COLUMNS[finger]
+            score += TRAVEL_WEIGHT * math.hypot(
+                column + ROW_STAGGER[row] - home_column - ROW_STAGGER[HOME_ROW],
+                row - HOME_ROW
+            )
+
+            if previous is not None and previous != position:
+                previous_finger = COLUMN_FINGERS[previous[1]]
+                if previous_finger == finger:
+                    score += SAME_FINGER_WEIGHT
+                if abs(previous[0] - row) >= 2:
+                    score += ROW_JUMP_WEIGHT
+                if (previous_finger < 5) == (finger < 5):
+                    score += SAME_HAND_WEIGHT
+            previous = position
+        return score
+
+LAYOUTS: Dict[str, KeyboardLayout] = {
+    'qwerty': KeyboardLayout('qwerty', ("qwertyuiop[]", "asdfghjkl;'", "zxcvbnm,./")),
+    'dvorak': KeyboardLayout('dvorak', ("',.pyfgcrl/=", "aoeuidhtns-", ";qjkxbmwvz")),
+    'colemak': KeyboardLayout('colemak', ("qwfpgjluy;[]", "arstdhneio'", "zxcvbkm,./")),
+}
+
+def get_layout(layout: str) -> KeyboardLayout:
+    """Get a built-in layout by name, or load one from a JSON file path."""
+    if layout in LAYOUTS:
+        return LAYOUTS[layout]
+    if Path(layout).is_file():
+        return KeyboardLayout.from_file(Path(layout))
+    raise ValueError(f"Unknown keyboard layout: {layout}")
+
+class WordDifficultyIndex:
+    """Words sorted by layout difficulty, so bands are plain slices."""
+
+    def __init__(self, words: Sequence[str], scores: Sequence[float]):
+        """Initialize the index from words sorted by ascending score."""
+        self.words = list(words)
+        self.scores = list(scores)
+
+    @classmethod
+    def build(cls, words: Sequence[str], layout: KeyboardLayout) -> 'WordDifficultyIndex':
+        """Score and sort unique words."""
+        scored = sorted((layout.score_word(word), word) for word in set(words))
+        return cls([word for _, word in scored], [score for score, _ in scored])
+
+    @staticmethod
+    def cache_path(word_list_file: Path, layout: KeyboardLayout) -> Path:
+        """Get the cache file stored next to the word list."""
+        word_list_file = Path(word_list_file)
+        return word_list_file.with_name(f"{word_list_file.stem}.{layout.name}.scores.json")
+
+    @classmethod
+    def load_or_build(cls, word_list_file: Path, words: Sequence[str],
+                      layout: KeyboardLayout) -> 'WordDifficultyIndex':
+        """Load the cached index for (corpus, layout), rebuilding it if stale."""
+        cache_file = cls.cache_path(word_list_file, layout)
+        corpus = hashlib.sha1("\n".join(words).encode('utf-8')).hexdigest()
+
+        if cache_file.exists():
+            try:
+                cached = json.loads(cache_file.read_text(encoding='utf-8'))
+                if cached['corpus'] == corpus and cached['layout'] == layout.fingerprint:
+                    return cls(cached['words'], cached['scores'])
+            except (json.JSONDecodeError, KeyError, TypeError):
+                pass
+
+        index = cls.build(words, layout)
+        try:
+            cache_file.write_text(json.dumps({
+                'corpus': corpus,
+                'layout': layout.fingerprint,
+                'words': index.words,
+                'scores': index.scores
+            }), encoding='utf-8')
+        except OSError:
+            pass  # A read-only word list directory just means no cache
+        return index
+
+    def __len__(self) -> int:
+        """Get the number of indexed words."""
+        return len(self.words)
+
+    def band(self, low: float, high: float) -> List[str]:
+        """Get the words between two difficulty percentiles (0.0 to 1.0)."""
+        if not 0.0 <= low < high <= 1.0:
+            raise ValueError(f"Invalid difficulty band: {low}-{high}")
+        start = int(low * len(self.words))
+        end = max(int(math.ceil(high * len(self.words))), start + 1)
+        return self.words[start:end]
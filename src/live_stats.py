@@ -0,0 +1,101 @@
+"""
+Rolling statistics gathered while a test is running.
+"""
+from typing import Dict, List, Optional, Set
+
+from .utils import CHARS_PER_WORD
+
+# Longer gaps are pauses, not key latency
+MAX_KEY_LATENCY = 2.0
+
+class KeystrokeWindow:
+    """Fixed-size ring buffer of keystroke timestamps for rolling WPM."""
+
+    def __init__(self, window_seconds: float = 5.0, capacity: int = 512):
+        """Initialize an empty window."""
+        if window_seconds <= 0 or capacity <= 0:
+            raise ValueError("Window length and capacity must be positive")
+
+        self.window_seconds = window_seconds
+        self.capacity = capacity
+        self._times: List[float] = [0.0] * capacity
+        self._head = 0  # Index of the oldest timestamp
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Get the number of timestamps currently held."""
+        return self._count
+
+    def add(self, timestamp: float) -> None:
+        """Record a keystroke, overwriting the oldest one when full."""
+        tail = (self._head + self._count) % self.capacity
+        self._times[tail] = timestamp
+        if self._count == self.capacity:
+            self._head = (self._head + 1) % self.capacity
+        else:
+            self._count += 1
+
+    def _evict(self, now: float) -> None:
+        """Drop timestamps that fell out of the window."""
+        cutoff = now - self.window_seconds
+        while self._count and self._times[self._head] < cutoff:
+            self._head = (self._head + 1) % self.capacity
+            self._count -= 1
+
+    def count(self, now: float) -> int:
+        """Get the number of keystrokes in the window ending at ``now``."""
+        self._evict(now)
+        return self._count
+
+    def wpm(self, now: float) -> float:
+        """Get the rolling words per minute over the window."""
+        return self.count(now) / CHARS_PER_WORD * 60.0 / self.window_seconds
+
+    def clear(self) -> None:
+        """Forget all recorded keystrokes."""
+        self._head = 0
+        self._count = 0
+
+class KeyStats:
+    """Per-key error and latency totals that remember which keys changed."""
+
+    def __init__(self):
+        """Initialize empty totals."""
+        self.hits: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.latency_total: Dict[str, float] = {}
+        self.latency_count: Dict[str, int] = {}
+        self.dirty: Set[str] = set()
+
+    def record(self, key: str, correct: bool, latency: Optional[float] = None) -> None:
+        """Record a key that was meant to be typed and how long it took."""
+        self.hits[key] = self.hits.get(key, 0) + 1
+        if not correct:
+            self.errors[key] = self.errors.get(key, 0) + 1
+        if latency is not None and 0 <= latency <= MAX_KEY_LATENCY:
+            self.latency_total[key] = self.latency_total.get(key, 0.0) + latency
+            self.latency_count[key] = self.latency_count.get(key, 0) + 1
+        self.dirty.add(key)
+
+    def error_rate(self, key: str) -> Optional[float]:
+        """Get the share of attempts at a key that were wrong."""
+        hits = self.hits.get(key)
+        return self.errors.get(key, 0) / hits if hits else None
+
+    def mean_latency(self, key: str) -> Optional[float]:
+        """Get the mean seconds taken to reach a key."""
+        count = self.latency_count.get(key)
+        return self.latency_total[key] / count if count else None
+
+    def take_dirty(self) -> Set[str]:
+        """Get the keys changed since the last call."""
+        dirty, self.dirty = self.dirty, set()
+        return dirty
+
+    def clear(self) -> None:
+        """Forget all totals, marking every known key as changed."""
+        self.dirty |= self.hits.keys()
+        self.hits.clear()
+        self.errors.clear()
+        self.latency_total.clear()
+        self.latency_count.clear()
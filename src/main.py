@@ -7,6 +7,7 @@ from src.gui import TypingSpeedGUI
 def main():
     root = tk.Tk()
     app = TypingSpeedGUI(root)
+    root.protocol("WM_DELETE_WINDOW", app.destroy)
     root.mainloop()
 
 if __name__ == "__main__":
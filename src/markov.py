@@ -0,0 +1,289 @@
+"""
+Markov-chain passage generator with compressed-sparse-row transition tables.
+
+A trained model is a directory of flat binary arrays:
+
+- ``contexts.bin``: sorted packed context keys, one per CSR row
+- ``indptr.bin``: row start offsets into the two arrays below
+- ``next_ids.bin``: the word id of each possible next word
+- ``cum_weights.bin``: running transition counts within each row
+
+plus ``vocab.txt`` and ``meta.json``. The arrays are memory-mapped on load,
+and each next word is a binary search over its row's cumulative weights.
+"""
+import argparse
+import heapq
+import json
+import random
+import re
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .utils import normalize_text
+
+BOUNDARY = 0
+ID_BITS = 21
+MAX_VOCAB = 1 << ID_BITS
+MAX_ORDER = 3
+SENTENCE_END = re.compile(r'[.!?]["\')\]]*$')
+# Rows of (context, next_id, count) written per block while spilling and merging
+BLOCK_ROWS = 65536
+# Sentence restarts in a row, without a usable word, before giving up
+MAX_RESTARTS = 1000
+
+def _pack(context: Iterable[int]) -> int:
+    """Pack up to three word ids into a single sortable key."""
+    key = 0
+    for word_id in context:
+        key = (key << ID_BITS) | word_id
+    return key
+
+def _write_chunk(counts: Dict[Tuple[int, int], int], chunk_file: Path) -> None:
+    """Spill pending counts to disk as sorted (context, next_id, count) rows."""
+    rows = array('q')
+    for (context, next_id), count in sorted(counts.items()):
+        rows.extend((context, next_id, count))
+    with open(chunk_file, 'wb') as f:
+        rows.tofile(f)
+
+def _read_chunk(chunk_file: Path) -> Iterator[Tuple[int, int, int]]:
+    """Stream (context, next_id, count) rows back from a chunk file."""
+    with open(chunk_file, 'rb') as f:
+        while True:
+            block = array('q')
+            try:
+                block.fromfile(f, BLOCK_ROWS * 3)
+            except EOFError:
+                pass  # A short final block is still loaded
+            if not block:
+                return
+            for i in range(0, len(block), 3):
+                yield block[i], block[i + 1], block[i + 2]
+
+class _ArrayWriter:
+    """Buffers a typed array and appends it to a file in blocks."""
+
+    def __init__(self, path: Path, typecode: str):
+        """Open the output file."""
+        self.file = open(path, 'wb')
+        self.typecode = typecode
+        self.buffer = array(typecode)
+
+    def append(self, value: int) -> None:
+        """Append a value, writing the buffer out when it fills."""
+        self.buffer.append(value)
+        if len(self.buffer) >= BLOCK_ROWS:
+            self.buffer.tofile(self.file)
+            self.buffer = array(self.typecode)
+
+    def close(self) -> None:
+        """Write what is left and close the file."""
+        self.buffer.tofile(self.file)
+        self.file.close()
+
+def train_model(corpus_file: Path, model_dir: Path, order: int = 2,
+                max_pending: int = 500000) -> 'MarkovModel':
+    """
+    Train a model from a text corpus in bounded memory.
+
+    The corpus is streamed line by line. At most ``max_pending`` distinct
+    transitions are counted in memory before being spilled to a sorted chunk
+    on disk; the chunks are then k-way merged straight into the CSR arrays.
+    Only the vocabulary is held in memory for the whole run.
+    """
+    if not 1 <= order <= MAX_ORDER:
+        raise ValueError(f"Order must be between 1 and {MAX_ORDER}")
+
+    model_dir = Path(model_dir)
+    model_dir.mkdir(parents=True, exist_ok=True)
+    vocab: Dict[str, int] = {'': BOUNDARY}
+    words: List[str] = ['']
+    counts: Dict[Tuple[int, int], int] = {}
+    chunks: List[Path] = []
+    start = [BOUNDARY] * order
+    context = list(start)
+
+    def count(next_id: int) -> None:
+        """Count a transition from the current context, spilling when full."""
+        key = (_pack(context), next_id)
+        counts[key] = counts.get(key, 0) + 1
+        if len(counts) >= max_pending:
+            chunk_file = model_dir / f"chunk_{len(chunks)}.bin"
+            _write_chunk(counts, chunk_file)
+            chunks.append(chunk_file)
+            counts.clear()
+
+    with open(corpus_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            tokens = line.split()
+            if not tokens and context != start:
+                # Blank lines end paragraphs, and with them sentences
+                count(BOUNDARY)
+                context = list(start)
+            for token in tokens:
+                token = normalize_text(token)
+                word_id = vocab.get(token)
+                if word_id is None:
+                    if len(words) >= MAX_VOCAB:
+                        raise ValueError(f"Vocabulary exceeds {MAX_VOCAB} words")
+                    word_id = vocab[token] = len(words)
+                    words.append(token)
+                count(word_id)
+                context = context[1:] + [word_id]
+                if SENTENCE_END.search(token):
+                    count(BOUNDARY)
+                    context = list(start)
+
+    if context != start:
+        count(BOUNDARY)
+    if counts:
+        chunk_file = model_dir / f"chunk_{len(chunks)}.bin"
+        _write_chunk(counts, chunk_file)
+        chunks.append(chunk_file)
+    if not chunks:
+        raise ValueError(f"Corpus is empty: {corpus_file}")
+
+    contexts = _ArrayWriter(model_dir / 'contexts.bin', 'q')
+    indptr = _ArrayWriter(model_dir / 'indptr.bin', 'q')
+    next_ids = _ArrayWriter(model_dir / 'next_ids.bin', 'i')
+    cum_weights = _ArrayWriter(model_dir / 'cum_weights.bin', 'q')
+
+    current: Optional[Tuple[int, int]] = None
+    current_count = 0
+    row_context: Optional[int] = None
+    row_total = 0
+    entries = 0
+
+    def emit(context_key: int, next_id: int, weight: int) -> None:
+        """Append a transition, starting a new CSR row when the context changes."""
+        nonlocal row_context, row_total, entries
+        if context_key != row_context:
+            contexts.append(context_key)
+            indptr.append(entries)
+            row_context = context_key
+            row_total = 0
+        row_total += weight
+        next_ids.append(next_id)
+        cum_weights.append(row_total)
+        entries += 1
+
+    for context_key, next_id, weight in heapq.merge(*(_read_chunk(chunk) for chunk in chunks)):
+        if (context_key, next_id) == current:
+            current_count += weight
+            continue
+        if current is not None:
+            emit(current[0], current[1], current_count)
+        current, current_count = (context_key, next_id), weight
+    emit(current[0], current[1], current_count)
+    indptr.append(entries)
+
+    for writer in (contexts, indptr, next_ids, cum_weights):
+        writer.close()
+    for chunk in chunks:
+        chunk.unlink()
+
+    (model_dir / 'vocab.txt').write_text("\n".join(words[1:]), encoding='utf-8')
+    (model_dir / 'meta.json').write_text(json.dumps({'order': order, 'vocab_size': len(words)}))
+    return MarkovModel.load(model_dir)
+
+class MarkovModel:
+    """Memory-mapped n-gram model that draws prose-like passages."""
+
+    def __init__(self, order: int, words: List[str], contexts: np.ndarray, indptr: np.ndarray,
+                 next_ids: np.ndarray, cum_weights: np.ndarray):
+        """Initialize the model from its CSR arrays."""
+        self.order = order
+        self.words = words
+        self.contexts = contexts
+        self.indptr = indptr
+        self.next_ids = next_ids
+        self.cum_weights = cum_weights
+        self.blocked: Set[int] = set()
+        self._start = self._row(_pack([BOUNDARY] * order))
+        if self._start is None:
+            raise ValueError("Model has no sentence starts")
+
+    @classmethod
+    def load(cls, model_dir: Path) -> 'MarkovModel':
+        """Load a trained model, memory-mapping its transition tables."""
+        model_dir = Path(model_dir)
+        meta = json.loads((model_dir / 'meta.json').read_text())
+        words = [''] + (model_dir / 'vocab.txt').read_text(encoding='utf-8').split('\n')
+
+        def table(name: str, dtype: str) -> np.ndarray:
+            """Map a table file read-only."""
+            return np.memmap(model_dir / name, dtype=dtype, mode='r')
+
+        return cls(
+            meta['order'], words,
+            table('contexts.bin', 'i8'), table('indptr.bin', 'i8'),
+            table('next_ids.bin', 'i4'), table('cum_weights.bin', 'i8')
+        )
+
+    def block(self, is_banned: Callable[[str], bool]) -> int:
+        """Stop generating words for which ``is_banned`` is true; returns how many."""
+        self.blocked = {
+            word_id for word_id, word in enumerate(self.words)
+            if word_id != BOUNDARY and is_banned(word)
+        }
+        return len(self.blocked)
+
+    def _row(self, key: int) -> Optional[int]:
+        """Find the CSR row for a packed context, if it was seen in training."""
+        row = int(self.contexts.searchsorted(key))
+        if row < len(self.contexts) and self.contexts[row] == key:
+            return row
+        return None
+
+    def _draw(self, row: int, rng: random.Random) -> int:
+        """Draw a next word id from a row in O(log k)."""
+        start, end = int(self.indptr[row]), int(self.indptr[row + 1])
+        weights = self.cum_weights[start:end]
+        target = rng.randrange(int(weights[-1]))
+        return int(self.next_ids[start + int(weights.searchsorted(target, side='right'))])
+
+    def generate(self, word_count: int, rng: Optional[random.Random] = None) -> List[str]:
+        """Generate a passage of ``word_count`` words spanning whole sentences."""
+        rng = rng or random.Random()
+        words: List[str] = []
+        context = [BOUNDARY] * self.order
+        row = self._start
+        restarts = 0
+        while len(words) < word_count:
+            next_id = self._draw(row, rng)
+            if next_id == BOUNDARY or next_id in self.blocked:
+                # A blocked word ends the sentence before it is shown
+                restarts += next_id != BOUNDARY
+                if restarts > MAX_RESTARTS:
+                    raise ValueError("Invalid sentence model: blocked words leave nothing to generate")
+                context = [BOUNDARY] * self.order
+                row = self._start
+                continue
+            restarts = 0
+            words.append(self.words[next_id])
+            context = context[1:] + [next_id]
+            row = self._row(_pack(context))
+            if row is None:
+                # Dead end where the corpus stopped mid-sentence
+                context = [BOUNDARY] * self.order
+                row = self._start
+        return words
+
+def main() -> None:
+    """Train a model from the command line."""
+    parser = argparse.ArgumentParser(description="Train a Markov passage model.")
+    parser.add_argument('corpus', type=Path, help="UTF-8 text corpus")
+    parser.add_argument('model_dir', type=Path, help="Output model directory")
+    parser.add_argument('--order', type=int, default=2, help="N-gram context length (1-3)")
+    parser.add_argument('--max-pending', type=int, default=500000,
+                        help="Transitions counted in memory before spilling to disk")
+    args = parser.parse_args()
+    model = train_model(args.corpus, args.model_dir, args.order, args.max_pending)
+    print(f"Trained order-{model.order} model: {len(model.words) - 1} words, "
+          f"{len(model.contexts)} contexts, {len(model.next_ids)} transitions")
+
+if __name__ == "__main__":
+    main()
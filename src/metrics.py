@@ -0,0 +1,173 @@
+"""
+Typing test metrics computed from one tally per finished test.
+
+``tally`` segments the final and target text once each, compares them
+cluster by cluster and replays the keystroke log once, collecting the
+counts every metric needs: correct and wrong characters, erased
+characters, backspaces and per-interval speed. Registered metrics are then
+O(1) functions of that tally, so adding a metric never adds a pass. The
+tally is taken when a test ends; the live display uses the counters
+``TypedProgress`` keeps while typing. Error counts follow Soukoreff and
+MacKenzie: uncorrected errors are wrong characters left in the text,
+corrected errors are characters erased with backspace.
+"""
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from .utils import CHARS_PER_WORD, split_graphemes
+
+BACKSPACE = 8
+SPEED_INTERVAL = 1.0
+
+@dataclass
+class Tally:
+    """Counts gathered in one pass over a finished test."""
+    elapsed: float
+    typed_chars: int = 0
+    target_chars: int = 0
+    correct_chars: int = 0
+    incorrect_chars: int = 0
+    erased_chars: int = 0
+    fixes: int = 0
+    keystrokes: int = 0
+    interval_counts: List[int] = field(default_factory=list)
+    interval: float = SPEED_INTERVAL
+
+    @property
+    def minutes(self) -> float:
+        """Get the elapsed time in minutes."""
+        return self.elapsed / 60.0
+
+MetricFunction = Callable[[Tally], float]
+METRICS: Dict[str, MetricFunction] = {}
+
+def register_metric(name: str) -> Callable[[MetricFunction], MetricFunction]:
+    """Register a metric computed from a tally under ``name``."""
+    def decorator(func: MetricFunction) -> MetricFunction:
+        if name in METRICS:
+            raise ValueError(f"Invalid metric name: {name} is already registered")
+        METRICS[name] = func
+        return func
+    return decorator
+
+def tally(typed_text: str, target_text: str, elapsed: float,
+          keys: Optional[Sequence[int]] = None, key_times: Optional[Sequence[float]] = None,
+          interval: float = SPEED_INTERVAL) -> Tally:
+    """
+    Count everything the registered metrics need in a single pass.
+
+    ``keys`` hold one code point per typed cluster and ``BACKSPACE`` per
+    erased cluster, and ``key_times`` their offsets in seconds from the
+    start. Without them every final character counts as one keystroke.
+    """
+    result = Tally(elapsed=max(elapsed, 0.0), interval=interval)
+    typed = split_graphemes(typed_text)
+    target = split_graphemes(target_text)
+    result.typed_chars = len(typed)
+    result.target_chars = len(target)
+    for typed_char, target_char in zip(typed, target):
+        result.correct_chars += typed_char == target_char
+    result.incorrect_chars = result.typed_chars - result.correct_chars
+
+    if not keys:
+        result.keystrokes = result.typed_chars
+        return result
+
+    complete = int(result.elapsed / interval)
+    counts = [0] * complete
+    length = 0
+    times: Iterable[float] = key_times if key_times is not None else [-1.0] * len(keys)
+    for key, key_time in zip(keys, times):
+        if key == BACKSPACE:
+            result.fixes += 1
+            if length:
+                length -= 1
+                result.erased_chars += 1
+            continue
+        length += 1
+        bucket = int(key_time / interval)
+        if 0 <= bucket < complete:
+            counts[bucket] += 1
+    result.keystrokes = len(keys)
+    result.interval_counts = counts
+    return result
+
+def evaluate(counts: Tally, names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """Compute registered metrics, all of them by default, from a tally."""
+    selected = METRICS if names is None else {name: METRICS[name] for name in names}
+    return {name: round(func(counts), 2) for name, func in selected.items()}
+
+def compute_metrics(typed_text: str, target_text: str, elapsed: float,
+                    keys: Optional[Sequence[int]] = None,
+                    key_times: Optional[Sequence[float]] = None) -> Dict[str, float]:
+    """Tally a finished test and compute every registered metric."""
+    return evaluate(tally(typed_text, target_text, elapsed, keys, key_times))
+
+@register_metric('gross_wpm')
+def gross_wpm(counts: Tally) -> float:
+    """Get words per minute typed, counting five characters as a word."""
+    if counts.minutes <= 0:
+        return 0.0
+    return counts.typed_chars / CHARS_PER_WORD / counts.minutes
+
+@register_metric('net_wpm')
+def net_wpm(counts: Tally) -> float:
+    """Get gross WPM less one word per minute for each uncorrected error."""
+    if counts.minutes <= 0:
+        return 0.0
+    return max(gross_wpm(counts) - counts.incorrect_chars / counts.minutes, 0.0)
+
+@register_metric('accuracy')
+def accuracy(counts: Tally) -> float:
+    """Get correct characters as a percentage of the longer of typed and target text."""
+    total = max(counts.typed_chars, counts.target_chars)
+    return counts.correct_chars / total * 100.0 if total else 100.0
+
+@register_metric('cpm')
+def cpm(counts: Tally) -> float:
+    """Get correct characters per minute."""
+    return counts.correct_chars / counts.minutes if counts.minutes > 0 else 0.0
+
+@register_metric('kspc')
+def kspc(counts: Tally) -> float:
+    """Get keystrokes per character of final text."""
+    return counts.keystrokes / counts.typed_chars if counts.typed_chars else 0.0
+
+@register_metric('corrected_errors')
+def corrected_errors(counts: Tally) -> float:
+    """Get the number of characters erased while typing."""
+    return counts.erased_chars
+
+@register_metric('uncorrected_errors')
+def uncorrected_errors(counts: Tally) -> float:
+    """Get the number of wrong characters left in the text."""
+    return counts.incorrect_chars
+
+@register_metric('error_rate')
+def error_rate(counts: Tally) -> float:
+    """Get corrected and uncorrected errors as a percentage of entries."""
+    entries = counts.typed_chars + counts.erased_chars
+    if not entries:
+        return 0.0
+    return (counts.incorrect_chars + counts.erased_chars) / entries * 100.0
+
+@register_metric('speed_stddev')
+def speed_stddev(counts: Tally) -> float:
+    """Get the standard deviation of WPM across whole intervals."""
+    samples = counts.interval_counts
+    if len(samples) < 2:
+        return 0.0
+    scale = 60.0 / counts.interval / CHARS_PER_WORD
+    mean = sum(samples) / len(samples)
+    variance = sum((count - mean) ** 2 for count in samples) / len(samples)
+    return math.sqrt(variance) * scale
+
+@register_metric('consistency')
+def consistency(counts: Tally) -> float:
+    """Get 100 less the coefficient of variation of interval speed, floored at 0."""
+    samples = counts.interval_counts
+    if len(samples) < 2 or not sum(samples):
+        return 100.0
+    mean_wpm = sum(samples) / len(samples) * 60.0 / counts.interval / CHARS_PER_WORD
+    return max(100.0 - speed_stddev(counts) / mean_wpm * 100.0, 0.0)
@@ -0,0 +1,146 @@
+"""
+Grapheme-aware passage model for comparing typed input.
+"""
+from bisect import bisect_left
+from typing import Dict, List
+
+from .utils import common_prefix_length, grapheme_boundaries, normalize_text
+
+def _cluster_width(cluster: str, astral_width: int) -> int:
+    """Get the widget columns a cluster occupies."""
+    return sum(astral_width if ord(char) > 0xFFFF else 1 for char in cluster)
+
+class Passage:
+    """Target text split into grapheme clusters once, up front."""
+
+    def __init__(self, text: str):
+        """Normalize the text and precompute its cluster offset table."""
+        self.text = normalize_text(text)
+        self.offsets: List[int] = [0] + grapheme_boundaries(self.text)
+        self.clusters: List[str] = [
+            self.text[start:end] for start, end in zip(self.offsets, self.offsets[1:])
+        ]
+        self._columns: Dict[int, List[int]] = {}
+
+    def __len__(self) -> int:
+        """Get the number of user-perceived characters."""
+        return len(self.clusters)
+
+    def columns(self, astral_width: int = 1) -> List[int]:
+        """
+        Get the widget column offset where each cluster starts.
+
+        Tk 8.6 stores characters outside the Basic Multilingual Plane as
+        surrogate pairs, so those count as ``astral_width`` columns.
+        """
+        if astral_width not in self._columns:
+            columns = [0]
+            for cluster in self.clusters:
+                columns.append(columns[-1] + _cluster_width(cluster, astral_width))
+            self._columns[astral_width] = columns
+        return self._columns[astral_width]
+
+    def replace_tail(self, index: int, tail: str) -> None:
+        """
+        Replace the clusters from ``index`` onwards with new text.
+
+        Only the new tail is segmented; the offsets, clusters and cached
+        columns before ``index`` are kept. The tail must not start with a
+        combining mark, so splice at a word boundary.
+        """
+        if not 0 <= index <= len(self.clusters):
+            raise ValueError(f"Invalid splice index: {index}")
+        start = self.offsets[index]
+        self.text = self.text[:start] + normalize_text(tail)
+        del self.offsets[index + 1:]
+        del self.clusters[index:]
+        for end in grapheme_boundaries(self.text, start):
+            self.clusters.append(self.text[self.offsets[-1]:end])
+            self.offsets.append(end)
+
+        for astral_width, columns in self._columns.items():
+            del columns[index + 1:]
+            for cluster in self.clusters[index:]:
+                columns.append(columns[-1] + _cluster_width(cluster, astral_width))
+
+class TypedProgress:
+    """Incrementally compares typed input against a passage."""
+
+    def __init__(self, passage: Passage):
+        """Initialize progress tracking for a passage."""
+        self.passage = passage
+        # Input as typed, and where each typed cluster starts in it
+        self.text = ""
+        self.offsets: List[int] = [0]
+        self.matches: List[bool] = []
+        self.correct = 0
+        # Whitespace-separated words starting in each typed cluster
+        self.word_starts: List[int] = []
+        self.words = 0
+
+    def __len__(self) -> int:
+        """Get the number of typed user-perceived characters."""
+        return len(self.matches)
+
+    def change_point(self, typed_text: str) -> int:
+        """Find where the input differs from the previous one."""
+        # Typing and deleting at the end need a single prefix check
+        if typed_text.startswith(self.text):
+            return len(self.text)
+        if self.text.startswith(typed_text):
+            return len(typed_text)
+        return common_prefix_length(self.text, typed_text)
+
+    def update(self, typed_text: str) -> int:
+        """
+        Update progress with the current input.
+
+        Only the clusters from the edit point on are segmented, normalized
+        and compared, so typing or deleting at the end does Python work for
+        one or two clusters whatever the passage length; finding the edit
+        point is a single C-level prefix comparison. Each typed cluster is
+        normalized on its own, which is valid because NFC never composes
+        across cluster boundaries. Returns the index of the first cluster
+        whose status may have changed.
+        """
+        changed_at = self.change_point(typed_text)
+        if changed_at == len(self.text) == len(typed_text):
+            return len(self.matches)
+
+        # A new combining mark can extend the cluster before the change point
+        first = max(bisect_left(self.offsets, changed_at) - 1, 0)
+        del self.offsets[first + 1:]
+        for match in self.matches[first:]:
+            self.correct -= match
+        del self.matches[first:]
+        self.words -= sum(self.word_starts[first:])
+        del self.word_starts[first:]
+
+        clusters = self.passage.clusters
+        start = self.offsets[-1]
+        for end in grapheme_boundaries(typed_text, start):
+            index = len(self.matches)
+            match = (index < len(clusters)
+                     and normalize_text(typed_text[start:end]) == clusters[index])
+            self.matches.append(match)
+            self.correct += match
+            starts = sum(
+                1 for i in range(start, end)
+                if not typed_text[i].isspace() and (i == 0 or typed_text[i - 1].isspace())
+            )
+            self.word_starts.append(starts)
+            self.words += starts
+            self.offsets.append(end)
+            start = end
+
+        self.text = typed_text
+        return first
+
+    def accuracy(self) -> float:
+        """Get the percentage of passage characters typed correctly so far."""
+        total = max(len(self.matches), len(self.passage))
+        return self.correct / total * 100.0 if total else 100.0
+
+    def is_complete(self) -> bool:
+        """Check whether the whole passage has been typed."""
+        return len(self.matches) >= len(self.passage)
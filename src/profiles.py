@@ -0,0 +1,181 @@
+"""
+Per-user profiles stored in sharded directories.
+
+Each user gets ``<root>/<hh>/<user_id>/`` where ``hh`` comes from a hash of
+the id, so no directory grows past a few hundred entries. Only the active
+user's shard is ever read. Cross-user leaderboards live in one small index
+holding each user's best score per difficulty, capped at the leaderboard
+size, so it stays the same size however many profiles exist.
+"""
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Optional
+
+from .high_scores import HighScores, Leaderboard
+from .settings import MACHINE_ID, MAX_HIGH_SCORES, SHARED_SCORES_DIR
+
+USER_ID_PATTERN = re.compile(r'[\w.-]{1,64}')
+
+def profile_id(name: str) -> str:
+    """Get the id used to file a user's profile."""
+    user_id = '-'.join(name.split()).casefold()
+    if not USER_ID_PATTERN.fullmatch(user_id) or user_id.strip('.') == '':
+        raise ValueError(f"Invalid user name: {name!r}")
+    return user_id
+
+def _write_json(path: Path, data: Any) -> None:
+    """Write a JSON file atomically."""
+    temp_file = path.with_suffix('.tmp')
+    temp_file.write_text(json.dumps(data))
+    os.replace(temp_file, path)
+
+@dataclass
+class UserProfile:
+    """One user's settings, stats and lazily loaded scores."""
+    user_id: str
+    name: str
+    directory: Path
+    settings: Dict[str, Any] = field(default_factory=dict)
+    stats: Dict[str, float] = field(
+        default_factory=lambda: {'tests': 0, 'seconds': 0.0, 'best_wpm': 0.0}
+    )
+    shared_dir: Optional[Path] = None
+    machine_id: str = MACHINE_ID
+    share_root: Optional[Path] = None
+    _high_scores: Optional[HighScores] = field(default=None, init=False, repr=False)
+
+    @property
+    def profile_file(self) -> Path:
+        """Get the file holding the name, settings and stats."""
+        return self.directory / 'profile.json'
+
+    @property
+    def high_scores(self) -> HighScores:
+        """Get the user's scores, loading them on first use."""
+        if self._high_scores is None:
+            self._high_scores = HighScores(
+                self.directory / 'scores.json', self.shared_dir, self.machine_id, self.share_root
+            )
+        return self._high_scores
+
+    def record_result(self, wpm: float, elapsed: float) -> None:
+        """Add a finished test to the user's stats."""
+        self.stats['tests'] += 1
+        self.stats['seconds'] = round(self.stats['seconds'] + elapsed, 2)
+        self.stats['best_wpm'] = max(self.stats['best_wpm'], wpm)
+        self.save()
+
+    def save(self) -> None:
+        """Save the name, settings and stats."""
+        _write_json(self.profile_file, {
+            'name': self.name,
+            'settings': self.settings,
+            'stats': self.stats
+        })
+
+class ProfileStore:
+    """Finds user shards and keeps the cross-user leaderboard index."""
+
+    def __init__(self, root_dir: Path, shared_dir: Optional[Path] = SHARED_SCORES_DIR,
+                 machine_id: str = MACHINE_ID):
+        """Initialize the store without reading any profile."""
+        self.root_dir = Path(root_dir)
+        self.share_root = Path(shared_dir) if shared_dir else None
+        self.shared_dir = self.share_root / 'profiles' if self.share_root else None
+        self.machine_id = machine_id
+        self._index: Optional[Dict[str, Any]] = None
+
+    @property
+    def index_file(self) -> Path:
+        """Get the global index file."""
+        return self.root_dir / 'index.json'
+
+    def shard_path(self, user_id: str) -> Path:
+        """Get a user's shard directory relative to the store."""
+        bucket = hashlib.sha1(user_id.encode('utf-8')).hexdigest()[:2]
+        return Path(bucket) / user_id
+
+    def open(self, name: str) -> UserProfile:
+        """Load a user's profile, creating it on first use."""
+        user_id = profile_id(name)
+        shard = self.shard_path(user_id)
+        profile = UserProfile(
+            user_id, name.strip(), self.root_dir / shard,
+            shared_dir=self.shared_dir / shard if self.shared_dir else None,
+            machine_id=self.machine_id,
+            share_root=self.share_root
+        )
+        repairing = profile.profile_file.exists()
+        if repairing:
+            try:
+                data = json.loads(profile.profile_file.read_text())
+                profile.name = data['name']
+                profile.settings.update(data['settings'])
+                profile.stats.update(data['stats'])
+                return profile
+            except (json.JSONDecodeError, KeyError, TypeError):
+                pass  # Rewritten below
+
+        profile.directory.mkdir(parents=True, exist_ok=True)
+        profile.save()
+        index = self._load_index()
+        if repairing:
+            # The user was counted when created; recount rather than trust the index
+            index['users'] = self._count_profiles()
+        else:
+            index['users'] += 1
+        _write_json(self.index_file, index)
+        return profile
+
+    def _count_profiles(self) -> int:
+        """Count the profiles on disk by walking the shards."""
+        return sum(1 for _ in self.root_dir.glob('*/*/profile.json'))
+
+    def _load_index(self) -> Dict[str, Any]:
+        """Load the global index once."""
+        if self._index is None:
+            self._index = {'users': 0, 'leaderboard': {}}
+            if self.index_file.exists():
+                try:
+                    loaded = json.loads(self.index_file.read_text())
+                    if isinstance(loaded, dict) and {'users', 'leaderboard'} <= loaded.keys():
+                        self._index = loaded
+                except json.JSONDecodeError:
+                    pass
+            self.root_dir.mkdir(parents=True, exist_ok=True)
+        return self._index
+
+    @property
+    def user_count(self) -> int:
+        """Get the number of profiles created."""
+        return self._load_index()['users']
+
+    def leaderboard(self, difficulty: str) -> Leaderboard:
+        """Get the best score of each top user for a difficulty."""
+        entries = self._load_index()['leaderboard'].get(difficulty, [])
+        return tuple(MappingProxyType(entry) for entry in entries)
+
+    def submit(self, profile: UserProfile, difficulty: str, wpm: float,
+               accuracy: float) -> Optional[int]:
+        """Offer a score to the cross-user leaderboard and get its place, if any."""
+        index = self._load_index()
+        board = index['leaderboard'].setdefault(difficulty, [])
+        current = next((e for e in board if e['user'] == profile.user_id), None)
+        if current and current['wpm'] >= wpm:
+            return None
+        if current:
+            board.remove(current)
+
+        entry = {'user': profile.user_id, 'name': profile.name, 'wpm': wpm, 'accuracy': accuracy}
+        board.append(entry)
+        board.sort(key=lambda e: (-e['wpm'], e['user']))
+        del board[MAX_HIGH_SCORES:]
+        if entry not in board:
+            return None
+        _write_json(self.index_file, index)
+        return board.index(entry) + 1
@@ -0,0 +1,166 @@
+"""
+Score synchronization between machines through a shared directory.
+
+Every machine appends its own scores to ``<machine_id>.deltas`` in the
+shared directory, one JSON record per line with a per-machine sequence
+number. Each machine remembers how far it has read every peer's file (byte
+offset and last sequence number), so a sync only reads records added since
+the previous one and never applies the same record twice. New scores are
+only queued in local state; ``flush`` and ``pull`` touch the share and are
+meant for a background thread, so scores made while it is unreachable or
+hung wait locally until it is back.
+"""
+import json
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Any, Collection, Dict, List, Optional
+
+DELTA_SUFFIX = '.deltas'
+DIFFICULTIES = ('easy', 'medium', 'hard')
+
+def _is_number(value: Any) -> bool:
+    """Check for a finite int or float, not a bool."""
+    return (isinstance(value, (int, float)) and not isinstance(value, bool)
+            and math.isfinite(value))
+
+def is_valid_record(record: Any, difficulties: Collection[str] = DIFFICULTIES) -> bool:
+    """Check that a peer record can be merged into a leaderboard."""
+    return (
+        isinstance(record, dict)
+        and _is_number(record.get('wpm'))
+        and _is_number(record.get('accuracy'))
+        and record.get('difficulty') in difficulties
+        and isinstance(record.get('seq'), int) and not isinstance(record['seq'], bool)
+    )
+
+class ScoreSync:
+    """Publishes local score records and pulls new ones from peers."""
+
+    def __init__(self, shared_dir: Path, machine_id: str, state_file: Path,
+                 share_root: Optional[Path] = None,
+                 difficulties: Collection[str] = DIFFICULTIES):
+        """
+        Initialize sync state for this machine.
+
+        ``shared_dir`` is created on flush when it lies below ``share_root``
+        and that root is reachable; by default it must already exist, so an
+        unmounted share is never shadowed by a local directory.
+        """
+        if not machine_id or '/' in machine_id or '\\' in machine_id:
+            raise ValueError(f"Invalid machine id: {machine_id!r}")
+        self.shared_dir = Path(shared_dir)
+        self.share_root = Path(share_root) if share_root else self.shared_dir
+        self.difficulties = tuple(difficulties)
+        self.machine_id = machine_id
+        self.state_file = Path(state_file)
+        self.state: Dict[str, Any] = {'seq': 0, 'pending': [], 'peers': {}}
+        # Guards the state shared by publish and a background flush
+        self._lock = threading.Lock()
+        self._load_state()
+
+    @property
+    def delta_file(self) -> Path:
+        """Get this machine's file in the shared directory."""
+        return self.shared_dir / f"{self.machine_id}{DELTA_SUFFIX}"
+
+    def _load_state(self) -> None:
+        """Load sync progress from the local state file."""
+        if self.state_file.exists():
+            try:
+                loaded = json.loads(self.state_file.read_text())
+                if isinstance(loaded, dict) and {'seq', 'pending', 'peers'} <= loaded.keys():
+                    self.state = loaded
+            except json.JSONDecodeError:
+                pass
+
+    def _save_state(self) -> None:
+        """Save sync progress atomically."""
+        with self._lock:
+            temp_file = self.state_file.with_suffix('.tmp')
+            temp_file.write_text(json.dumps(self.state))
+            os.replace(temp_file, self.state_file)
+
+    def stamp(self) -> Dict[str, Any]:
+        """Get the source and next sequence number for a new local score."""
+        with self._lock:
+            self.state['seq'] += 1
+            return {'source': self.machine_id, 'seq': self.state['seq']}
+
+    def publish(self, difficulty: str, score: Dict[str, Any]) -> None:
+        """Queue a stamped local score for the next flush; never touches the share."""
+        record = {key: value for key, value in score.items() if key != 'ghost'}
+        record['difficulty'] = difficulty
+        with self._lock:
+            self.state['pending'].append(record)
+        self._save_state()
+
+    def flush(self) -> bool:
+        """Append queued records to the shared directory if it is reachable."""
+        with self._lock:
+            pending = list(self.state['pending'])
+        if pending:
+            try:
+                if self.shared_dir != self.share_root and self.share_root.is_dir():
+                    self.shared_dir.mkdir(parents=True, exist_ok=True)
+                with open(self.delta_file, 'a', encoding='utf-8') as f:
+                    f.write("".join(json.dumps(record) + '\n' for record in pending))
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError:
+                self._save_state()
+                return False
+            # Peers skip duplicates if we crash before recording this
+            with self._lock:
+                del self.state['pending'][:len(pending)]
+        self._save_state()
+        return True
+
+    def pull(self) -> List[Dict[str, Any]]:
+        """Read records peers appended since the last pull."""
+        try:
+            peer_files = [
+                path for path in self.shared_dir.iterdir()
+                if path.suffix == DELTA_SUFFIX and path.stem != self.machine_id
+            ]
+        except OSError:
+            return []
+
+        records = []
+        # Updated on a copy so a concurrent publish can save the state safely
+        peers = {peer: dict(progress) for peer, progress in self.state['peers'].items()}
+        for path in sorted(peer_files):
+            peer = peers.setdefault(path.stem, {'offset': 0, 'seq': 0})
+            try:
+                size = path.stat().st_size
+                if size == peer['offset']:
+                    continue
+                if size < peer['offset']:
+                    peer['offset'] = 0  # Rewritten file; sequence numbers still dedupe
+                with open(path, 'rb') as f:
+                    f.seek(peer['offset'])
+                    data = f.read(size - peer['offset'])
+            except OSError:
+                continue
+
+            # A partly written last line is read again next time
+            complete = data[:data.rfind(b'\n') + 1]
+            peer['offset'] += len(complete)
+            for line in complete.splitlines():
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                # A malformed record would break sorting for every later score
+                if not is_valid_record(record, self.difficulties):
+                    continue
+                seq = record['seq']
+                if seq > peer['seq'] and record.get('source') == path.stem:
+                    peer['seq'] = seq
+                    records.append(record)
+
+        with self._lock:
+            self.state['peers'] = peers
+        self._save_state()
+        return records
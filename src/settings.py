@@ -22,3 +22,11 @@ WORD_LISTS_FILE = config.word_lists_file
 
 # Game settings
 MAX_HIGH_SCORES = config.max_high_scores
+KEYBOARD_LAYOUT = config.keyboard_layout
+SENTENCE_MODEL = config.sentence_model
+CODE_DIR = config.code_dir
+STALL_WATCHDOG = config.stall_watchdog
+SHARED_SCORES_DIR = config.shared_scores_dir
+MACHINE_ID = config.machine_id
+DEFAULT_PROFILE = config.default_profile
+BLOCKLIST_FILE = config.blocklist_file
@@ -0,0 +1,235 @@
+"""
+Synthetic typist model for load and scoring simulation.
+
+Sessions are generated in batches with vectorized NumPy draws: every
+character of every session in a batch is produced by array operations, and
+Python only loops once per session to slice out the final strings.
+"""
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .game_logic import GameManager
+from .high_scores import HighScores
+from .metrics import BACKSPACE
+from .utils import CHARS_PER_WORD, load_word_list
+
+MIN_WPM = 5.0
+
+@dataclass
+class TypistProfile:
+    """Parameters describing a population of typists."""
+    wpm_mean: float = 45.0
+    wpm_std: float = 12.0
+    error_rate: float = 0.03
+    backspace_rate: float = 0.7
+    latency_jitter: float = 0.35
+    backspace_latency_ms: float = 150.0
+    bigram_latency_ms: Dict[str, float] = field(default_factory=dict)
+
+@dataclass
+class SessionBatch:
+    """A batch of simulated sessions with their keystroke streams."""
+    targets: List[str]
+    typed: List[str]
+    wpm: np.ndarray
+    durations: np.ndarray
+    keys: np.ndarray
+    key_times: np.ndarray
+    key_offsets: np.ndarray
+
+    def __len__(self) -> int:
+        """Get the number of sessions in the batch."""
+        return len(self.targets)
+
+    def keystrokes(self, index: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the key codes and millisecond timestamps of one session."""
+        start, end = self.key_offsets[index], self.key_offsets[index + 1]
+        return self.keys[start:end], self.key_times[start:end]
+
+def _encode(text: str) -> np.ndarray:
+    """Encode text as an array of code points."""
+    return np.frombuffer(text.encode('utf-32-le'), dtype='<u4')
+
+def _decode(codes: np.ndarray, offsets: np.ndarray) -> List[str]:
+    """Decode a flat code point array into one string per offset range."""
+    text = codes.astype('<u4').tobytes().decode('utf-32-le')
+    return [text[start:end] for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+def _segment_offsets(counts: np.ndarray) -> np.ndarray:
+    """Turn per-segment lengths into start/end offsets."""
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+class SyntheticTypist:
+    """Generates realistic typed/target pairs and keystroke streams."""
+
+    def __init__(self, word_list: Sequence[str], profile: Optional[TypistProfile] = None,
+                 seed: Optional[int] = None):
+        """Initialize the generator with a vocabulary and typist profile."""
+        if not word_list:
+            raise ValueError("Word list must not be empty")
+
+        self.profile = profile or TypistProfile()
+        self.rng = np.random.default_rng(seed)
+
+        # Every vocabulary entry carries its trailing space
+        self._vocab = _encode("".join(f"{word} " for word in word_list))
+        self._lengths = np.fromiter((len(word) + 1 for word in word_list),
+                                    dtype=np.int64, count=len(word_list))
+        self._starts = _segment_offsets(self._lengths)[:-1]
+        self._alphabet = np.unique(self._vocab[self._vocab != ord(' ')])
+        if not len(self._alphabet):
+            raise ValueError("Word list must contain non-space characters")
+
+        bigrams = {
+            (ord(pair[0]) << 21) | ord(pair[1]): delay
+            for pair, delay in self.profile.bigram_latency_ms.items() if len(pair) == 2
+        }
+        self._bigram_keys = np.array(sorted(bigrams), dtype=np.int64)
+        self._bigram_delays = np.array([bigrams[key] for key in sorted(bigrams)], dtype=np.float64)
+
+    @classmethod
+    def from_file(cls, word_list_file: Path, profile: Optional[TypistProfile] = None,
+                  seed: Optional[int] = None) -> 'SyntheticTypist':
+        """Create a generator from a word list file."""
+        return cls(load_word_list(word_list_file), profile, seed)
+
+    def _targets(self, sessions: int, words: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Draw target passages as a flat code array plus session offsets."""
+        word_ids = self.rng.integers(0, len(self._lengths), size=sessions * words)
+        token_lengths = self._lengths[word_ids]
+        token_offsets = _segment_offsets(token_lengths)
+        within = np.arange(token_offsets[-1]) - np.repeat(token_offsets[:-1], token_lengths)
+        codes = self._vocab[np.repeat(self._starts[word_ids], token_lengths) + within]
+
+        # Drop the trailing space of the last word in each session
+        session_lengths = token_lengths.reshape(sessions, words).sum(axis=1)
+        keep = np.ones(len(codes), dtype=bool)
+        keep[np.cumsum(session_lengths) - 1] = False
+        return codes[keep], _segment_offsets(session_lengths - 1)
+
+    def _latencies(self, keys: np.ndarray, key_wpm: np.ndarray,
+                   session_starts: np.ndarray) -> np.ndarray:
+        """Draw inter-key latencies in milliseconds."""
+        profile = self.profile
+        sigma = profile.latency_jitter
+        # Normalize the lognormal jitter so it has a mean of one
+        jitter = self.rng.lognormal(-sigma * sigma / 2, sigma, size=len(keys))
+        latencies = 60000.0 / (key_wpm * CHARS_PER_WORD) * jitter
+
+        if len(self._bigram_keys):
+            previous = np.concatenate(([0], keys[:-1]))
+            previous[session_starts] = 0
+            pairs = (previous << 21) | keys
+            slots = np.minimum(np.searchsorted(self._bigram_keys, pairs), len(self._bigram_keys) - 1)
+            hits = self._bigram_keys[slots] == pairs
+            latencies[hits] += self._bigram_delays[slots[hits]]
+
+        latencies[keys == BACKSPACE] += profile.backspace_latency_ms
+        return np.maximum(latencies, 1.0)
+
+    def generate(self, sessions: int, words: int = 25) -> SessionBatch:
+        """Generate a batch of simulated sessions."""
+        if sessions <= 0 or words <= 0:
+            raise ValueError("Sessions and words must be positive")
+
+        profile = self.profile
+        rng = self.rng
+        targets, char_offsets = self._targets(sessions, words)
+        total = len(targets)
+
+        # Mistakes, and whether each one is backspaced and retyped
+        errors = rng.random(total) < profile.error_rate
+        corrected = errors & (rng.random(total) < profile.backspace_rate)
+        wrong = self._alphabet[rng.integers(0, len(self._alphabet), size=total)]
+        clashes = wrong == targets
+        wrong[clashes] = self._alphabet[
+            (np.searchsorted(self._alphabet, wrong[clashes]) + 1) % len(self._alphabet)
+        ]
+        typed = np.where(errors & ~corrected, wrong, targets)
+
+        # Corrected mistakes cost three keys: wrong key, backspace, right key
+        presses = 1 + 2 * corrected.astype(np.int64)
+        press_offsets = _segment_offsets(presses)[:-1]
+        keys = np.empty(press_offsets[-1] + presses[-1], dtype=np.int64)
+        keys[press_offsets] = np.where(corrected, wrong, typed)
+        fixed = press_offsets[corrected]
+        keys[fixed + 1] = BACKSPACE
+        keys[fixed + 2] = targets[corrected]
+
+        key_counts = np.add.reduceat(presses, char_offsets[:-1])
+        key_offsets = _segment_offsets(key_counts)
+        wpm = np.maximum(rng.normal(profile.wpm_mean, profile.wpm_std, size=sessions), MIN_WPM)
+        latencies = self._latencies(keys, np.repeat(wpm, key_counts), key_offsets[:-1])
+
+        elapsed = np.cumsum(latencies)
+        session_base = elapsed[key_offsets[:-1]] - latencies[key_offsets[:-1]]
+        key_times = elapsed - np.repeat(session_base, key_counts)
+        durations = key_times[key_offsets[1:] - 1] / 1000.0
+
+        return SessionBatch(
+            targets=_decode(targets, char_offsets),
+            typed=_decode(typed, char_offsets),
+            wpm=wpm,
+            durations=durations,
+            keys=keys,
+            key_times=key_times,
+            key_offsets=key_offsets
+        )
+
+    def iter_batches(self, sessions: int, words: int = 25,
+                     batch_size: int = 10000) -> Iterator[SessionBatch]:
+        """Generate sessions in bounded-memory batches."""
+        remaining = sessions
+        while remaining > 0:
+            count = min(batch_size, remaining)
+            yield self.generate(count, words)
+            remaining -= count
+
+def score_batch(batch: SessionBatch, game: GameManager,
+                high_scores: Optional[HighScores] = None,
+                difficulty: str = 'medium') -> List[Dict[str, float]]:
+    """Score simulated sessions through the game and high score code paths."""
+    results = []
+    for index, (target, typed, duration) in enumerate(
+        zip(batch.targets, batch.typed, batch.durations.tolist())
+    ):
+        game.current_text = target
+        keys, key_times = batch.keystrokes(index)
+        result = game.calculate_results(
+            typed, duration, keys.tolist(), (key_times / 1000.0).tolist()
+        )
+        if high_scores is not None:
+            high_scores.add_score(
+                result['wpm'], result['accuracy'], difficulty, net_wpm=result['net_wpm']
+            )
+        results.append(result)
+    return results
+
+def measure_throughput(typist: SyntheticTypist, game: GameManager, sessions: int,
+                       high_scores: Optional[HighScores] = None,
+                       batch_size: int = 10000) -> Dict[str, float]:
+    """Measure generation and scoring throughput in sessions per second."""
+    generate_time = 0.0
+    score_time = 0.0
+    remaining = sessions
+    while remaining > 0:
+        count = min(batch_size, remaining)
+        started = time.perf_counter()
+        batch = typist.generate(count, game.word_count)
+        generated = time.perf_counter()
+        score_batch(batch, game, high_scores, game.difficulty)
+        score_time += time.perf_counter() - generated
+        generate_time += generated - started
+        remaining -= count
+
+    return {
+        'sessions': sessions,
+        'generate_per_second': sessions / generate_time if generate_time else 0.0,
+        'score_per_second': sessions / score_time if score_time else 0.0
+    }
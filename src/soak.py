@@ -0,0 +1,209 @@
+"""
+Soak test for long-running kiosks.
+
+Drives thousands of start/type/end/reset cycles through the real GUI and
+samples resource counters every few cycles: resident memory, traced Python
+allocations, Tk text tags, pending ``after`` callbacks and canvas items.
+A metric fails when its growth per cycle, fitted over the samples after
+warm-up, is above its allowance.
+
+Run it under a display, or let it start Xvfb::
+
+    python -m src.soak --cycles 2000 --every 100 --report soak.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+import tkinter as tk
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+METRICS = ('rss_kb', 'traced_kb', 'tags', 'after_ids', 'canvas_items')
+# Allowed growth per cycle; Tk object counts must not grow at all
+ALLOWANCES = {
+    'rss_kb': 2.0,
+    'traced_kb': 0.5,
+    'tags': 0.0,
+    'after_ids': 0.0,
+    'canvas_items': 0.0,
+}
+WARMUP_SAMPLES = 1
+TOP_ALLOCATIONS = 10
+
+@dataclass
+class SoakSample:
+    """Resource counters after a number of cycles."""
+    cycle: int
+    rss_kb: float
+    traced_kb: float
+    tags: int
+    after_ids: int
+    canvas_items: int
+
+@dataclass
+class SoakReport:
+    """Samples from a soak run and the metrics that kept growing."""
+    samples: List[SoakSample] = field(default_factory=list)
+    top_allocations: List[str] = field(default_factory=list)
+
+    def slope(self, metric: str) -> float:
+        """Get a metric's least-squares growth per cycle after warm-up."""
+        samples = self.samples[WARMUP_SAMPLES:]
+        if len(samples) < 2:
+            return 0.0
+        xs = [sample.cycle for sample in samples]
+        ys = [getattr(sample, metric) for sample in samples]
+        mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+        spread = sum((x - mean_x) ** 2 for x in xs)
+        if not spread:
+            return 0.0
+        return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread
+
+    def leaks(self) -> Dict[str, float]:
+        """Get the metrics growing faster than allowed, with their slopes."""
+        leaks = {}
+        for metric in METRICS:
+            slope = self.slope(metric)
+            settled = self.samples[WARMUP_SAMPLES:]
+            grew = len(settled) >= 2 and getattr(settled[-1], metric) > getattr(settled[0], metric)
+            if grew and slope > ALLOWANCES[metric]:
+                leaks[metric] = slope
+        return leaks
+
+    @property
+    def passed(self) -> bool:
+        """Check whether no metric grew without bound."""
+        return not self.leaks()
+
+    def to_dict(self) -> Dict:
+        """Serialize the report for saving as JSON."""
+        return {
+            'passed': self.passed,
+            'slopes': {metric: self.slope(metric) for metric in METRICS},
+            'allowances': ALLOWANCES,
+            'leaks': self.leaks(),
+            'samples': [asdict(sample) for sample in self.samples],
+            'top_allocations': self.top_allocations
+        }
+
+def rss_kb() -> float:
+    """Get the resident set size of this process in KiB."""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return float(line.split()[1])
+    except OSError:
+        pass
+    # Peak rather than current size where /proc is unavailable
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 if sys.platform == 'darwin' else float(peak)
+
+def sample(gui, cycle: int) -> SoakSample:
+    """Read the resource counters of a running GUI."""
+    text = gui.text_display
+    tags = sum(len(text.tag_ranges(tag)) // 2 for tag in text.tag_names()) + len(text.tag_names())
+    canvases = (gui.wpm_graph.canvas, gui.heatmap.canvas)
+    return SoakSample(
+        cycle=cycle,
+        rss_kb=rss_kb(),
+        traced_kb=tracemalloc.get_traced_memory()[0] / 1024,
+        tags=tags,
+        after_ids=len(gui.root.tk.splitlist(gui.root.tk.call('after', 'info'))),
+        canvas_items=sum(len(canvas.find_all()) for canvas in canvases)
+    )
+
+def run_cycle(gui) -> None:
+    """Start a test, type it word by word with one mistake, end it and reset."""
+    gui.start_game()
+    words = gui.current_text.split(' ')
+    typed = ""
+    for i, word in enumerate(words):
+        typed += ("#" + word[1:] if i == 1 else word) + (" " if i < len(words) - 1 else "")
+        gui._set_input(typed, 'normal')
+        gui.check_progress()
+        gui._update_timer()
+    gui.root.update()
+    gui.end_test()
+    gui.reset_game()
+    gui.root.update()
+
+def run_soak(cycles: int, every: int, word_list_file: Optional[Path] = None,
+             root: Optional[tk.Tk] = None) -> SoakReport:
+    """
+    Run the soak in a throwaway data directory and return its report.
+
+    The GUI runs unshared, so synthetic scores never reach the shared
+    leaderboard or a profile.
+    """
+    from .gui import TypingSpeedGUI
+
+    if cycles <= 0 or every <= 0:
+        raise ValueError("Cycle and sample counts must be positive")
+    report = SoakReport()
+    own_root = root is None
+    root = root or tk.Tk()
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        with tempfile.TemporaryDirectory() as data_dir:
+            gui = TypingSpeedGUI(root, word_list_file, Path(data_dir) / 'scores.json', shared=False)
+            gui.show_dialogs = False
+            root.update()
+            baseline = None
+            for cycle in range(1, cycles + 1):
+                run_cycle(gui)
+                if cycle % every == 0:
+                    report.samples.append(sample(gui, cycle))
+                    if len(report.samples) == WARMUP_SAMPLES:
+                        baseline = tracemalloc.take_snapshot()
+            if baseline is not None:
+                growth = tracemalloc.take_snapshot().compare_to(baseline, 'lineno')
+                report.top_allocations = [str(stat) for stat in growth[:TOP_ALLOCATIONS]]
+            gui.destroy()
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+        if own_root:
+            try:
+                root.destroy()
+            except tk.TclError:
+                pass  # Already destroyed by the GUI
+    return report
+
+def main() -> None:
+    """Run a soak from the command line; exits non-zero on unbounded growth."""
+    parser = argparse.ArgumentParser(description="Soak the GUI with start/end/reset cycles.")
+    parser.add_argument('--cycles', type=int, default=1000, help="Cycles to run")
+    parser.add_argument('--every', type=int, default=50, help="Cycles between samples")
+    parser.add_argument('--word-list', type=Path, help="Word list to use")
+    parser.add_argument('--report', type=Path, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    display = None
+    if not os.environ.get('DISPLAY'):
+        from xvfbwrapper import Xvfb
+        display = Xvfb(width=1280, height=720)
+        display.start()
+    try:
+        report = run_soak(args.cycles, args.every, args.word_list)
+    finally:
+        if display:
+            display.stop()
+
+    data = report.to_dict()
+    if args.report:
+        args.report.write_text(json.dumps(data, indent=2))
+    for metric, slope in data['slopes'].items():
+        status = "LEAK" if metric in data['leaks'] else "ok"
+        print(f"{metric:>13}: {slope:+.4f} per cycle [{status}]")
+    sys.exit(0 if report.passed else 1)
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,24 @@
 """
 Utility functions for the typing speed test.
 """
+import unicodedata
 from pathlib import Path
 from typing import List
 
+# Characters per standard word
+CHARS_PER_WORD = 5
+
+# Code points that never start a grapheme cluster on their own
+ZERO_WIDTH_JOINER = '\u200d'
+_EXTEND_CATEGORIES = {'Mn', 'Me', 'Mc'}
+_EXTEND_RANGES = (
+    (0xFE00, 0xFE0F),    # Variation selectors
+    (0x1F3FB, 0x1F3FF),  # Emoji skin tone modifiers
+    (0xE0020, 0xE007F),  # Emoji tag sequences
+    (0xE0100, 0xE01EF),  # Variation selectors supplement
+)
+_REGIONAL_INDICATORS = (0x1F1E6, 0x1F1FF)
+
 def calculate_wpm(typed_text: str, elapsed_time: float) -> int:
     """Calculate words per minute as a whole number."""
     if elapsed_time <= 0:
@@ -14,27 +29,112 @@ def calculate_wpm(typed_text: str, elapsed_time: float) -> int:
     return round(word_count / minutes) if minutes > 0 else 0
 
 def calculate_accuracy(typed_text: str, target_text: str) -> float:
-    """Calculate typing accuracy as a percentage."""
+    """Calculate typing accuracy as a percentage of user-perceived characters."""
     if not typed_text and not target_text:
         return 100.0
     if not typed_text or not target_text:
         return 0.0
 
-    typed_words = typed_text.split()
-    target_words = target_text.split()
-    
-    # Count matching words
-    correct_words = sum(1 for t, r in zip(typed_words, target_words) if t == r)
-    total_words = max(len(typed_words), len(target_words))
-    
-    return (correct_words / total_words) * 100.0
+    typed_chars = split_graphemes(normalize_text(typed_text))
+    target_chars = split_graphemes(normalize_text(target_text))
+
+    # Count matching characters
+    correct_chars = sum(1 for t, r in zip(typed_chars, target_chars) if t == r)
+    total_chars = max(len(typed_chars), len(target_chars))
+
+    return (correct_chars / total_chars) * 100.0
 
 def load_word_list(word_list_file: Path) -> List[str]:
     """Load word list from file."""
     if not Path(word_list_file).exists():
         raise FileNotFoundError(f"Word list file not found: {word_list_file}")
         
-    with open(word_list_file, 'r') as f:
-        words = [word.strip() for word in f.readlines() if word.strip()]
+    with open(word_list_file, 'r', encoding='utf-8') as f:
+        words = [normalize_text(word.strip()) for word in f.readlines() if word.strip()]
     
     return words
+
+def normalize_text(text: str) -> str:
+    """Normalize text to NFC so composed and decomposed forms compare equal."""
+    if unicodedata.is_normalized('NFC', text):
+        return text
+    return unicodedata.normalize('NFC', text)
+
+def _is_extend(char: str) -> bool:
+    """Check whether a character extends the preceding grapheme cluster."""
+    if char == ZERO_WIDTH_JOINER or unicodedata.category(char) in _EXTEND_CATEGORIES:
+        return True
+    code = ord(char)
+    return any(low <= code <= high for low, high in _EXTEND_RANGES)
+
+def _is_regional_indicator(char: str) -> bool:
+    """Check whether a character is a flag emoji regional indicator."""
+    return _REGIONAL_INDICATORS[0] <= ord(char) <= _REGIONAL_INDICATORS[1]
+
+def grapheme_boundaries(text: str, start: int = 0) -> List[int]:
+    """
+    Get the end offsets of the grapheme clusters in text[start:].
+
+    This is a compact subset of the UAX #29 extended grapheme cluster rules:
+    CR LF pairs, combining marks, variation selectors, emoji modifiers,
+    ZWJ sequences and regional indicator pairs are kept together.
+    """
+    boundaries = []
+    i = start
+    length = len(text)
+    while i < length:
+        char = text[i]
+        i += 1
+        if char == '\r' and i < length and text[i] == '\n':
+            i += 1
+        elif _is_regional_indicator(char) and i < length and _is_regional_indicator(text[i]):
+            i += 1
+        while i < length:
+            if _is_extend(text[i]):
+                i += 1
+            elif text[i - 1] == ZERO_WIDTH_JOINER:
+                i += 1
+            else:
+                break
+        boundaries.append(i)
+    return boundaries
+
+def split_graphemes(text: str) -> List[str]:
+    """Split text into user-perceived characters."""
+    start = 0
+    clusters = []
+    for end in grapheme_boundaries(text):
+        clusters.append(text[start:end])
+        start = end
+    return clusters
+
+def common_prefix_length(first: str, second: str) -> int:
+    """Get the length of the common prefix of two strings."""
+    limit = min(len(first), len(second))
+    if first[:limit] == second[:limit]:
+        return limit
+
+    # Binary search keeps the comparisons inside C string slicing
+    low, high = 0, limit
+    while low < high:
+        mid = (low + high + 1) // 2
+        if first[:mid] == second[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+def common_suffix_length(first: str, second: str) -> int:
+    """Get the length of the common suffix of two strings."""
+    limit = min(len(first), len(second))
+    if first[len(first) - limit:] == second[len(second) - limit:]:
+        return limit
+
+    low, high = 0, limit
+    while low < high:
+        mid = (low + high + 1) // 2
+        if first[len(first) - mid:] == second[len(second) - mid:]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
@@ -0,0 +1,108 @@
+"""
+Opt-in watchdog that profiles stalls of the Tk main loop.
+
+The main loop stamps a heartbeat through ``root.after``. A background thread
+checks the stamp and, while it is overdue, samples the main thread's stack
+with ``sys._current_frames()``. Samples are aggregated as folded stacks
+(``frame;frame;frame count``), the input format of flame graph tools.
+"""
+import os
+import sys
+import threading
+import time
+import tkinter as tk
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import List, Optional, Tuple
+
+HEARTBEAT_INTERVAL = 0.05
+STALL_THRESHOLD = 0.2
+SAMPLE_INTERVAL = 0.005
+
+def fold_stack(frame: Optional[FrameType]) -> str:
+    """Fold a stack into ``file:function`` entries, outermost first."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+class StallWatchdog:
+    """Samples the main thread whenever the Tk main loop misses a heartbeat."""
+
+    def __init__(self, root: tk.Misc, threshold: float = STALL_THRESHOLD,
+                 heartbeat_interval: float = HEARTBEAT_INTERVAL,
+                 sample_interval: float = SAMPLE_INTERVAL):
+        """Initialize the watchdog; call start() from the main thread."""
+        self.root = root
+        self.threshold = threshold
+        self.heartbeat_interval = heartbeat_interval
+        self.sample_interval = sample_interval
+        self.samples: Counter = Counter()
+        self.stalls: List[Tuple[float, float]] = []
+        self._last_beat = time.monotonic()
+        self._main_ident: Optional[int] = None
+        self._heartbeat_id: Optional[str] = None
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the heartbeat and the sampling thread."""
+        if self._thread is not None:
+            return
+        self._main_ident = threading.get_ident()
+        self._beat()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._watch, name='stall-watchdog', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and cancel the heartbeat."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._heartbeat_id is not None:
+            try:
+                self.root.after_cancel(self._heartbeat_id)
+            except tk.TclError:
+                pass  # The root window is already gone
+            self._heartbeat_id = None
+
+    def _beat(self) -> None:
+        """Stamp the heartbeat from the main loop and schedule the next one."""
+        self._last_beat = time.monotonic()
+        self._heartbeat_id = self.root.after(int(self.heartbeat_interval * 1000), self._beat)
+
+    def _watch(self) -> None:
+        """Wait cheaply while healthy; sample rapidly while stalled."""
+        deadline = self.heartbeat_interval + self.threshold
+        stall_start: Optional[float] = None
+        while True:
+            overdue = time.monotonic() - self._last_beat > deadline
+            if overdue:
+                if stall_start is None:
+                    stall_start = self._last_beat
+                frame = sys._current_frames().get(self._main_ident)
+                if frame is not None:
+                    self.samples[fold_stack(frame)] += 1
+                del frame
+            elif stall_start is not None:
+                self.stalls.append((stall_start, self._last_beat - stall_start))
+                stall_start = None
+
+            wait = self.sample_interval if overdue else self.heartbeat_interval
+            if self._stopping.wait(wait):
+                return
+
+    def folded(self) -> str:
+        """Get the aggregated samples in folded-stack format."""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.samples.most_common()
+        )
+
+    def export(self, output_file: Path) -> None:
+        """Write the folded-stack profile for flame graph tools."""
+        Path(output_file).write_text(self.folded(), encoding='utf-8')
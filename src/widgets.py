@@ -0,0 +1,149 @@
+"""
+Custom Tk widgets for the Typing Speed Test application.
+"""
+import tkinter as tk
+from typing import Dict, List, Tuple
+
+from .keyboard_layout import ROW_STAGGER, KeyboardLayout
+from .live_stats import KeyStats
+
+HEATMAP_METRICS = ('errors', 'latency')
+# Error rate and mean latency (seconds) shown at full colour
+ERROR_SCALE = 0.25
+LATENCY_SCALE = 0.6
+NO_DATA_COLOR = '#eeeeee'
+
+class WpmGraph:
+    """Sparkline of rolling WPM drawn on a Canvas."""
+
+    def __init__(self, parent: tk.Widget, samples: int = 100, width: int = 400,
+                 height: int = 60, min_scale: float = 60.0, color: str = '#3366cc'):
+        """Create the canvas and its line items once."""
+        self.samples = samples
+        self.width = width
+        self.height = height
+        self.min_scale = min_scale
+        self.canvas = tk.Canvas(parent, width=width, height=height,
+                                highlightthickness=0, bg='white')
+
+        self._values: List[float] = [0.0] * samples
+        self._next = 0
+        self._scale = min_scale
+        self._step = width / max(samples - 1, 1)
+
+        # Items are only ever moved with coords(), never recreated
+        self.baseline_id = self.canvas.create_line(0, height - 1, width, height - 1, fill='#cccccc')
+        self.line_id = self.canvas.create_line(*self._points(), fill=color, width=2)
+        self.label_id = self.canvas.create_text(4, 2, anchor=tk.NW, text="", fill=color)
+
+    def pack(self, **kwargs) -> None:
+        """Pack the underlying canvas."""
+        self.canvas.pack(**kwargs)
+
+    def _points(self) -> List[float]:
+        """Get the flat coordinate list, oldest sample first."""
+        usable = self.height - 2
+        points = []
+        for i in range(self.samples):
+            value = self._values[(self._next + i) % self.samples]
+            points.append(i * self._step)
+            points.append(self.height - 1 - min(value / self._scale, 1.0) * usable)
+        return points
+
+    def push(self, value: float) -> None:
+        """Append a sample and move the existing line to show it."""
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.samples
+        if value > self._scale:
+            self._scale = value * 1.25
+        self.canvas.coords(self.line_id, *self._points())
+        self.canvas.itemconfigure(self.label_id, text=f"{value:.0f} WPM")
+
+    def clear(self) -> None:
+        """Reset the graph to a flat line."""
+        self._values = [0.0] * self.samples
+        self._next = 0
+        self._scale = self.min_scale
+        self.canvas.coords(self.line_id, *self._points())
+        self.canvas.itemconfigure(self.label_id, text="")
+
+def _blend(color: Tuple[int, int, int], amount: float) -> str:
+    """Mix white with a colour; amount 0.0 is white and 1.0 the colour."""
+    amount = max(0.0, min(amount, 1.0))
+    return '#%02x%02x%02x' % tuple(round(255 - (255 - c) * amount) for c in color)
+
+class KeyboardHeatmap:
+    """On-screen keyboard coloured by per-key error rate or latency."""
+
+    def __init__(self, parent: tk.Widget, layout: KeyboardLayout, key_size: int = 26,
+                 gap: int = 3, metric: str = 'errors'):
+        """Create every key's rectangle and label once."""
+        if metric not in HEATMAP_METRICS:
+            raise ValueError(f"Invalid heatmap metric: {metric}")
+        self.metric = metric
+        pitch = key_size + gap
+        rows = list(layout.rows) + [" "]
+        width = int((max(len(row) for row in layout.rows) + ROW_STAGGER[-1]) * pitch) + gap
+        self.canvas = tk.Canvas(parent, width=width, height=len(rows) * pitch + gap + 14,
+                                highlightthickness=0, bg='white')
+
+        self.key_ids: Dict[str, int] = {}
+        self._fills: Dict[str, str] = {}
+        for row, keys in enumerate(rows):
+            y = gap + 14 + row * pitch
+            if keys == " ":
+                # Space bar spans the middle of the bottom row
+                x = gap + 3 * pitch
+                self.key_ids[" "] = self._create_key(x, y, x + 5 * pitch - gap, y + key_size, "")
+                continue
+            for column, key in enumerate(keys):
+                x = gap + (column + ROW_STAGGER[row]) * pitch
+                self.key_ids[key] = self._create_key(x, y, x + key_size, y + key_size, key)
+        self.title_id = self.canvas.create_text(gap, 1, anchor=tk.NW, text=self._title(),
+                                                fill='#666666')
+
+    def _create_key(self, x0: float, y0: float, x1: float, y1: float, label: str) -> int:
+        """Draw one key and return its rectangle's item id."""
+        rect_id = self.canvas.create_rectangle(x0, y0, x1, y1, fill=NO_DATA_COLOR,
+                                               outline='#bbbbbb')
+        self.canvas.create_text((x0 + x1) / 2, (y0 + y1) / 2, text=label)
+        return rect_id
+
+    def _title(self) -> str:
+        """Get the caption naming the metric shown."""
+        return "Errors by key" if self.metric == 'errors' else "Mean latency by key"
+
+    def pack(self, **kwargs) -> None:
+        """Pack the underlying canvas."""
+        self.canvas.pack(**kwargs)
+
+    def color(self, stats: KeyStats, key: str) -> str:
+        """Get a key's fill colour for the current metric."""
+        if self.metric == 'errors':
+            rate = stats.error_rate(key)
+            return NO_DATA_COLOR if rate is None else _blend((214, 39, 40), rate / ERROR_SCALE)
+        latency = stats.mean_latency(key)
+        return NO_DATA_COLOR if latency is None else _blend((255, 127, 14), latency / LATENCY_SCALE)
+
+    def refresh(self, stats: KeyStats) -> int:
+        """Recolour only keys changed since the last refresh; returns items updated."""
+        updated = 0
+        for key in stats.take_dirty():
+            rect_id = self.key_ids.get(key)
+            if rect_id is None:
+                continue
+            fill = self.color(stats, key)
+            if self._fills.get(key, NO_DATA_COLOR) != fill:
+                self.canvas.itemconfigure(rect_id, fill=fill)
+                self._fills[key] = fill
+                updated += 1
+        return updated
+
+    def set_metric(self, metric: str, stats: KeyStats) -> None:
+        """Switch between error and latency colouring."""
+        if metric not in HEATMAP_METRICS:
+            raise ValueError(f"Invalid heatmap metric: {metric}")
+        self.metric = metric
+        self.canvas.itemconfigure(self.title_id, text=self._title())
+        stats.dirty |= self.key_ids.keys()
+        self.refresh(stats)
@@ -0,0 +1,202 @@
+"""
+Blocklist filtering of word lists.
+
+Banned substrings are compiled into an Aho-Corasick automaton, so each word
+is checked in time linear in its length however many patterns there are.
+The corpus is streamed through the automaton, duplicates are dropped with a
+set of 64-bit hashes, and the result is cached next to the corpus, keyed by
+the hashes of the corpus and the blocklist.
+"""
+import hashlib
+import json
+import os
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+from .utils import normalize_text
+
+# Part of the cache header; a filtered list written under other rules never matches
+FILTER_VERSION = 1
+_HASH_BLOCK = 1 << 20
+
+class AhoCorasick:
+    """Automaton answering whether text contains any of a set of patterns."""
+
+    def __init__(self, patterns: Iterable[str]):
+        """Compile patterns, matched case-insensitively."""
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.terminal: List[bool] = [False]
+        for pattern in patterns:
+            pattern = normalize_text(pattern).casefold()
+            if pattern:
+                self._add(pattern)
+        self._link()
+
+    def __len__(self) -> int:
+        """Get the number of states."""
+        return len(self.goto)
+
+    def _add(self, pattern: str) -> None:
+        """Add one pattern to the trie."""
+        state = 0
+        for char in pattern:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.terminal.append(False)
+            state = next_state
+        self.terminal[state] = True
+
+    def _link(self) -> None:
+        """Set failure links breadth first, folding matches along them."""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                # A state matches if any suffix of its path is a pattern
+                self.terminal[next_state] = self.terminal[next_state] or self.terminal[self.fail[next_state]]
+
+    def search(self, text: str) -> bool:
+        """Check whether the text contains any pattern."""
+        goto, fail, terminal = self.goto, self.fail, self.terminal
+        state = 0
+        for char in text.casefold():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if terminal[state]:
+                return True
+        return False
+
+class CompactHashSet:
+    """Open-addressing set of 64-bit word hashes packed in an array."""
+
+    def __init__(self, capacity: int = 1024):
+        """Initialize an empty set; the table doubles as it fills."""
+        size = 1
+        while size < capacity * 2:
+            size <<= 1
+        self._table = array('Q', bytes(8 * size))
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Get the number of hashes held."""
+        return self._count
+
+    @staticmethod
+    def _hash(word: str) -> int:
+        """Hash a word to a non-zero 64-bit value; zero marks an empty slot."""
+        digest = hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'little') or 1
+
+    def _insert(self, value: int) -> bool:
+        """Insert a hash, returning False if it was already present."""
+        mask = len(self._table) - 1
+        slot = value & mask
+        while True:
+            current = self._table[slot]
+            if current == value:
+                return False
+            if not current:
+                self._table[slot] = value
+                self._count += 1
+                return True
+            slot = (slot + 1) & mask
+
+    def add(self, word: str) -> bool:
+        """Add a word, returning False if it was already present."""
+        if (self._count + 1) * 2 > len(self._table):
+            old = self._table
+            self._table = array('Q', bytes(16 * len(old)))
+            self._count = 0
+            for value in old:
+                if value:
+                    self._insert(value)
+        return self._insert(self._hash(word))
+
+def load_blocklist(blocklist_file: Path) -> List[str]:
+    """Read banned substrings, one per line, skipping blanks and # comments."""
+    with open(blocklist_file, 'r', encoding='utf-8') as f:
+        return [
+            line.strip() for line in f
+            if line.strip() and not line.lstrip().startswith('#')
+        ]
+
+_automata: Dict[str, AhoCorasick] = {}
+
+def compile_blocklist(patterns: Sequence[str]) -> AhoCorasick:
+    """Get the automaton for a blocklist, compiling each distinct list once."""
+    key = hashlib.sha1("\n".join(patterns).encode('utf-8')).hexdigest()
+    if key not in _automata:
+        _automata[key] = AhoCorasick(patterns)
+    return _automata[key]
+
+def unique_words(words: Iterable[str]) -> Iterator[str]:
+    """Yield normalized words, skipping blanks and repeats."""
+    seen = CompactHashSet()
+    for word in words:
+        word = normalize_text(word.strip())
+        if word and seen.add(word):
+            yield word
+
+def filter_words(words: Iterable[str], automaton: AhoCorasick) -> Iterator[str]:
+    """Yield unique, normalized words that contain no banned substring."""
+    return (word for word in unique_words(words) if not automaton.search(word))
+
+def file_digest(path: Path) -> str:
+    """Hash a file's contents without reading it into memory at once."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def cache_path(word_list_file: Path) -> Path:
+    """Get the filtered word list cache stored next to the corpus."""
+    word_list_file = Path(word_list_file)
+    return word_list_file.with_name(f"{word_list_file.stem}.filtered.txt")
+
+def load_filtered_words(word_list_file: Path, blocklist_file: Path) -> List[str]:
+    """Load the filtered word list for (corpus, blocklist), rebuilding it if stale."""
+    cache_file = cache_path(word_list_file)
+    key = {
+        'version': FILTER_VERSION,
+        'corpus': file_digest(word_list_file),
+        'blocklist': file_digest(blocklist_file)
+    }
+    header = json.dumps(key, sort_keys=True)
+
+    if cache_file.exists():
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            if f.readline().rstrip('\n') == header:
+                return [line.rstrip('\n') for line in f]
+
+    automaton = compile_blocklist(load_blocklist(blocklist_file))
+    with open(word_list_file, 'r', encoding='utf-8') as source:
+        words = list(filter_words(source, automaton))
+
+    temp_file = cache_file.with_suffix('.tmp')
+    try:
+        with open(temp_file, 'w', encoding='utf-8') as output:
+            output.write(header + '\n')
+            output.writelines(word + '\n' for word in words)
+        os.replace(temp_file, cache_file)
+    except OSError:
+        # Filtering runs again next start; the words in hand are still good
+        try:
+            temp_file.unlink()
+        except OSError:
+            pass
+    return words
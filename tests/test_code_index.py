@@ -0,0 +1,124 @@
+"""Tests for the code snippet index."""
+import os
+import pytest
+from src.code_index import (
+    SnippetIndex, clean_snippet, find_snippets, indentation_profile
+)
+from src.game_logic import GameManager
+
+PYTHON_SOURCE = '''import os
+
+
+def greet(name):
+    """Say hello."""
+    if name:
+        print("hello", name)
+    return name
+
+
+x = 1
+'''
+
+@pytest.fixture
+def source_dir(temp_dir):
+    """Create a small source tree."""
+    source_dir = temp_dir / "src_tree"
+    (source_dir / "pkg").mkdir(parents=True)
+    (source_dir / "node_modules").mkdir()
+    (source_dir / "pkg" / "greet.py").write_text(PYTHON_SOURCE)
+    (source_dir / "node_modules" / "skip.js").write_text("a;\nb;\nc;\n")
+    (source_dir / "notes.txt").write_text("not\ncode\nat all\n")
+    return source_dir
+
+@pytest.fixture
+def index(temp_dir, source_dir):
+    """Fixture for a refreshed SnippetIndex."""
+    index = SnippetIndex(temp_dir / "code_index.sqlite3", source_dir)
+    index.refresh()
+    yield index
+    index.close()
+
+def test_find_snippets():
+    """Test that only typeable blocks become snippets."""
+    data = PYTHON_SOURCE.encode()
+    snippets = list(find_snippets(data))
+    assert len(snippets) == 1
+    offset, length, indentation = snippets[0]
+    assert data[offset:offset + length].startswith(b"def greet")
+    assert indentation == 'spaces:4'
+
+def test_indentation_profile():
+    """Test indentation detection."""
+    assert indentation_profile([b"a\n", b"b\n"]) == 'flat'
+    assert indentation_profile([b"a\n", b"\tb\n"]) == 'tabs'
+    assert indentation_profile([b"  a\n", b"    b\n", b"      c\n"]) == 'spaces:2'
+
+def test_clean_snippet():
+    """Test snippet cleanup for typing."""
+    assert clean_snippet("    if x:\r\n    \ty = 1  \r\n") == "if x:\n    y = 1"
+
+def test_index_and_read(index, source_dir):
+    """Test indexing a tree and reading a snippet through mmap."""
+    assert len(index) == 1
+    snippet = index.random_snippet()
+    assert snippet.path == source_dir / "pkg" / "greet.py"
+    assert snippet.language == 'python'
+    text = SnippetIndex.read_snippet(snippet)
+    assert text.startswith("def greet(name):\n    ")
+    assert index.random_snippet(language='rust') is None
+
+def test_refresh_is_incremental(index, source_dir):
+    """Test that only changed files are re-indexed."""
+    assert index.refresh() == 0
+
+    target = source_dir / "pkg" / "greet.py"
+    target.write_text(PYTHON_SOURCE + "\n\ndef other():\n    a = 1\n    return a\n")
+    stat = target.stat()
+    os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    (source_dir / "new.js").write_text("function f() {\n  return 1;\n}\n")
+
+    assert index.refresh() == 2
+    assert len(index) == 3
+
+    (source_dir / "new.js").unlink()
+    assert index.refresh() == 0
+    assert len(index) == 2
+
+def test_unchanged_refresh_writes_nothing(index):
+    """Test that a rescan with no changes leaves the database untouched."""
+    assert len(index) == 1
+    version = index.conn.execute("PRAGMA data_version").fetchone()[0]
+    assert index.refresh() == 0
+    assert index.conn.execute("PRAGMA data_version").fetchone()[0] == version
+
+def test_refresh_async(temp_dir, source_dir):
+    """Test background indexing."""
+    index = SnippetIndex(temp_dir / "async.sqlite3", source_dir)
+    # Nothing is opened until the indexing thread runs
+    assert not (temp_dir / "async.sqlite3").exists()
+    assert len(index) == 0
+    assert index.random_snippet() is None
+    index.refresh_async().join()
+    assert len(index) == 1
+    index.close()
+
+def test_changed_file_is_not_read(index, source_dir):
+    """Test that a snippet past the end of a truncated file is skipped."""
+    snippet = index.random_snippet()
+    (source_dir / "pkg" / "greet.py").write_text("x = 1\n")
+    assert SnippetIndex.read_snippet(snippet) is None
+
+def test_game_code_mode(test_word_list_file, temp_dir, source_dir):
+    """Test that code mode passages come from the index."""
+    game = GameManager(test_word_list_file)
+    game.set_mode('code')
+    game.set_code_source(source_dir, temp_dir / "game_index.sqlite3")
+    game.code_index._thread.join()
+
+    text = game.generate_text()
+    assert text.startswith("def greet")
+    assert "\n" in text
+    game.close()
+
+    with pytest.raises(ValueError, match="Invalid mode"):
+        game.set_mode('invalid')
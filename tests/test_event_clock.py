@@ -0,0 +1,41 @@
+"""Tests for event timestamp mapping."""
+import time
+import pytest
+from src.event_clock import EVENT_TIME_WRAP, EventClock
+
+class FakeEvent:
+    """Stand-in for a Tk event carrying only its timestamp."""
+    def __init__(self, time):
+        self.time = time
+
+def test_least_delayed_event_sets_mapping():
+    """Test that queue delay is measured against the quickest event."""
+    clock = EventClock()
+    assert clock.to_monotonic(1000, now=50.03) == pytest.approx(50.03)
+    # Handled 10 ms after being pressed, sooner than the first event
+    assert clock.to_monotonic(1100, now=50.11) == pytest.approx(50.11)
+    # Handled 90 ms after a press 100 ms later
+    assert clock.to_monotonic(1200, now=50.30) == pytest.approx(50.21)
+    
+    assert clock.max_lag == pytest.approx(0.09)
+    assert clock.mean_lag == pytest.approx(0.03)
+    assert clock.lag_count == 3
+
+def test_wraparound():
+    """Test that the 32-bit millisecond counter wrapping is unwrapped."""
+    clock = EventClock()
+    clock.to_monotonic(EVENT_TIME_WRAP - 10, now=100.0)
+    assert clock.to_monotonic(10, now=100.02) == pytest.approx(100.02)
+
+def test_synthetic_events_use_now():
+    """Test that events without a timestamp fall back to the current time."""
+    clock = EventClock()
+    before = time.monotonic()
+    for event in (None, FakeEvent(0), FakeEvent('??')):
+        assert clock.stamp(event) >= before
+    assert clock.lag_count == 0
+    
+    clock.stamp(FakeEvent(5000))
+    assert clock.lag_count == 1
+    clock.reset()
+    assert clock.lag_count == 0 and clock.mean_lag == 0.0
@@ -2,6 +2,7 @@
 import time
 import pytest
 from src.game_logic import GameManager
+from src.passage import Passage, TypedProgress
 
 @pytest.fixture
 def game_manager(test_word_list_file):
@@ -80,3 +81,140 @@ def test_time_management(game_manager):
     game_manager.set_difficulty('hard')  # 45 seconds
     game_manager.start_game()
     assert not game_manager.is_time_up()
+
+def test_resume_game(game_manager):
+    """Test resuming an interrupted game."""
+    game_manager.resume_game("resumed text", "hard", 10.0)
+    assert game_manager.difficulty == 'hard'
+    assert game_manager.current_text == "resumed text"
+    assert len(game_manager.passage) == len("resumed text")
+    assert game_manager.get_elapsed_time() >= 10.0
+    assert game_manager.typing_clock() >= 10.0
+
+def test_seeded_passage_is_reproducible(game_manager):
+    """Test that the same seed replays the same passage."""
+    game_manager.start_game(seed=42)
+    first = game_manager.current_text
+    assert game_manager.seed == 42
+    
+    game_manager.start_game(seed=42)
+    assert game_manager.current_text == first
+    
+    game_manager.reset()
+    assert game_manager.seed is None
+
+def test_adaptive_splice(game_manager):
+    """Test that adaptation replaces only the untyped tail."""
+    game_manager.word_count = 12
+    game_manager.set_adaptive(True)
+    game_manager.start_game()
+    text = game_manager.current_text
+    level = game_manager.level
+    
+    # Too little typed to judge
+    game_manager.progress.update(text[:5])
+    assert game_manager.adapt(40.0) is None
+    
+    # Accurate typing at a steady pace steps up
+    typed = text[:text.index(' ', 12) - 1]
+    game_manager.progress.update(typed)
+    index = game_manager.adapt(40.0)
+    assert index is not None
+    assert game_manager.level == level + 1
+    assert game_manager.current_text.startswith(text[:len(typed) + 1])
+    assert len(game_manager.current_text.split()) == 12
+    assert game_manager.progress.correct == len(typed)
+    assert game_manager.seed is None
+    assert game_manager.passage.text[game_manager.passage.offsets[index] - 1] == ' '
+    
+    # Errors step back down
+    game_manager.progress.update(typed + "#" * 12)
+    assert game_manager.adapt(40.0) is not None
+    assert game_manager.level == level
+
+def test_adaptive_disabled(game_manager):
+    """Test that passages are left alone unless adaptive mode is on."""
+    game_manager.start_game()
+    game_manager.progress.update(game_manager.current_text[:12])
+    assert game_manager.adapt(40.0) is None
+
+def test_results_use_keystroke_log(game_manager):
+    """Test that progress updates log keys for the results metrics."""
+    game_manager.start_game()
+    game_manager.current_text = "cat"
+    game_manager.update_progress("cx")
+    game_manager.update_progress("c")
+    game_manager.update_progress("cat")
+    
+    assert game_manager.keys == [ord('c'), ord('x'), 8, ord('a'), ord('t')]
+    results = game_manager.calculate_results("cat", elapsed_time=12.0)
+    assert results['corrected_errors'] == 1
+    assert results['kspc'] == pytest.approx(5 / 3, abs=0.01)
+    assert results['gross_wpm'] == pytest.approx(3.0)
+    assert results['net_wpm'] == pytest.approx(3.0)
+    # Stored scores keep the whitespace-word scale
+    assert results['wpm'] == 5
+
+def use_passage(game_manager, text):
+    """Start a game on a known passage."""
+    game_manager.start_game()
+    game_manager.current_text = text
+    game_manager.passage = Passage(text)
+    game_manager.progress = TypedProgress(game_manager.passage)
+
+def test_mid_text_correction_logs_one_fix(game_manager):
+    """Test that fixing a typo mid-text logs only the replaced character."""
+    use_passage(game_manager, "hello world")
+    typo = "hellx world"
+    for i in range(1, len(typo) + 1):
+        game_manager.update_progress(typo[:i], 100.0 + i)
+    game_manager.update_progress("hello world", 120.0)
+    
+    assert game_manager.keys[-2:] == [8, ord('o')]
+    results = game_manager.calculate_results("hello world")
+    assert results['corrected_errors'] == 1
+    assert results['kspc'] == pytest.approx(13 / 11, abs=0.01)
+
+def test_keys_counted_in_clusters(game_manager):
+    """Test that a modified emoji is one keystroke, like one typed character."""
+    text = "ok \U0001F44D\U0001F3FD"
+    use_passage(game_manager, text)
+    for i, typed in enumerate(["o", "ok", "ok ", "ok \U0001F44D", text]):
+        game_manager.update_progress(typed, 100.0 + i)
+    
+    results = game_manager.calculate_results(text)
+    assert results['kspc'] == 1.0
+    assert results['corrected_errors'] == 0
+
+def test_live_results_match_final(game_manager):
+    """Test that the running counters agree with the full tally."""
+    use_passage(game_manager, "the cat sat")
+    game_manager.update_progress("the", 10.0)
+    game_manager.update_progress("the cxt", 22.0)
+    
+    live = game_manager.live_results()
+    results = game_manager.calculate_results("the cxt")
+    assert live['wpm'] == results['wpm'] == 10
+    assert live['accuracy'] == pytest.approx(results['accuracy'], abs=0.01)
+
+def test_timing_from_keystrokes(game_manager):
+    """Test that results and the time limit run from the first keystroke."""
+    game_manager.start_game('hard')  # 45 seconds
+    game_manager.current_text = "abc"
+    assert game_manager.typing_time() is None
+    # Waiting before the first key does not use up the limit
+    game_manager.start_time -= 60
+    assert game_manager.typing_clock() == 0.0
+    assert not game_manager.is_time_up()
+    
+    game_manager.update_progress("a", 100.0)
+    game_manager.update_progress("ab", 106.0)
+    game_manager.update_progress("ab", 200.0)  # No change, so no keystroke
+    game_manager.update_progress("abc", 112.0)
+    assert game_manager.typing_time() == 12.0
+    assert game_manager.key_times == [0.0, 6.0, 12.0]
+    assert game_manager.calculate_results("abc")['time'] == 12.0
+    
+    assert game_manager.typing_clock(130.0) == 30.0
+    assert not game_manager.is_time_up(144.0)
+    assert game_manager.is_time_up(145.0)
@@ -0,0 +1,38 @@
+"""Tests for ghost race timelines."""
+from src.ghost import GhostPlayer, GhostRecorder, passage_digest
+
+def test_record_and_replay():
+    """Test that playback reproduces the recorded positions."""
+    recorder = GhostRecorder(interval=0.1)
+    # One sample per timer tick, as the GUI does
+    for tick, position in enumerate([1, 3, 3, 2, 6], 1):
+        recorder.sample(position, tick * 0.1 + 0.01)
+    ghost = recorder.to_dict(seed=123, text="some passage")
+
+    player = GhostPlayer(ghost)
+    assert player.seed == 123
+    assert player.matches("some passage")
+    assert not player.matches("another passage")
+    assert player.advance(0.05) == 0
+    assert player.advance(0.15) == 1
+    assert player.advance(0.35) == 3
+    assert player.advance(0.45) == 2
+    assert not player.finished
+    assert player.advance(5.0) == 6
+    assert player.finished
+
+def test_timeline_is_compact():
+    """Test that a minute-long run takes one byte per sample."""
+    recorder = GhostRecorder(interval=0.1)
+    for tick in range(1, 601):
+        recorder.sample(tick * 3 // 10, tick * 0.1 + 0.01)
+    assert len(recorder.deltas) == 600
+    assert len(recorder.to_dict(1, "x")['deltas']) == 800  # Base64 of 600 bytes
+
+def test_large_jumps_carry_over():
+    """Test that jumps beyond a signed byte are spread over samples."""
+    recorder = GhostRecorder(interval=0.1)
+    recorder.sample(300, 0.35)
+    assert list(recorder.deltas) == [127, 127, 46]
+    assert GhostPlayer(recorder.to_dict(1, "x")).advance(0.35) == 300
+    assert recorder.to_dict(1, "x")['passage'] == passage_digest("x")
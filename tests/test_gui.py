@@ -86,6 +86,7 @@ def test_timer_update(typing_gui):
     """Test timer updates."""
     # Set up initial game state
     typing_gui.game.start_time = time.time() - 5  # Started 5 seconds ago
+    typing_gui.game.first_key_time = time.monotonic() - 5  # Typing began then too
     
     # Update timer display
     typing_gui._update_timer()
@@ -97,3 +98,181 @@ def test_timer_update(typing_gui):
     
     # Verify timer is scheduled
     assert typing_gui.timer_id is not None
+
+def test_check_progress_colors_changed_clusters(typing_gui):
+    """Test that progress coloring follows grapheme clusters."""
+    typing_gui.start_game()
+    typing_gui.root.update()  # Process events
+    
+    target = typing_gui.current_text
+    typing_gui.input_field.insert(0, target[0] + "#")
+    typing_gui.check_progress()
+    
+    assert typing_gui.text_display.tag_ranges('correct')
+    assert typing_gui.text_display.tag_ranges('incorrect')
+    
+    # Deleting the wrong character only clears its tag
+    typing_gui.input_field.delete(1, tk.END)
+    typing_gui.check_progress()
+    assert typing_gui.text_display.tag_ranges('correct')
+    assert not typing_gui.text_display.tag_ranges('incorrect')
+
+def test_wpm_graph_moves_existing_line(typing_gui):
+    """Test that the live graph updates coordinates in place."""
+    graph = typing_gui.wpm_graph
+    items = graph.canvas.find_all()
+    
+    typing_gui.start_game()
+    typing_gui.keystrokes.add(time.time())
+    graph.push(30.0)
+    graph.push(45.0)
+    typing_gui.root.update()  # Process events
+    
+    assert graph.canvas.find_all() == items
+    assert graph.canvas.coords(graph.line_id)[-1] < graph.height - 1
+
+def test_resume_unfinished_session(typing_gui):
+    """Test that an unfinished journal is offered for resume."""
+    typing_gui.journal.begin("test word list", "easy")
+    typing_gui.journal.record("test w", 3.0)
+    typing_gui.journal.close()
+    
+    with patch('src.gui.messagebox.askyesno', return_value=True):
+        typing_gui._offer_resume()
+    
+    assert typing_gui.game.difficulty == 'easy'
+    assert typing_gui.current_text == "test word list"
+    assert typing_gui.input_field.get() == "test w"
+    assert typing_gui.game.get_elapsed_time() >= 3.0
+    assert typing_gui.game.typing_clock() >= 3.0
+    typing_gui.reset_game()
+    assert not typing_gui.journal.journal_file.exists()
+
+def test_code_mode_input(typing_gui):
+    """Test multi-line input with auto-indent in code mode."""
+    typing_gui.code_mode_var.set(True)
+    typing_gui.root.update()  # Process events
+    assert typing_gui.active_input is typing_gui.code_input
+    
+    typing_gui.game.resume_game("if x:\n    y = 1", "medium", 0.0)
+    typing_gui._begin_session()
+    typing_gui.code_input.insert(tk.END, "if x:")
+    typing_gui._on_code_return()
+    typing_gui.check_progress()
+    
+    assert typing_gui._get_input() == "if x:\n    "
+    assert typing_gui.game.progress.correct == len("if x:\n    ")
+    typing_gui.reset_game()
+
+@patch('src.gui.messagebox.showinfo')
+def test_ghost_race(mock_showinfo, typing_gui):
+    """Test racing the ghost of a recorded run on the same passage."""
+    typing_gui.start_game()
+    typing_gui.root.update()  # Process events
+    seed, text = typing_gui.game.seed, typing_gui.current_text
+    typing_gui.ghost_recorder.sample(3, 0.25)
+    typing_gui.end_test()
+    
+    typing_gui.ghost_var.set(True)
+    typing_gui.start_game()
+    assert typing_gui.game.seed == seed
+    assert typing_gui.current_text == text
+    assert typing_gui.ghost is not None
+    
+    typing_gui._move_ghost(typing_gui.ghost.advance(1.0))
+    assert typing_gui.text_display.tag_ranges('ghost')
+
+@patch('src.gui.messagebox.showinfo')
+def test_select_profile(mock_showinfo, typing_gui):
+    """Test that scores and settings follow the selected user."""
+    typing_gui.select_profile("Ada")
+    typing_gui.difficulty_var.set('hard')
+    typing_gui.start_game()
+    typing_gui.end_test()
+    assert typing_gui.user_button.cget('text') == "User: Ada"
+    assert len(typing_gui.high_scores.get_scores('hard')) == 1
+    
+    typing_gui.select_profile("Grace")
+    assert typing_gui.difficulty_var.get() == 'medium'
+    assert typing_gui.high_scores.get_scores('hard') == ()
+    typing_gui.select_profile("Ada")
+    assert typing_gui.difficulty_var.get() == 'hard'
+    assert typing_gui.profile.stats['tests'] == 1
+
+def test_adaptive_splice_display(typing_gui):
+    """Test that an adaptive splice rewrites only the untyped display tail."""
+    typing_gui.game.word_count = 12
+    typing_gui.adaptive_var.set(True)
+    typing_gui.start_game()
+    text = typing_gui.current_text
+    typed = text[:text.index(' ', 12)]
+    typing_gui._set_input(typed, 'normal')
+    typing_gui.check_progress()
+    
+    typing_gui._adapt(40.0)
+    assert typing_gui.current_text == typing_gui.game.current_text
+    assert typing_gui.text_display.get('1.0', 'end-1c') == typing_gui.current_text
+    assert typing_gui.text_display.get('1.0', f'1.0 + {len(typed)} chars') == typed
+    assert typing_gui.text_display.tag_ranges('correct')
+    typing_gui.reset_game()
+
+def test_heatmap_recolors_changed_keys(typing_gui):
+    """Test that the heatmap only recolours keys typed since the last refresh."""
+    heatmap = typing_gui.heatmap
+    items = heatmap.canvas.find_all()
+    typing_gui.start_game()
+    text = typing_gui.current_text
+    typing_gui._set_input(text[0] + "#", 'normal')
+    typing_gui.check_progress()
+    
+    assert heatmap.refresh(typing_gui.key_stats) == len({text[0].lower(), text[1].lower()})
+    assert heatmap.refresh(typing_gui.key_stats) == 0
+    wrong_key = heatmap.key_ids[text[1].lower()]
+    assert heatmap.canvas.itemcget(wrong_key, 'fill') != '#eeeeee'
+    assert heatmap.canvas.find_all() == items
+    
+    typing_gui._toggle_heatmap_metric()
+    assert heatmap.metric == 'latency'
+    typing_gui.reset_game()
+
+@patch('src.gui.messagebox.showinfo')
+def test_end_test_stops_timer(mock_showinfo, typing_gui):
+    """Test that a finished test leaves no timer running to end it again."""
+    typing_gui.start_game()
+    typing_gui._update_timer()
+    typing_gui._set_input(typing_gui.current_text, 'normal')
+    typing_gui.check_progress()
+    
+    assert typing_gui.timer_id is None
+    assert typing_gui.game.start_time is None
+    assert typing_gui.last_results is not None
+    typing_gui._update_timer()
+    assert typing_gui.timer_id is None
+    assert len(typing_gui.high_scores.get_scores('medium')) == 1
+    mock_showinfo.assert_called_once()
+
+def test_sync_runs_off_main_thread(typing_gui, temp_dir):
+    """Test that shared score I/O happens on a worker and merges back on the main loop."""
+    import threading
+    from src.high_scores import HighScores
+    shared = temp_dir / "shared"
+    shared.mkdir()
+    peer = HighScores(temp_dir / "peer_scores.json", shared, "lab1")
+    peer.add_score(99.0, 95.0, "medium")
+    peer.sync_scores()
+    
+    typing_gui.high_scores = HighScores(temp_dir / "kiosk_scores.json", shared, "lab0")
+    threads = []
+    exchange = typing_gui.high_scores.exchange
+    def record_thread():
+        threads.append(threading.current_thread())
+        return exchange()
+    typing_gui.high_scores.exchange = record_thread
+    
+    typing_gui._request_sync()
+    typing_gui.root.update()
+    typing_gui.sync_thread.join()
+    typing_gui._finish_sync(typing_gui.high_scores)
+    
+    assert threads and threads[0] is not threading.main_thread()
+    assert typing_gui.high_scores.get_scores("medium")[0]['wpm'] == 99.0
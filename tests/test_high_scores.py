@@ -39,6 +39,9 @@ def test_add_score(high_scores):
     assert scores[0]['wpm'] == 60.0  # Highest WPM first
     assert scores[-1]['wpm'] == 45.0  # Lowest WPM last
 
+    high_scores.add_score(30.0, 90.0, "easy", net_wpm=34.5)
+    assert high_scores.get_scores("easy")[0]['net_wpm'] == 34.5
+
 def test_max_scores_limit(high_scores):
     """Test that scores list respects max_scores limit."""
     # Add more than max scores
@@ -86,3 +89,68 @@ def test_corrupted_scores_file(temp_dir):
     high_scores = HighScores(scores_file)
     assert all(difficulty in high_scores.scores for difficulty in ['easy', 'medium', 'hard'])
     assert all(len(scores) == 0 for scores in high_scores.scores.values())
+
+def test_leaderboard_view_is_read_only(high_scores):
+    """Test that callers cannot mutate the stored scores."""
+    high_scores.add_score(50.0, 95.0, "medium")
+    scores = high_scores.get_scores("medium")
+    
+    assert isinstance(scores, tuple)
+    with pytest.raises(TypeError):
+        scores[0]['wpm'] = 999.0
+    assert high_scores.get_scores("medium")[0]['wpm'] == 50.0
+
+def test_leaderboard_view_cache(high_scores):
+    """Test that views are only rebuilt for the changed difficulty."""
+    easy = high_scores.get_scores("easy")
+    medium = high_scores.get_scores("medium")
+    
+    high_scores.add_score(40.0, 90.0, "medium")
+    assert high_scores.get_scores("easy") is easy
+    assert high_scores.get_scores("medium") is not medium
+    assert len(high_scores.get_scores("medium")) == 1
+
+def test_get_rank(high_scores):
+    """Test rank lookup across the full history."""
+    assert high_scores.get_rank(50.0, "hard", added=False) == (1, 1)
+    
+    for wpm in range(1, MAX_HIGH_SCORES + 21):
+        high_scores.add_score(float(wpm), 95.0, "hard")
+    total = MAX_HIGH_SCORES + 20
+    
+    # History keeps more than the stored top scores
+    assert len(high_scores.get_scores("hard")) == MAX_HIGH_SCORES
+    assert high_scores.get_rank(float(total), "hard") == (1, total)
+    assert high_scores.get_rank(1.0, "hard") == (total, total)
+    assert high_scores.get_rank(float(total - 2), "hard") == (3, total)
+    assert high_scores.get_rank(0.5, "hard", added=False) == (total + 1, total + 1)
+    assert high_scores.get_rank(float(total - 2), "hard", added=False) == (3, total + 1)
+    
+    with pytest.raises(ValueError, match="Invalid difficulty"):
+        high_scores.get_rank(50.0, "invalid")
+
+def test_history_persistence(high_scores, temp_dir):
+    """Test that rank history survives a reload."""
+    for wpm in (30.0, 40.0, 50.0):
+        high_scores.add_score(wpm, 95.0, "easy")
+    
+    reloaded = HighScores(temp_dir / "test_scores.json")
+    assert reloaded.get_rank(45.0, "easy", added=False) == (2, 4)
+
+def test_history_seeded_from_scores(test_scores_file):
+    """Test that existing scores seed a missing history file."""
+    high_scores = HighScores(test_scores_file)
+    assert high_scores.get_rank(42.0, "easy", added=False) == (2, 3)
+
+def test_best_ghost(high_scores, temp_dir):
+    """Test that the fastest run's timeline is stored with its score."""
+    assert high_scores.get_best_ghost("medium") is None
+    high_scores.add_score(40.0, 95.0, "medium", {'seed': 1, 'deltas': ''})
+    high_scores.add_score(50.0, 95.0, "medium", {'seed': 2, 'deltas': ''})
+    high_scores.add_score(60.0, 95.0, "medium")
+    
+    assert high_scores.get_best_ghost("medium")['seed'] == 2
+    reloaded = HighScores(temp_dir / "test_scores.json")
+    assert reloaded.get_best_ghost("medium")['seed'] == 2
+    with pytest.raises(TypeError):
+        reloaded.get_best_ghost("medium")['seed'] = 3
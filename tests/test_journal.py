@@ -0,0 +1,94 @@
+"""Tests for the crash-safe session journal."""
+import pytest
+from src.journal import SessionJournal
+
+@pytest.fixture
+def journal(temp_dir):
+    """Fixture for a SessionJournal with a long flush interval."""
+    journal = SessionJournal(temp_dir / "session.journal", flush_interval=60.0)
+    yield journal
+    journal.close()
+
+def test_record_and_recover(journal):
+    """Test that a closed journal replays to the last input."""
+    journal.begin("the quick fox", "easy")
+    for i, typed in enumerate(["t", "th", "thx", "th", "the", "the q"]):
+        journal.record(typed, i * 0.5)
+    journal.close()
+
+    session = SessionJournal.recover(journal.journal_file)
+    assert session.text == "the quick fox"
+    assert session.difficulty == "easy"
+    assert session.typed_text == "the q"
+    assert session.elapsed == 2.5
+    assert session.mode == "words"
+
+def test_recover_code_mode(journal):
+    """Test that multi-line code sessions keep their mode."""
+    journal.begin("def f():\n    pass", "medium", "code")
+    journal.record("def f():\n    ", 1.0)
+    journal.close()
+
+    session = SessionJournal.recover(journal.journal_file)
+    assert session.mode == "code"
+    assert session.typed_text == "def f():\n    "
+
+def test_records_are_batched(journal):
+    """Test that recording does not write until a flush."""
+    journal.begin("abc", "medium")
+    journal.record("a", 0.1)
+    journal.record("ab", 0.2)
+    assert SessionJournal.recover(journal.journal_file).typed_text == ""
+
+    journal.flush()
+    assert SessionJournal.recover(journal.journal_file).typed_text == "ab"
+
+def test_background_flush(temp_dir):
+    """Test that the writer thread flushes on its interval."""
+    journal = SessionJournal(temp_dir / "session.journal", flush_interval=0.01)
+    journal.begin("abc", "medium")
+    journal.record("a", 0.1)
+    journal._stopping.wait(0.2)
+    assert SessionJournal.recover(journal.journal_file).typed_text == "a"
+    journal.close()
+
+def test_torn_entry_is_ignored(journal):
+    """Test recovery when the last entry was cut off mid-write."""
+    journal.begin("abc", "hard")
+    journal.record("ab", 1.0)
+    journal.close()
+    with open(journal.journal_file, 'a') as f:
+        f.write('[1.5, 2, "c')
+
+    session = SessionJournal.recover(journal.journal_file)
+    assert session.typed_text == "ab"
+    assert session.elapsed == 1.0
+
+def test_finish_removes_journal(journal):
+    """Test that a completed session leaves no journal behind."""
+    journal.begin("abc", "easy")
+    journal.record("a", 0.1)
+    journal.finish()
+
+    assert not journal.active
+    assert not journal.journal_file.exists()
+    assert SessionJournal.recover(journal.journal_file) is None
+
+def test_recover_invalid_header(temp_dir):
+    """Test that an unreadable journal is not offered for resume."""
+    journal_file = temp_dir / "session.journal"
+    journal_file.write_text("not json\n")
+    assert SessionJournal.recover(journal_file) is None
+
+def test_recover_splice(journal):
+    """Test that a spliced passage is rebuilt on recovery."""
+    journal.begin("one two three", "easy")
+    journal.record("one", 1.0)
+    journal.record_splice(4, "six seven")
+    journal.record("one six", 2.0)
+    journal.close()
+    
+    session = SessionJournal.recover(journal.journal_file)
+    assert session.text == "one six seven"
+    assert session.typed_text == "one six"
+    assert session.elapsed == 2.0
@@ -0,0 +1,85 @@
+"""Tests for the keyboard layout cost model."""
+import json
+import pytest
+from src.game_logic import GameManager
+from src.keyboard_layout import (
+    LAYOUTS, KeyboardLayout, WordDifficultyIndex, get_layout
+)
+
+def test_home_row_words_are_easiest():
+    """Test that home row words score lower than scattered ones."""
+    qwerty = LAYOUTS['qwerty']
+    assert qwerty.score_word("asdf") < qwerty.score_word("zqpx")
+    assert qwerty.score_word("") == 0.0
+
+def test_same_finger_bigram_penalty():
+    """Test that same-finger bigrams cost more than alternating hands."""
+    qwerty = LAYOUTS['qwerty']
+    # 'de' and 'dk' travel the same distance but 'de' reuses a finger
+    assert qwerty.score_word("de") > qwerty.score_word("dk")
+
+def test_layouts_differ():
+    """Test that the same word scores differently per layout."""
+    word = "aoeu"
+    assert LAYOUTS['dvorak'].score_word(word) < LAYOUTS['qwerty'].score_word(word)
+    assert get_layout('colemak') is LAYOUTS['colemak']
+
+def test_layout_from_file(temp_dir):
+    """Test loading a custom layout file."""
+    layout_file = temp_dir / "custom.json"
+    layout_file.write_text(json.dumps({
+        'name': 'custom',
+        'rows': ["qwertyuiop", "asdfghjkl;", "zxcvbnm,./"]
+    }))
+    layout = get_layout(str(layout_file))
+    assert layout.name == 'custom'
+    assert layout.position('A') == (1, 0)
+
+    with pytest.raises(ValueError, match="Unknown keyboard layout"):
+        get_layout("missing")
+    with pytest.raises(ValueError):
+        KeyboardLayout('broken', ("abc",))
+
+def test_index_bands(test_word_list_file):
+    """Test that bands slice the sorted index."""
+    words = test_word_list_file.read_text().split()
+    index = WordDifficultyIndex.build(words, LAYOUTS['qwerty'])
+
+    assert len(index) == len(set(words))
+    assert index.scores == sorted(index.scores)
+    assert index.band(0.0, 1.0) == index.words
+    assert index.band(0.0, 0.5) == index.words[:5]
+    with pytest.raises(ValueError, match="Invalid difficulty band"):
+        index.band(0.8, 0.2)
+
+def test_index_cache(test_word_list_file):
+    """Test that the index is cached next to the word list."""
+    words = test_word_list_file.read_text().split()
+    layout = LAYOUTS['qwerty']
+    index = WordDifficultyIndex.load_or_build(test_word_list_file, words, layout)
+    cache_file = WordDifficultyIndex.cache_path(test_word_list_file, layout)
+    assert cache_file.exists()
+
+    # A valid cache is used as is
+    cached = json.loads(cache_file.read_text())
+    cached['scores'] = [0.0] * len(cached['scores'])
+    cache_file.write_text(json.dumps(cached))
+    assert WordDifficultyIndex.load_or_build(test_word_list_file, words, layout).scores[-1] == 0.0
+
+    # A different corpus invalidates it
+    rebuilt = WordDifficultyIndex.load_or_build(test_word_list_file, words + ["extra"], layout)
+    assert "extra" in rebuilt.words
+    assert index.words != rebuilt.words
+
+def test_game_uses_difficulty_bands(test_word_list_file):
+    """Test that difficulty selects words from its ergonomic band."""
+    game = GameManager(test_word_list_file)
+    game.set_difficulty('easy')
+    easy = set(game.band_words)
+    game.set_difficulty('hard')
+    hard = set(game.band_words)
+
+    assert easy and hard
+    assert easy != hard
+    game.word_count = 3
+    assert set(game.generate_text().split()) <= hard
@@ -0,0 +1,60 @@
+"""Tests for rolling live statistics."""
+import pytest
+from src.live_stats import KeyStats, KeystrokeWindow
+
+def test_rolling_wpm():
+    """Test WPM over a sliding window."""
+    window = KeystrokeWindow(window_seconds=6.0)
+    for i in range(10):
+        window.add(float(i) * 0.5)  # 10 keys between 0.0s and 4.5s
+
+    # 10 characters = 2 words in 6 seconds = 20 WPM
+    assert window.wpm(5.0) == pytest.approx(20.0)
+
+    # Keys older than 6 seconds drop out
+    assert window.count(8.0) == 6
+    assert window.count(20.0) == 0
+    assert window.wpm(20.0) == 0.0
+
+def test_ring_buffer_overwrites_oldest():
+    """Test that a full buffer keeps only the newest timestamps."""
+    window = KeystrokeWindow(window_seconds=100.0, capacity=4)
+    for i in range(6):
+        window.add(float(i))
+
+    assert len(window) == 4
+    assert window.count(6.0) == 4
+    assert window.count(103.5) == 2
+
+def test_clear():
+    """Test clearing the window."""
+    window = KeystrokeWindow()
+    window.add(1.0)
+    window.clear()
+    assert len(window) == 0
+    window.add(2.0)
+    assert window.count(2.0) == 1
+
+def test_invalid_window():
+    """Test argument validation."""
+    with pytest.raises(ValueError):
+        KeystrokeWindow(window_seconds=0)
+
+def test_key_stats():
+    """Test per-key error rates, latency and change tracking."""
+    stats = KeyStats()
+    assert stats.error_rate('a') is None
+    stats.record('a', True, 0.2)
+    stats.record('a', False, 0.4)
+    stats.record('a', True, 30.0)  # A pause, not latency
+    stats.record('b', True)
+    
+    assert stats.error_rate('a') == pytest.approx(1 / 3)
+    assert stats.mean_latency('a') == pytest.approx(0.3)
+    assert stats.mean_latency('b') is None
+    assert stats.take_dirty() == {'a', 'b'}
+    assert stats.take_dirty() == set()
+    
+    stats.clear()
+    assert stats.take_dirty() == {'a', 'b'}
+    assert stats.error_rate('a') is None
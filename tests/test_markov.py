@@ -0,0 +1,112 @@
+"""Tests for the Markov-chain passage generator."""
+import random
+import pytest
+from src.game_logic import GameManager
+from src.markov import MarkovModel, train_model
+
+CORPUS = (
+    "The cat sat on the mat. The dog sat on the log.\n"
+    "A cat and a dog sat together!\n"
+    "\n"
+    "The mat was red and the log was brown.\n"
+)
+
+@pytest.fixture
+def corpus_file(temp_dir):
+    """Create a small prose corpus."""
+    corpus_file = temp_dir / "corpus.txt"
+    corpus_file.write_text(CORPUS)
+    return corpus_file
+
+def _bigrams(text):
+    """Get the set of adjacent word pairs in text, within sentences."""
+    pairs = set()
+    for sentence in text.replace('!', '.').split('.'):
+        words = sentence.split()
+        pairs.update(zip(words, words[1:]))
+    return pairs
+
+@pytest.mark.parametrize("order", [1, 2, 3])
+def test_generated_transitions_come_from_corpus(corpus_file, temp_dir, order):
+    """Test that every generated transition was seen in training."""
+    model = train_model(corpus_file, temp_dir / f"model_{order}", order=order)
+    words = model.generate(60, random.Random(order))
+
+    assert len(words) == 60
+    corpus_pairs = _bigrams(CORPUS)
+    for first, second in zip(words, words[1:]):
+        if not first.endswith(('.', '!')):
+            assert (first.rstrip('.!'), second.rstrip('.!')) in corpus_pairs
+
+def test_csr_tables(corpus_file, temp_dir):
+    """Test the structure of the trained transition tables."""
+    model = train_model(corpus_file, temp_dir / "model", order=1)
+
+    assert list(model.contexts) == sorted(model.contexts)
+    assert model.indptr[0] == 0
+    assert model.indptr[-1] == len(model.next_ids) == len(model.cum_weights)
+    for row in range(len(model.contexts)):
+        weights = model.cum_weights[model.indptr[row]:model.indptr[row + 1]]
+        assert list(weights) == sorted(weights)
+
+    # "The" is followed by "cat", "dog" and "mat" once each
+    row = model._row(model.words.index("The"))
+    start, end = model.indptr[row], model.indptr[row + 1]
+    assert sorted(model.words[i] for i in model.next_ids[start:end]) == ["cat", "dog", "mat"]
+    assert model.cum_weights[end - 1] == 3
+
+def test_spilled_training_matches_in_memory(corpus_file, temp_dir):
+    """Test that bounded-memory training produces identical tables."""
+    in_memory = train_model(corpus_file, temp_dir / "a", order=2)
+    spilled = train_model(corpus_file, temp_dir / "b", order=2, max_pending=3)
+
+    assert list(spilled.contexts) == list(in_memory.contexts)
+    assert list(spilled.next_ids) == list(in_memory.next_ids)
+    assert list(spilled.cum_weights) == list(in_memory.cum_weights)
+    assert not list((temp_dir / "b").glob("chunk_*"))
+
+def test_load_is_memory_mapped(corpus_file, temp_dir):
+    """Test reloading a trained model from disk."""
+    train_model(corpus_file, temp_dir / "model", order=2)
+    model = MarkovModel.load(temp_dir / "model")
+    assert model.order == 2
+    assert "mat." in model.words
+    assert model.generate(5, random.Random(0))
+
+def test_invalid_training(corpus_file, temp_dir):
+    """Test training argument validation."""
+    with pytest.raises(ValueError, match="Order"):
+        train_model(corpus_file, temp_dir / "model", order=4)
+    empty = temp_dir / "empty.txt"
+    empty.write_text("\n\n")
+    with pytest.raises(ValueError, match="empty"):
+        train_model(empty, temp_dir / "empty_model")
+
+def test_game_uses_sentence_model(corpus_file, temp_dir, test_word_list_file):
+    """Test that GameManager generates passages from a sentence model."""
+    train_model(corpus_file, temp_dir / "model", order=2)
+    game = GameManager(test_word_list_file, sentence_model=temp_dir / "model")
+    game.word_count = 12
+
+    text = game.generate_text()
+    assert len(text.split()) == 12
+    assert set(text.split()) <= set(CORPUS.split())
+
+def test_blocked_words_not_generated(corpus_file, temp_dir, test_word_list_file):
+    """Test that a blocklist also filters sentence model passages."""
+    train_model(corpus_file, temp_dir / "model", order=1)
+    blocklist = temp_dir / "blocklist.txt"
+    blocklist.write_text("dog\n")
+    game = GameManager(test_word_list_file, sentence_model=temp_dir / "model",
+                       blocklist=blocklist)
+    assert game.sentence_model.blocked == {game.sentence_model.words.index("dog")}
+    game.word_count = 200
+
+    words = game.generate_text().split()
+    assert len(words) == 200
+    assert not any("dog" in word for word in words)
+
+    model = MarkovModel.load(temp_dir / "model")
+    model.block(lambda word: True)
+    with pytest.raises(ValueError, match="Invalid sentence model"):
+        model.generate(5, random.Random(0))
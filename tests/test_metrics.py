@@ -0,0 +1,72 @@
+"""Tests for the fused metric registry."""
+import pytest
+from src.metrics import (
+    BACKSPACE, METRICS, Tally, compute_metrics, evaluate, register_metric, tally
+)
+
+def keystrokes(*chunks):
+    """Build a key stream from strings, with None meaning one backspace."""
+    keys = []
+    for chunk in chunks:
+        keys.extend([BACKSPACE] if chunk is None else [ord(char) for char in chunk])
+    return keys
+
+def test_text_only_metrics():
+    """Test metrics when only the final text is known."""
+    metrics = compute_metrics("hello world", "hello world", 6.0)
+    assert metrics['gross_wpm'] == pytest.approx(22.0)  # 11 chars / 5 in 0.1 min
+    assert metrics['net_wpm'] == metrics['gross_wpm']
+    assert metrics['cpm'] == pytest.approx(110.0)
+    assert metrics['kspc'] == 1.0
+    assert metrics['corrected_errors'] == 0
+    assert metrics['consistency'] == 100.0
+
+def test_uncorrected_errors_lower_net_wpm():
+    """Test that wrong characters left behind cost a word per minute each."""
+    metrics = compute_metrics("hellx world!", "hello world", 6.0)
+    assert metrics['uncorrected_errors'] == 2
+    assert metrics['net_wpm'] == pytest.approx(metrics['gross_wpm'] - 20.0)
+    assert compute_metrics("xxxx", "abcd", 60.0)['net_wpm'] == 0.0
+    assert metrics['accuracy'] == pytest.approx(10 / 12 * 100, abs=0.01)
+
+def test_keystroke_metrics():
+    """Test corrected errors and KSPC from the key stream."""
+    keys = keystrokes("helx", None, "lo")
+    counts = tally("hello", "hello", 3.0, keys, [0.1 * i for i in range(len(keys))])
+    assert counts.erased_chars == 1
+    assert counts.fixes == 1
+    
+    metrics = evaluate(counts)
+    assert metrics['corrected_errors'] == 1
+    assert metrics['uncorrected_errors'] == 0
+    assert metrics['kspc'] == pytest.approx(7 / 5)
+    assert metrics['error_rate'] == pytest.approx(100 / 6, abs=0.01)
+
+def test_consistency():
+    """Test speed deviation across whole intervals."""
+    steady = tally("aaaa", "aaaa", 4.0, keystrokes("aaaa"), [0.5, 1.5, 2.5, 3.5])
+    assert evaluate(steady, ['speed_stddev', 'consistency']) == {
+        'speed_stddev': 0.0, 'consistency': 100.0
+    }
+    
+    bursty = tally("aaaa", "aaaa", 2.0, keystrokes("aaaa"), [0.1, 0.2, 0.3, 1.5])
+    metrics = evaluate(bursty)
+    assert metrics['speed_stddev'] == pytest.approx(12.0)  # 3 and 1 keys per second
+    assert metrics['consistency'] == pytest.approx(50.0)
+
+def test_zero_time():
+    """Test that rates are zero without elapsed time."""
+    metrics = compute_metrics("abc", "abc", 0.0)
+    assert metrics['gross_wpm'] == metrics['net_wpm'] == metrics['cpm'] == 0.0
+
+def test_register_metric():
+    """Test adding a metric to the registry."""
+    @register_metric('test_keystrokes')
+    def test_keystrokes(counts: Tally) -> float:
+        return counts.keystrokes
+    try:
+        assert compute_metrics("ab", "ab", 1.0, keystrokes("ab"))['test_keystrokes'] == 2
+        with pytest.raises(ValueError):
+            register_metric('test_keystrokes')(test_keystrokes)
+    finally:
+        del METRICS['test_keystrokes']
@@ -0,0 +1,82 @@
+"""Tests for grapheme-aware passage comparison."""
+import unicodedata
+import pytest
+from src.passage import Passage, TypedProgress
+
+def test_passage_clusters():
+    """Test that combining marks and emoji sequences form single clusters."""
+    family = "\U0001F468\u200d\U0001F469\u200d\U0001F467"
+    passage = Passage("cafe\u0301 " + family + " \U0001F1EB\U0001F1F7")
+
+    assert passage.text == unicodedata.normalize('NFC', passage.text)
+    assert passage.clusters == ["c", "a", "f", "\u00e9", " ", family, " ", "\U0001F1EB\U0001F1F7"]
+    assert len(passage) == 8
+    assert passage.offsets[-1] == len(passage.text)
+
+def test_passage_columns():
+    """Test widget column offsets for characters outside the BMP."""
+    passage = Passage("a\U0001F600b")
+    assert passage.columns() == [0, 1, 2, 3]
+    assert passage.columns(astral_width=2) == [0, 1, 3, 4]
+
+def test_typed_progress_incremental():
+    """Test incremental comparison while typing and deleting."""
+    progress = TypedProgress(Passage("na\u00efve test"))
+
+    assert progress.update("na") == 0
+    assert progress.matches == [True, True]
+
+    # A decomposed diaeresis matches the composed target character
+    progress.update("nai")
+    assert progress.matches == [True, True, False]
+    assert progress.update("nai\u0308") == 2
+    assert progress.matches == [True, True, True]
+    assert progress.correct == 3
+
+    progress.update("na\u00efvx")
+    assert progress.correct == 4
+    assert progress.update("na\u00efv") == 3
+    assert progress.matches == [True, True, True, True]
+
+    progress.update("xa\u00efv")
+    assert progress.matches == [False, True, True, True]
+    assert progress.correct == 3
+    assert not progress.is_complete()
+
+def test_typed_progress_counters():
+    """Test the running word count and accuracy used by the live display."""
+    progress = TypedProgress(Passage("ab cd ef"))
+    for typed in ["a", "ab ", "ab  c", "ab  cx", "ab c", "x"]:
+        progress.update(typed)
+        assert progress.words == len(typed.split())
+    assert progress.accuracy() == pytest.approx(0.0)
+    progress.update("ab cx")
+    assert progress.accuracy() == pytest.approx(4 / 8 * 100)
+
+def test_typed_progress_complete():
+    """Test completion is measured in user-perceived characters."""
+    progress = TypedProgress(Passage("e\u0301t\u00e9"))
+    progress.update("\u00e9te\u0301")
+    assert len(progress) == 3
+    assert progress.correct == 3
+    assert progress.is_complete()
+
+def test_passage_replace_tail():
+    """Test that splicing keeps the typed prefix and its progress."""
+    passage = Passage("ab cd ef")
+    columns = passage.columns()
+    progress = TypedProgress(passage)
+    progress.update("ab")
+    
+    passage.replace_tail(3, "xyz\U0001F600")
+    assert passage.text == "ab xyz\U0001F600"
+    assert passage.clusters[3:] == ["x", "y", "z", "\U0001F600"]
+    assert passage.offsets == [0, 1, 2, 3, 4, 5, 6, 7]
+    assert columns == [0, 1, 2, 3, 4, 5, 6, 7]
+    assert passage.columns(2)[-1] == 8
+    assert progress.correct == 2
+    progress.update("ab xyz")
+    assert progress.correct == 6
+    
+    with pytest.raises(ValueError):
+        passage.replace_tail(20, "")
@@ -0,0 +1,83 @@
+"""
+Tests for user profiles.
+"""
+import pytest
+from src.profiles import ProfileStore, profile_id
+
+@pytest.fixture
+def store(temp_dir):
+    """Fixture for a ProfileStore without a shared directory."""
+    return ProfileStore(temp_dir / "profiles", shared_dir=None)
+
+def test_profile_id():
+    """Test that names map to stable, safe ids."""
+    assert profile_id("  Ada  Lovelace ") == "ada-lovelace"
+    assert profile_id("S12345") == "s12345"
+    for name in ["", "..", "a/b", "x" * 65]:
+        with pytest.raises(ValueError):
+            profile_id(name)
+
+def test_open_creates_shard(store):
+    """Test that a new profile gets its own shard and is counted."""
+    profile = store.open("Ada")
+    assert profile.directory == store.root_dir / store.shard_path("ada")
+    assert profile.profile_file.exists()
+    assert store.user_count == 1
+    store.open("ada")
+    assert store.user_count == 1
+
+def test_corrupt_profile_not_counted_again(store):
+    """Test that repairing a damaged profile keeps the user count."""
+    store.open("Ada")
+    profile = store.open("Grace")
+    profile.profile_file.write_text("{not json")
+
+    repaired = ProfileStore(store.root_dir, shared_dir=None)
+    assert repaired.open("Grace").name == "Grace"
+    assert repaired.user_count == 2
+    assert ProfileStore(store.root_dir, shared_dir=None).user_count == 2
+
+def test_profile_round_trip(store):
+    """Test that settings, stats and scores persist per user."""
+    profile = store.open("Ada")
+    profile.settings['difficulty'] = 'hard'
+    profile.record_result(60.0, 30.0)
+    profile.high_scores.add_score(60.0, 98.0, "hard")
+
+    reopened = ProfileStore(store.root_dir, shared_dir=None).open("ada")
+    assert reopened.name == "Ada"
+    assert reopened.settings == {'difficulty': 'hard'}
+    assert reopened.stats == {'tests': 1, 'seconds': 30.0, 'best_wpm': 60.0}
+    assert reopened.high_scores.get_scores("hard")[0]['wpm'] == 60.0
+    assert store.open("Grace").high_scores.get_scores("hard") == ()
+
+def test_scores_load_lazily(store):
+    """Test that opening a profile does not read its scores."""
+    profile = store.open("Ada")
+    assert profile._high_scores is None
+    assert not (profile.directory / "scores.json").exists()
+
+def test_leaderboard_keeps_best_per_user(store, monkeypatch):
+    """Test the cross-user leaderboard."""
+    monkeypatch.setattr("src.profiles.MAX_HIGH_SCORES", 2)
+    ada, grace, alan = store.open("Ada"), store.open("Grace"), store.open("Alan")
+
+    assert store.submit(ada, "easy", 50.0, 95.0) == 1
+    assert store.submit(grace, "easy", 70.0, 95.0) == 1
+    assert store.submit(ada, "easy", 40.0, 95.0) is None
+    assert store.submit(alan, "easy", 30.0, 95.0) is None
+    assert store.submit(ada, "easy", 80.0, 95.0) == 1
+
+    board = ProfileStore(store.root_dir, shared_dir=None).leaderboard("easy")
+    assert [(entry['user'], entry['wpm']) for entry in board] == [("ada", 80.0), ("grace", 70.0)]
+    assert store.leaderboard("hard") == ()
+
+def test_shared_profile_scores(temp_dir):
+    """Test that profile scores sync through per-user shared shards."""
+    shared = temp_dir / "shared"
+    shared.mkdir()
+    first = ProfileStore(temp_dir / "lab0", shared, "lab0").open("Ada")
+    second = ProfileStore(temp_dir / "lab1", shared, "lab1").open("Ada")
+    first.high_scores.add_score(55.0, 97.0, "medium")
+    first.high_scores.sync_scores()
+    assert second.high_scores.sync_scores() == 1
@@ -0,0 +1,134 @@
+"""
+Tests for score synchronization between machines.
+"""
+import json
+import pytest
+from src.high_scores import HighScores
+from src.score_sync import ScoreSync
+
+@pytest.fixture
+def shared_dir(temp_dir):
+    """Fixture for the shared directory."""
+    path = temp_dir / "shared"
+    path.mkdir()
+    return path
+
+def make_machine(temp_dir, shared_dir, name):
+    """Create a HighScores instance for one machine."""
+    machine_dir = temp_dir / name
+    machine_dir.mkdir(exist_ok=True)
+    return HighScores(machine_dir / "scores.json", shared_dir, name)
+
+def test_invalid_machine_id(temp_dir):
+    """Test that machine ids must be usable as file names."""
+    with pytest.raises(ValueError):
+        ScoreSync(temp_dir, "lab/01", temp_dir / "sync.json")
+
+def test_machines_converge(temp_dir, shared_dir):
+    """Test that every machine ends up with the same leaderboard."""
+    machines = [make_machine(temp_dir, shared_dir, f"lab{i}") for i in range(3)]
+    machines[0].add_score(50.0, 95.0, "medium")
+    machines[1].add_score(70.0, 97.0, "medium")
+    machines[2].add_score(50.0, 90.0, "medium")
+    machines[2].add_score(40.0, 90.0, "easy")
+
+    # Each machine publishes on its first sync and catches up on the second
+    first = [machine.sync_scores() for machine in machines]
+    second = [machine.sync_scores() for machine in machines]
+    assert [a + b for a, b in zip(first, second)] == [3, 3, 2]
+    boards = [
+        [(score['source'], score['wpm']) for score in machine.get_scores("medium")]
+        for machine in machines
+    ]
+    assert boards[0] == [("lab1", 70.0), ("lab0", 50.0), ("lab2", 50.0)]
+    assert boards[0] == boards[1] == boards[2]
+    assert all(len(machine.get_scores("easy")) == 1 for machine in machines)
+
+def test_sync_is_incremental(temp_dir, shared_dir):
+    """Test that records are merged once and only new ones are read."""
+    first = make_machine(temp_dir, shared_dir, "lab0")
+    second = make_machine(temp_dir, shared_dir, "lab1")
+    first.add_score(50.0, 95.0, "medium")
+    assert second.sync_scores() == 0
+    first.sync_scores()
+
+    assert second.sync_scores() == 1
+    assert second.sync_scores() == 0
+    offset = second.sync.state['peers']['lab0']['offset']
+    assert offset == (shared_dir / "lab0.deltas").stat().st_size
+
+    first.add_score(60.0, 95.0, "medium")
+    first.sync_scores()
+    assert second.sync_scores() == 1
+    assert len(second.get_scores("medium")) == 2
+
+def test_duplicate_and_partial_records(temp_dir, shared_dir):
+    """Test that republished records are skipped and torn lines wait."""
+    machine = make_machine(temp_dir, shared_dir, "lab0")
+    record = {'wpm': 55.0, 'accuracy': 96.0, 'date': '2024-01-01',
+              'difficulty': 'hard', 'source': 'lab1', 'seq': 1}
+    line = json.dumps(record) + "\n"
+    delta_file = shared_dir / "lab1.deltas"
+    delta_file.write_text(line + line + line[:10])
+
+    assert machine.sync_scores() == 1
+    with open(delta_file, 'a') as f:
+        f.write(line[10:])
+    assert machine.sync_scores() == 0
+    assert len(machine.get_scores("hard")) == 1
+
+def test_state_survives_restart(temp_dir, shared_dir):
+    """Test that a restarted machine does not merge records again."""
+    machine = make_machine(temp_dir, shared_dir, "lab0")
+    machine.add_score(50.0, 95.0, "easy")
+    machine.sync_scores()
+    assert make_machine(temp_dir, shared_dir, "lab1").sync_scores() == 1
+    restarted = make_machine(temp_dir, shared_dir, "lab1")
+    assert restarted.sync_scores() == 0
+    assert len(restarted.get_scores("easy")) == 1
+
+def test_offline_share(temp_dir, shared_dir):
+    """Test that scores wait locally while the share is unreachable."""
+    offline = temp_dir / "unmounted"
+    machine = make_machine(temp_dir, offline, "lab0")
+    machine.add_score(50.0, 95.0, "medium")
+    assert len(machine.sync.state['pending']) == 1
+    assert machine.sync_scores() == 0
+
+    offline.mkdir()
+    machine.sync_scores()
+    assert machine.sync.state['pending'] == []
+    assert make_machine(temp_dir, offline, "lab1").sync_scores() == 1
+
+def test_legacy_scores_published(temp_dir, shared_dir, test_scores_file):
+    """Test that scores from before syncing get sequence numbers and are shared."""
+    machine = HighScores(test_scores_file, shared_dir, "lab0")
+    easy = machine.get_scores("easy")
+    assert [score['seq'] for score in easy] == [1, 2]
+    assert all(score['source'] == "lab0" for score in easy)
+    machine.sync_scores()
+
+    # Restarting does not publish them again
+    HighScores(test_scores_file, shared_dir, "lab0").sync_scores()
+    peer = make_machine(temp_dir, shared_dir, "lab1")
+    assert peer.sync_scores() == 6
+    assert peer.get_scores("easy") == easy
+
+def test_malformed_records_skipped(temp_dir, shared_dir):
+    """Test that bad peer records are dropped without blocking later scores."""
+    machine = make_machine(temp_dir, shared_dir, "lab0")
+    good = {'wpm': 55.0, 'accuracy': 96.0, 'difficulty': 'hard', 'source': 'lab1', 'seq': 5}
+    bad = [
+        dict(good, wpm="fast", seq=1),
+        dict(good, accuracy=None, seq=2),
+        dict(good, difficulty="extreme", seq=3),
+        dict(good, seq="4"),
+        dict(good, wpm=float('inf'), seq=4),
+        [1, 2, 3],
+    ]
+    lines = [json.dumps(record) for record in bad] + ["NaN", json.dumps(good)]
+    (shared_dir / "lab1.deltas").write_text("\n".join(lines) + "\n")
+
+    assert machine.sync_scores() == 1
+    machine.add_score(60.0, 97.0, "hard")
+    assert [score['wpm'] for score in machine.get_scores("hard")] == [60.0, 55.0]
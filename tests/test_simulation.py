@@ -0,0 +1,80 @@
+"""Tests for the synthetic typist model."""
+import json
+import pytest
+from src.game_logic import GameManager
+from src.high_scores import HighScores
+from src.simulation import (
+    BACKSPACE, SyntheticTypist, TypistProfile, measure_throughput, score_batch
+)
+
+@pytest.fixture
+def typist(test_word_list_file):
+    """Fixture for a seeded SyntheticTypist."""
+    return SyntheticTypist.from_file(test_word_list_file, seed=42)
+
+def test_generate_perfect_typist(test_word_list_file):
+    """Test that an error-free typist reproduces the targets exactly."""
+    typist = SyntheticTypist.from_file(
+        test_word_list_file, TypistProfile(error_rate=0.0), seed=1
+    )
+    batch = typist.generate(50, words=5)
+
+    assert len(batch) == 50
+    assert batch.typed == batch.targets
+    assert all(len(target.split()) == 5 for target in batch.targets)
+    assert len(batch.keys) == sum(len(target) for target in batch.targets)
+    assert (batch.durations > 0).all()
+
+def test_generate_keystroke_streams(test_word_list_file):
+    """Test that corrected errors appear as backspaces in the key stream."""
+    profile = TypistProfile(error_rate=0.5, backspace_rate=1.0)
+    batch = SyntheticTypist.from_file(test_word_list_file, profile, seed=7).generate(20, words=4)
+
+    # Every mistake was corrected so the final text still matches
+    assert batch.typed == batch.targets
+    for index in range(len(batch)):
+        keys, times = batch.keystrokes(index)
+        assert (times[1:] > times[:-1]).all()
+        typed = []
+        for key in keys.tolist():
+            if key == BACKSPACE:
+                typed.pop()
+            else:
+                typed.append(chr(key))
+        assert "".join(typed) == batch.targets[index]
+
+def test_uncorrected_errors_reduce_accuracy(test_word_list_file):
+    """Test that uncorrected errors show up in scored accuracy."""
+    profile = TypistProfile(error_rate=0.2, backspace_rate=0.0)
+    batch = SyntheticTypist.from_file(test_word_list_file, profile, seed=3).generate(30, words=10)
+    game = GameManager(test_word_list_file)
+
+    results = score_batch(batch, game)
+    assert len(results) == 30
+    assert sum(result['accuracy'] for result in results) / 30 < 100.0
+
+def test_wpm_distribution(typist):
+    """Test that simulated speeds follow the profile."""
+    batch = typist.generate(2000, words=5)
+    assert 40 < batch.wpm.mean() < 50
+    assert batch.wpm.min() >= 5.0
+
+def test_score_batch_into_high_scores(typist, test_word_list_file, temp_dir):
+    """Test feeding simulated sessions into the high score store."""
+    scores_file = temp_dir / "sim_scores.json"
+    scores_file.write_text(json.dumps({'easy': [], 'medium': [], 'hard': []}))
+    high_scores = HighScores(scores_file)
+    game = GameManager(test_word_list_file)
+    game.word_count = 5
+
+    stats = measure_throughput(typist, game, 25, high_scores, batch_size=10)
+    assert stats['sessions'] == 25
+    assert stats['generate_per_second'] > 0
+    assert high_scores.get_scores('medium')
+
+def test_invalid_arguments(typist):
+    """Test argument validation."""
+    with pytest.raises(ValueError):
+        SyntheticTypist([])
+    with pytest.raises(ValueError):
+        typist.generate(0)
@@ -0,0 +1,62 @@
+"""
+Tests for the kiosk soak test.
+"""
+import pytest
+from src.high_scores import HighScores
+from src.profiles import ProfileStore
+from src.soak import SoakReport, SoakSample, run_soak
+
+def make_report(values):
+    """Build a report whose counters all follow the given values."""
+    return SoakReport([
+        SoakSample(cycle=(i + 1) * 10, rss_kb=value, traced_kb=value, tags=int(value),
+                   after_ids=1, canvas_items=40)
+        for i, value in enumerate(values)
+    ])
+
+def test_flat_report_passes():
+    """Test that counters that settle after warm-up pass."""
+    report = make_report([100.0, 500.0, 500.0, 500.0, 500.0])
+    assert report.slope('rss_kb') == 0.0
+    assert report.passed
+    assert report.to_dict()['leaks'] == {}
+
+def test_growth_is_reported():
+    """Test that steady growth after warm-up fails the report."""
+    report = make_report([100.0, 150.0, 200.0, 250.0, 300.0])
+    assert report.slope('tags') == pytest.approx(5.0)
+    assert set(report.leaks()) == {'rss_kb', 'traced_kb', 'tags'}
+    assert not report.passed
+
+def test_noise_is_tolerated():
+    """Test that memory noise below the allowance passes."""
+    report = make_report([100.0, 200.0, 201.0, 200.5, 201.5])
+    assert 'rss_kb' not in report.leaks()
+    assert 'traced_kb' not in report.leaks()
+
+def test_invalid_cycles():
+    """Test that cycle counts are validated before the GUI is created."""
+    with pytest.raises(ValueError):
+        run_soak(0, 10)
+
+def test_soak_cycles_do_not_leak(tk_root, test_word_list_file):
+    """Test that repeated start/type/end/reset cycles stay bounded."""
+    report = run_soak(30, 5, test_word_list_file, root=tk_root)
+    assert len(report.samples) == 6
+    leaks = report.leaks()
+    assert 'tags' not in leaks
+    assert 'after_ids' not in leaks
+    assert 'canvas_items' not in leaks
+
+def test_soak_stays_in_data_dir(tk_root, test_word_list_file, temp_dir, monkeypatch):
+    """Test that a soak on a configured kiosk publishes nothing to the share."""
+    shared = temp_dir / "shared"
+    shared.mkdir()
+    monkeypatch.setattr(HighScores.__init__, '__defaults__', (shared, "kiosk", None))
+    monkeypatch.setattr(ProfileStore.__init__, '__defaults__', (shared, "kiosk"))
+    monkeypatch.setattr('src.gui.DEFAULT_PROFILE', "kiosk")
+
+    before = sorted(temp_dir.rglob('*'))
+    run_soak(2, 1, test_word_list_file, root=tk_root)
+    assert list(shared.iterdir()) == []
+    assert sorted(temp_dir.rglob('*')) == before
@@ -1,7 +1,10 @@
 """Tests for utility functions."""
 import os
 import pytest
-from src.utils import calculate_wpm, calculate_accuracy, load_word_list
+from src.utils import (
+    calculate_wpm, calculate_accuracy, load_word_list,
+    normalize_text, split_graphemes, common_suffix_length
+)
 
 def test_calculate_wpm():
     """Test WPM calculation."""
@@ -20,8 +23,9 @@ def test_calculate_accuracy():
     assert calculate_accuracy("test text", "test text") == 100.0
     
     # Test partial match
-    assert calculate_accuracy("test text", "test") == 50.0
-    assert calculate_accuracy("test text", "test texting") == 50.0
+    assert calculate_accuracy("test text", "test") == pytest.approx(400 / 9)
+    assert calculate_accuracy("test text", "test texting") == 75.0
+    assert calculate_accuracy("nai\u0308ve", "na\u00efve") == 100.0
     
     # Test no match
     assert calculate_accuracy("test text", "wrong words") == 0.0
@@ -31,6 +35,14 @@ def test_calculate_accuracy():
     assert calculate_accuracy("test", "") == 0.0
     assert calculate_accuracy("", "test") == 0.0
 
+def test_common_suffix_length():
+    """Test common suffix lengths."""
+    assert common_suffix_length("hellx world", "hello world") == 6
+    assert common_suffix_length("abc", "abc") == 3
+    assert common_suffix_length("abc", "xbc") == 2
+    assert common_suffix_length("", "abc") == 0
+    assert common_suffix_length("abc", "abd") == 0
+
 def test_load_word_list(test_word_list_file):
     """Test word list loading."""
     # Test loading from file
@@ -49,3 +61,15 @@ def test_load_word_list(test_word_list_file):
         pass
     words = load_word_list(empty_file)
     assert len(words) == 0
+
+def test_normalize_text():
+    """Test NFC normalization of decomposed text."""
+    assert normalize_text("cafe\u0301") == "caf\u00e9"
+    assert normalize_text("plain") == "plain"
+
+def test_split_graphemes():
+    """Test splitting text into user-perceived characters."""
+    assert split_graphemes("ab") == ["a", "b"]
+    assert split_graphemes("e\u0301x") == ["e\u0301", "x"]
+    assert split_graphemes("\U0001F44D\U0001F3FD!") == ["\U0001F44D\U0001F3FD", "!"]
+    assert split_graphemes("\r\n") == ["\r\n"]
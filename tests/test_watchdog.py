@@ -0,0 +1,71 @@
+"""Tests for the main loop stall watchdog."""
+import sys
+import time
+from src.watchdog import StallWatchdog, fold_stack
+
+class FakeRoot:
+    """Stands in for a Tk root whose main loop is not running."""
+
+    def __init__(self):
+        """Record scheduled and cancelled callbacks."""
+        self.scheduled = []
+        self.cancelled = []
+
+    def after(self, delay, callback):
+        """Remember a callback without running it."""
+        self.scheduled.append(callback)
+        return f"after#{len(self.scheduled)}"
+
+    def after_cancel(self, after_id):
+        """Remember a cancelled callback id."""
+        self.cancelled.append(after_id)
+
+def slow_handler(seconds):
+    """Block the main thread like a slow event handler."""
+    time.sleep(seconds)
+
+def test_fold_stack():
+    """Test folding the current stack outermost first."""
+    folded = fold_stack(sys._getframe())
+    assert folded.endswith("test_watchdog.py:test_fold_stack")
+
+def test_samples_stalled_main_thread():
+    """Test that a missed heartbeat samples the blocking handler."""
+    root = FakeRoot()
+    watchdog = StallWatchdog(root, threshold=0.02, heartbeat_interval=0.01,
+                             sample_interval=0.002)
+    watchdog.start()
+    slow_handler(0.2)
+    # The main loop catches up and stamps the heartbeat again
+    root.scheduled[-1]()
+    time.sleep(0.05)
+    watchdog.stop()
+
+    assert watchdog.samples
+    assert any(stack.endswith("slow_handler") for stack in watchdog.samples)
+    assert len(watchdog.stalls) == 1
+    assert root.cancelled
+
+def test_no_samples_without_stall():
+    """Test that a healthy heartbeat records nothing."""
+    root = FakeRoot()
+    watchdog = StallWatchdog(root, threshold=0.5, heartbeat_interval=0.01)
+    watchdog.start()
+    for _ in range(5):
+        time.sleep(0.01)
+        root.scheduled[-1]()
+    watchdog.stop()
+    assert not watchdog.samples
+    assert watchdog.folded() == ""
+
+def test_export_folded(temp_dir):
+    """Test exporting the folded-stack profile."""
+    watchdog = StallWatchdog(FakeRoot())
+    watchdog.samples["main.py:main;gui.py:end_test"] += 3
+    watchdog.samples["main.py:main;gui.py:check_progress"] += 1
+    output = temp_dir / "stalls.folded"
+    watchdog.export(output)
+    assert output.read_text().splitlines() == [
+        "main.py:main;gui.py:end_test 3",
+        "main.py:main;gui.py:check_progress 1",
+    ]
@@ -0,0 +1,102 @@
+"""Tests for blocklist word filtering."""
+import pytest
+from src.game_logic import GameManager
+from src.word_filter import (
+    AhoCorasick, CompactHashSet, cache_path, compile_blocklist, filter_words,
+    load_filtered_words
+)
+
+def test_automaton_matches_substrings():
+    """Test matching patterns anywhere in a word, including overlaps."""
+    automaton = AhoCorasick(["he", "she", "hers", "Zap", ""])
+    assert automaton.search("ushers")
+    assert automaton.search("ahe")
+    assert automaton.search("sHe")
+    assert automaton.search("ZAPPED")
+    assert not automaton.search("hs")
+    assert not automaton.search("")
+    
+    # Found only through a failure link: "bcd" inside "abcd" after "abc" fails
+    assert AhoCorasick(["abx", "bcd"]).search("abcd")
+
+def test_automaton_agrees_with_naive_search():
+    """Test the automaton against a plain substring check."""
+    patterns = ["an", "nan", "ana", "ban", "x"]
+    automaton = AhoCorasick(patterns)
+    for word in ["banana", "anna", "nab", "bob", "axe", "nn", "naan"]:
+        assert automaton.search(word) == any(p in word for p in patterns)
+
+def test_compact_hash_set_grows():
+    """Test adding, deduplicating and resizing."""
+    seen = CompactHashSet(capacity=2)
+    assert all(seen.add(f"word{i}") for i in range(100))
+    assert not any(seen.add(f"word{i}") for i in range(100))
+    assert len(seen) == 100
+
+def test_filter_words():
+    """Test that banned and repeated words are dropped, in order."""
+    automaton = compile_blocklist(["bad"])
+    assert compile_blocklist(["bad"]) is automaton
+    words = ["good\n", "badge\n", "Good", "good", " \n", "fine"]
+    assert list(filter_words(words, automaton)) == ["good", "Good", "fine"]
+
+def test_filtered_cache(temp_dir):
+    """Test that the filtered list is cached per corpus and blocklist."""
+    corpus = temp_dir / "words.txt"
+    corpus.write_text("alpha\nbeta\ngamma\nbeta\n")
+    blocklist = temp_dir / "blocklist.txt"
+    blocklist.write_text("# comment\nmm\n")
+    
+    assert load_filtered_words(corpus, blocklist) == ["alpha", "beta"]
+    assert cache_path(corpus).exists()
+    assert load_filtered_words(corpus, blocklist) == ["alpha", "beta"]
+    
+    blocklist.write_text("ph\n")
+    assert load_filtered_words(corpus, blocklist) == ["beta", "gamma"]
+    corpus.write_text("delta\n")
+    assert load_filtered_words(corpus, blocklist) == ["delta"]
+
+def test_unwritable_cache(temp_dir, monkeypatch):
+    """Test that a failed cache write still returns the words and leaves no temp file."""
+    corpus = temp_dir / "words.txt"
+    corpus.write_text("alpha\nbeta\n")
+    blocklist = temp_dir / "blocklist.txt"
+    blocklist.write_text("ph\n")
+
+    def fail(*args):
+        raise OSError("read-only file system")
+    monkeypatch.setattr("src.word_filter.os.replace", fail)
+    assert load_filtered_words(corpus, blocklist) == ["beta"]
+    assert not cache_path(corpus).exists()
+    assert list(temp_dir.glob("*.tmp")) == []
+
+def test_game_uses_blocklist(test_word_list_file, temp_dir):
+    """Test that GameManager loads the filtered word list."""
+    words = test_word_list_file.read_text().split()
+    blocklist = temp_dir / "blocklist.txt"
+    blocklist.write_text(words[0])
+    
+    game = GameManager(test_word_list_file, blocklist=blocklist)
+    assert game.word_list
+    assert all(words[0].casefold() not in word.casefold() for word in game.word_list)
+
+def test_blocklist_removing_every_word(temp_dir):
+    """Test that a blocklist leaving no words is reported clearly."""
+    corpus = temp_dir / "words.txt"
+    corpus.write_text("cat\ndog\nbee\n")
+    blocklist = temp_dir / "blocklist.txt"
+    blocklist.write_text("a\ne\no\n")
+
+    with pytest.raises(ValueError, match="removes every word"):
+        GameManager(corpus, blocklist=blocklist)
+
+def test_game_dedupes_without_blocklist(temp_dir):
+    """Test that repeated words are dropped whether or not a blocklist is set."""
+    corpus = temp_dir / "words.txt"
+    corpus.write_text("alpha\nbeta\nalpha\ngamma\n")
+    blocklist = temp_dir / "blocklist.txt"
+    blocklist.write_text("# nothing banned\n")
+
+    unfiltered = GameManager(corpus, blocklist=None).word_list
+    assert unfiltered == ["alpha", "beta", "gamma"]
+    assert GameManager(corpus, blocklist=blocklist).word_list == unfiltered